@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+import matplotlib
+import matplotlib.dates as mdates
+import matplotlib.pyplot as pyplot
+import numpy
+import pandas
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from PIL import Image
+
+from ittools.cfd.cumulative_flow_graph import colour_schemes, graph_end_date
+from ittools.cfd.flow_data import FlowData, IncrementalFlowData, Trend
+from ittools.config import ProjectConfig
+
+matplotlib.use("Agg")
+
+FRAMES_PER_SECOND = 5
+FINAL_FRAME_SECONDS = 3
+GIF_COLOURS = 64
+FIGURE_SIZE = (12.8, 7.2)
+FIGURE_DPI = 100
+
+
+class CfdAnimation:
+    """An animation of the cumulative flow diagram, with one frame for each day of the progress data
+
+    The figure is drawn once, without the parts that change from day to day. Each frame
+    restores that background and only draws the areas, trend lines, date lines and
+    date text, and the pixels are written straight to the GIF or MP4 file. The flow
+    data is advanced from one frame to the next rather than recalculated.
+    """
+
+    def __init__(
+        self,
+        data_frame: pandas.DataFrame,
+        project_config: ProjectConfig,
+        output_dir: str,
+        animation_format: str = "gif",
+        last_date: date | None = None,
+        trend_period: int | None = None,
+        initial_slope: float | None = None,
+    ):
+        self._data_frame = data_frame
+        self._project_config = project_config
+        self._trend_period = trend_period
+        self._initial_slope = initial_slope
+        all_dates = [date.fromisoformat(str(date_str)[:10]) for date_str in data_frame["date"]]
+        self.dates = [d for d in all_dates if not last_date or d <= last_date]
+        self._colours = colour_schemes["default"]
+        self.animation_file = f"{output_dir}/cfd-anim-{self.dates[-1]}.{animation_format}"
+
+    def run(self, verbose: bool) -> None:
+        print(f"Cumulative Flow animation for project {self._project_config.name}")
+        print(f"  dates: {self.dates[0]} to {self.dates[-1]} ({len(self.dates)} frames)")
+        final_flow_data = FlowData(self._data_frame, self.dates[-1], self._trend_period, self._initial_slope)
+        self._x_axis = pandas.date_range(self.dates[0], self._axis_end_date(final_flow_data)).date.tolist()
+        self._x_values = mdates.date2num(self._x_axis)
+
+        figure = self._build_figure(final_flow_data)
+        figure.canvas.draw()
+        background = figure.canvas.copy_from_bbox(figure.bbox)
+        Path(self.animation_file).parent.mkdir(parents=True, exist_ok=True)
+        frames = _frame_writer(self.animation_file, figure)
+        try:
+            flow_data = IncrementalFlowData(self._data_frame, self.dates[0], self._trend_period, self._initial_slope)
+            while True:
+                figure.canvas.restore_region(background)
+                for artist in self._draw_frame(flow_data):
+                    figure.draw_artist(artist)
+                frames.add(numpy.asarray(figure.canvas.buffer_rgba()))
+                if flow_data.today == self.dates[-1]:
+                    break
+                flow_data.advance()
+        finally:
+            frames.close()
+        pyplot.close(figure)
+        print(f"Cumulative flow animation saved as {self.animation_file}")
+
+    def _axis_end_date(self, flow_data: FlowData) -> date:
+        if flow_data.pessimistic_completion_date or flow_data.optimistic_completion_date \
+                or self._project_config.milestones:
+            return max(graph_end_date(flow_data, self._project_config), self.dates[-1])
+        return self.dates[-1] + timedelta(days=2)
+
+    def _build_figure(self, final_flow_data: FlowData):
+        figure, axes = pyplot.subplots(figsize=FIGURE_SIZE, dpi=FIGURE_DPI)
+        figure.subplots_adjust(left=0.05, right=0.95, bottom=0.15, top=0.93)
+        zeros = numpy.zeros(len(self._x_values))
+        self._areas = [
+            axes.fill_between(self._x_values, zeros, zeros, color=self._colours[name], linewidth=0)
+            for name in ["Done", "In Progress", "Pending"]
+        ]
+        self._trend_lines = [axes.plot([], [], color=self._colours["Trendline"])[0] for _ in range(3)]
+        self._today_line = axes.axvline(self._x_values[0], color=self._colours["Current Date"])
+        self._end_line = axes.axvline(self._x_values[0], color=self._colours["Predicted End Date"])
+        # Drawn over the areas in every frame, but never changed
+        self._overlays = [
+            axes.axvline(mdates.date2num(milestone["date"]), color=self._colours["Milestone"])
+            for milestone in self._project_config.milestones
+        ]
+        self._overlays.append(axes.legend(handles=self._legend_elements(), loc="upper left"))
+        self._dates_text = axes.text(
+            0.99, 0.97, "", transform=axes.transAxes, ha="right", va="top", family="monospace"
+        )
+        # Animated artists are left out of the background, and drawn for each frame
+        for artist in self._animated_artists():
+            artist.set_animated(True)
+        axes.xaxis_date()
+        axes.set_xlim(self._x_values[0], self._x_values[-1])
+        axes.set_ylim(0, numpy.ceil(max(final_flow_data.total) * 1.1))
+        axes.margins(0, 0)
+        axes.set_xlabel("Dates", labelpad=12, fontsize=12)
+        axes.set_ylabel("Total Stories", labelpad=9, fontsize=12)
+        axes.set_title(self._project_config.name, pad=9, fontsize=16)
+        pyplot.setp(axes.get_xticklabels(), rotation=90)
+        return figure
+
+    def _legend_elements(self) -> list:
+        legend_elements = [
+            Patch(facecolor=self._colours["Pending"], label="Pending"),
+            Patch(facecolor=self._colours["In Progress"], label="In Progress"),
+            Patch(facecolor=self._colours["Done"], label="Done"),
+            Line2D([0], [0], color=self._colours["Current Date"], label="Today"),
+            Line2D([0], [0], color=self._colours["Predicted End Date"], label="Pessimistic End"),
+        ]
+        for milestone in self._project_config.milestones:
+            legend_elements.append(
+                Line2D([0], [0], color=self._colours["Milestone"], label=f"{milestone['date']} ({milestone['name']})")
+            )
+        return legend_elements
+
+    def _draw_frame(self, flow_data: FlowData) -> list:
+        size = len(self._x_axis)
+        done = _extend(flow_data.done, size)
+        in_progress = done + _extend(flow_data.in_progress, size)
+        total = in_progress + _extend(flow_data.pending, size)
+        for area, lower, upper in zip(self._areas, [numpy.zeros(size), done, in_progress], [done, in_progress, total]):
+            area.set_verts([_band_vertices(self._x_values, lower, upper)])
+
+        today_index = (flow_data.today - self._x_axis[0]).days
+        current_start_index = max(0, today_index - flow_data.trend_period + 1)
+        self._set_trend_line(self._trend_lines[0], flow_data.current_trend, current_start_index, today_index)
+        self._set_trend_line(self._trend_lines[1], flow_data.optimistic_trend, today_index, size - 1)
+        self._set_trend_line(self._trend_lines[2], flow_data.pessimistic_trend, today_index, size - 1)
+
+        self._today_line.set_xdata([self._x_values[today_index]] * 2)
+        end_date = flow_data.pessimistic_completion_date
+        end_date_shown = end_date is not None and end_date <= self._x_axis[-1]
+        self._end_line.set_visible(end_date_shown)
+        if end_date_shown:
+            self._end_line.set_xdata([mdates.date2num(end_date)] * 2)
+
+        self._dates_text.set_text(
+            f"Today:           {flow_data.today}\n"
+            f"Optimistic End:  {flow_data.optimistic_completion_date or 'n/a'}\n"
+            f"Pessimistic End: {flow_data.pessimistic_completion_date or 'n/a'}"
+        )
+        return self._animated_artists()
+
+    def _animated_artists(self) -> list:
+        return [*self._areas, *self._trend_lines, self._today_line, self._end_line, *self._overlays, self._dates_text]
+
+    def _set_trend_line(self, line: Line2D, trend: Trend, start_index: int, end_index: int) -> None:
+        x_indexes = numpy.arange(start_index, end_index + 1)
+        line.set_data(self._x_values[start_index:end_index + 1], trend.slope * x_indexes + trend.intercept)
+
+
+def _extend(values: List[int], size: int) -> numpy.ndarray:
+    """The values, with the last value repeated up to the required size"""
+    result = numpy.full(size, values[-1], dtype=numpy.float64)
+    result[:len(values)] = values
+    return result
+
+
+def _band_vertices(x_values: numpy.ndarray, lower: numpy.ndarray, upper: numpy.ndarray) -> numpy.ndarray:
+    """The outline of the area between two lines"""
+    return numpy.concatenate(
+        [numpy.column_stack([x_values, upper]), numpy.column_stack([x_values[::-1], lower[::-1]])]
+    )
+
+
+def _frame_writer(animation_file: str, figure):
+    if animation_file.endswith(".mp4"):
+        return _Mp4Frames(animation_file, figure)
+    return _GifFrames(animation_file)
+
+
+class _GifFrames:
+    """Frames written to an animated GIF, which all share the palette of the first frame"""
+
+    def __init__(self, animation_file: str):
+        self._animation_file = animation_file
+        self._palette: Image.Image | None = None
+        self._frames: List[Image.Image] = []
+
+    def add(self, pixels: numpy.ndarray) -> None:
+        image = Image.fromarray(pixels).convert("RGB")
+        if self._palette is None:
+            self._palette = image.quantize(GIF_COLOURS)
+        self._frames.append(image.quantize(palette=self._palette, dither=Image.Dither.NONE))
+
+    def close(self) -> None:
+        if not self._frames:
+            return
+        frame_duration = 1000 // FRAMES_PER_SECOND
+        self._frames[0].save(
+            self._animation_file,
+            save_all=True,
+            append_images=self._frames[1:],
+            duration=[frame_duration] * (len(self._frames) - 1) + [FINAL_FRAME_SECONDS * 1000],
+            loop=0,
+            optimize=False,
+        )
+
+
+class _Mp4Frames:
+    """Raw frames piped to ffmpeg, which encodes them as an MP4 video"""
+
+    def __init__(self, animation_file: str, figure):
+        ffmpeg_path = matplotlib.rcParams["animation.ffmpeg_path"]
+        if not shutil.which(ffmpeg_path):
+            raise RuntimeError(f"ffmpeg is needed to write MP4 animations, and was not found at '{ffmpeg_path}'")
+        width, height = figure.canvas.get_width_height()
+        self._process = subprocess.Popen(
+            [
+                ffmpeg_path, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(FRAMES_PER_SECOND),
+                "-i", "pipe:", "-vf", f"tpad=stop_mode=clone:stop_duration={FINAL_FRAME_SECONDS}",
+                "-vcodec", "libx264", "-pix_fmt", "yuv420p", animation_file,
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def add(self, pixels: numpy.ndarray) -> None:
+        self._process.stdin.write(pixels.tobytes())
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        if self._process.wait():
+            raise RuntimeError(f"ffmpeg failed with exit code {self._process.returncode}")
@@ -1,13 +1,16 @@
-import csv
+from __future__ import annotations
+
+from datetime import date
 from pathlib import Path
-from typing import Dict
+from typing import List, Tuple
 
-from dateutil.parser import isoparse
-from dateutil.relativedelta import relativedelta
+import pandas
 
+from ittools.cfd.progress_history import StatusCategories, reconstruct_daily_counts
+from ittools.cfd.progress_store import ProgressStore
 from ittools.config import ReportOptions
 from ittools.domain.epic import Epic
-from ittools.domain.issue_counts import IssueCounts
+from ittools.domain.transition_log import TransitionLog
 from ittools.domain.project import Project
 
 PROGRESS_CSV = "progress.csv"
@@ -16,79 +19,72 @@ PROGRESS_CSV = "progress.csv"
 def store_project_counts(
     count_date: str, project: Project, options: ReportOptions
 ) -> None:
-    for epic in project.epics:
-        store_epic_counts(count_date, epic, options)
+    _store_counts(count_date, project.epics, options)
 
 
 def store_epic_counts(
     count_date: str, epic: Epic, options: ReportOptions
 ) -> None:
-    csv_path = _get_epic_progress_csv_path(options, epic.key)
-    csv_data = _read_csv_data(csv_path)
-    _add_missing_dates(csv_data, count_date)
-    csv_data[count_date] = epic.issue_counts
-    _write_csv_data(csv_path, epic.key, csv_data)
-
-
-def _get_epic_progress_csv_path(options: ReportOptions, epic_key: str) -> Path:
-    report_path = Path(options.report_dir)
-    epic_report_path = report_path / "epics" / epic_key
-    if not epic_report_path.exists():
-        print(f"Making directory {str(epic_report_path)}")
-        epic_report_path.mkdir(parents=True, exist_ok=True)
-    return epic_report_path / PROGRESS_CSV
-
-
-def _read_csv_data(csv_path: Path) -> Dict[str, IssueCounts]:
-    csv_data = dict()
-
-    if csv_path.exists():
-        with csv_path.open("r", encoding="UTF8") as f:
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                csv_data[row["date"]] = _counts_from_row(row)
-
-    return csv_data
-
-
-def _counts_from_row(row: Dict[str, str]) -> IssueCounts:
-    pending = int(row["pending"])
-    in_progress = int(row["in_progress"])
-    done = int(row["done"])
-    return IssueCounts(pending, in_progress, done)
-
-
-def _write_csv_data(csv_path: Path, epic_key: str, csv_data: Dict[str, IssueCounts]) -> None:
-    with csv_path.open("w", encoding="UTF8") as f:
-        field_names = ["date", "epic", "pending", "in_progress", "done", "total"]
-        csv_writer = csv.DictWriter(f, fieldnames=field_names)
-        csv_writer.writeheader()
-        for key in sorted(csv_data.keys()):
-            counts = csv_data[key]
-            csv_writer.writerow(
-                {
-                    "date": key,
-                    "epic": epic_key,
-                    "pending": counts.pending,
-                    "in_progress": counts.in_progress,
-                    "done": counts.done,
-                    "total": counts.total,
-                }
-            )
-
-
-def _add_missing_dates(csv_data: Dict[str, IssueCounts], date_to_add_str: str) -> None:
-    if not csv_data:
-        return
-
-    date_to_add = isoparse(date_to_add_str).date()
-
-    keys = sorted(csv_data.keys())
-    last_date = isoparse(keys[-1]).date()
-    while True:
-        next_date = last_date + relativedelta(days=+1)
-        if next_date >= date_to_add:
-            # No date missing
-            return
-        csv_data[str(next_date)] = csv_data[str(last_date)]
-        last_date = next_date
+    _store_counts(count_date, [epic], options)
+
+
+def load_project_progress(store: ProgressStore, report_dir: str, epic_keys: List[str]) -> pandas.DataFrame:
+    """The total daily progress of the epics, as columns of date, pending, in_progress, done and total"""
+    for epic_key in epic_keys:
+        import_epic_csv(store, report_dir, epic_key)
+    return store.project_progress(epic_keys)
+
+
+def import_epic_csv(store: ProgressStore, report_dir: str, epic_key: str) -> bool:
+    """Load the progress.csv of an epic into the store, if the store has no progress for the epic yet"""
+    csv_path = _get_epic_progress_csv_path(report_dir, epic_key)
+    if store.has_epic(epic_key) or not csv_path.exists():
+        return False
+    store.import_csv(csv_path, epic_key)
+    return True
+
+
+def export_epic_csv(store: ProgressStore, report_dir: str, epic_key: str) -> Path:
+    """Write the progress of an epic to its progress.csv"""
+    csv_path = _get_epic_progress_csv_path(report_dir, epic_key)
+    store.export_csv(csv_path, epic_key)
+    return csv_path
+
+
+def backfill_epic_counts(
+    store: ProgressStore,
+    report_dir: str,
+    epic_keys: List[str],
+    issue_histories: List[Tuple[str, TransitionLog]],
+    categories: StatusCategories,
+    last_date: date,
+    first_date: date | None = None,
+    replace: bool = False,
+) -> int:
+    """Store the daily counts of the epics rebuilt from the (epic key, transitions) of their issues
+
+    The history starts on the day the first issue was created, unless a first date is
+    given. Returns the number of rows written.
+    """
+    if not issue_histories:
+        return 0
+    for epic_key in epic_keys:
+        import_epic_csv(store, report_dir, epic_key)
+    first_date = first_date or min(transitions.created_time.date() for _, transitions in issue_histories)
+    daily_counts = reconstruct_daily_counts(epic_keys, issue_histories, categories, first_date, last_date)
+    return store.store_daily_counts(daily_counts, replace)
+
+
+def _store_counts(count_date: str, epics: List[Epic], options: ReportOptions) -> None:
+    epic_counts = {epic.key: epic.issue_counts for epic in epics}
+    store = ProgressStore.open(options.report_dir)
+    try:
+        for epic_key in epic_counts:
+            import_epic_csv(store, options.report_dir, epic_key)
+        store.store_counts(count_date, epic_counts)
+    finally:
+        store.close()
+
+
+def _get_epic_progress_csv_path(report_dir: str, epic_key: str) -> Path:
+    return Path(report_dir) / "epics" / epic_key / PROGRESS_CSV
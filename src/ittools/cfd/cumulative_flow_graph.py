@@ -3,7 +3,9 @@ from __future__ import annotations
 import sys
 from datetime import datetime, timedelta
 from math import ceil
+from typing import Iterable
 
+import matplotlib
 import matplotlib.patches as patches
 import matplotlib.pyplot as pyplot
 import pandas
@@ -11,8 +13,12 @@ from matplotlib.lines import Line2D
 from pandas import DatetimeIndex
 
 from ittools.cfd.flow_data import FlowData, Trend
+from ittools.cfd.monte_carlo import Forecast
 from ittools.config import ProjectConfig
 
+# Graphs are only written to files, so the non-interactive backend is always used
+matplotlib.use("Agg")
+
 colour_schemes = {
     "sunset": {
         "Done": "#e76f51",
@@ -22,6 +28,7 @@ colour_schemes = {
         "Predicted End Date": "#788AA3",
         "Milestone": "indigo",
         "Trendline": "midnightblue",
+        "Forecast": "#264653",
     },
     "electric": {
         "Done": "#87F5FB",
@@ -31,6 +38,7 @@ colour_schemes = {
         "Predicted End Date": "#788AA3",
         "Milestone": "indigo",
         "Trendline": "midnightblue",
+        "Forecast": "#FFBE0B",
     },
     "pastels": {
         "Done": "#0FA3B1",
@@ -40,6 +48,7 @@ colour_schemes = {
         "Predicted End Date": "#EDB6A3",
         "Milestone": "#764248",
         "Trendline": "#5F634F",
+        "Forecast": "#3D5A80",
     },
     "default": {
         "Done": "#CCEBC5",
@@ -49,6 +58,7 @@ colour_schemes = {
         "Predicted End Date": "#EDB6A3",
         "Milestone": "#764248",
         "Trendline": "#5F634F",
+        "Forecast": "#3D5A80",
     },
 }
 
@@ -65,6 +75,15 @@ class CumulativeFlowGraph:
         self._flow_data = flow_data
         self._project_config = project_config
         self._report_date = report_date
+        self._forecast: Forecast | None = None
+
+    @property
+    def flow_data(self) -> FlowData:
+        return self._flow_data
+
+    def use_forecast(self, forecast: Forecast) -> None:
+        """Report the completion dates of a Monte Carlo forecast, and draw them on the graph"""
+        self._forecast = forecast
 
     def run(self, verbose: bool) -> None:
         print(f"Cumulative Flow for project {self._project_config.name}")
@@ -78,6 +97,10 @@ class CumulativeFlowGraph:
         pessimistic_date = f" (complete {self._flow_data.pessimistic_completion_date})" \
             if self._flow_data.pessimistic_completion_date else ""
         print(f"    pessimistic {self._flow_data.pessimistic_trend.slope:4.1f}{pessimistic_date}")
+        if self._forecast:
+            print(f"  forecast ({self._forecast.trials} trials):")
+            for percentile, completion_date in self._forecast.completion_dates.items():
+                print(f"    P{percentile:<10} {completion_date or 'not within forecast horizon'}")
         print()
 
         self._build_graph()
@@ -115,6 +138,7 @@ class CumulativeFlowGraph:
             self._write_milestone_dates(
                 max(self._flow_data.total), final_x_axis, end_date, colours
             )
+        self._write_forecast_dates(max(self._flow_data.total), final_x_axis, colours)
         self._set_plot_size()
 
         pyplot.gcf().canvas.draw()
@@ -135,34 +159,9 @@ class CumulativeFlowGraph:
         ]
         return final_x_axis, final_y_axis
 
-    def _final_milestone_date(self) -> str | None:
-        if not self._project_config.milestones:
-            return None
-
-        final_milestone = self._project_config.milestones[-1]
-        return final_milestone["date"]
-
     def _calc_end_date(self, flow_data):
-        milestone_date = self._final_milestone_date()
-        predicted_end_date = self._last_milestone_or_end_date(flow_data, milestone_date)
-        if not milestone_date:
-            # No milestones define, just go to the predicted end date
-            return predicted_end_date + timedelta(days=2)
-
-        if (predicted_end_date - milestone_date).days < 15:
-            # if final milestone and predicted finish are relatively close show both
-            end_date = max(predicted_end_date, milestone_date) + timedelta(days=2)
-        else:
-            end_date = milestone_date + timedelta(days=15)
-        return end_date
-
-    @staticmethod
-    def _last_milestone_or_end_date(flow_data, milestone_date):
-        return (
-            flow_data.pessimistic_completion_date
-            or flow_data.optimistic_completion_date
-            or milestone_date
-        )
+        forecast_dates = [completion_date for _, completion_date in self._forecast_dates()]
+        return graph_end_date(flow_data, self._project_config, forecast_dates)
 
     @staticmethod
     def _normalise_series(series_values: list[int], required_size: int) -> list[int]:
@@ -204,6 +203,16 @@ class CumulativeFlowGraph:
                     label=f"{self._flow_data.pessimistic_completion_date} (Pessimistic End)",
                 )
             )
+        for percentile, completion_date in self._forecast_dates():
+            legend_elements.append(
+                Line2D(
+                    [0],
+                    [0],
+                    color=colours["Forecast"],
+                    linestyle="dashed",
+                    label=f"{completion_date} (Forecast P{percentile})",
+                )
+            )
         for milestone in self._project_config.milestones:
             legend_elements.append(
                 Line2D(
@@ -290,10 +299,25 @@ class CumulativeFlowGraph:
                 max_total, predicted_end_date, colours["Predicted End Date"]
             )
 
-    def _write_date_line(self, max_total, x_axis_position_index, line_color):
+    def _write_forecast_dates(self, max_total, final_x_axis, colours):
+        """plots forecast completion dates that fall within the graph"""
+        for _, completion_date in self._forecast_dates():
+            if completion_date in final_x_axis:
+                self._write_date_line(max_total, completion_date, colours["Forecast"], "dashed")
+
+    def _forecast_dates(self) -> list[tuple[int, datetime.date]]:
+        if not self._forecast:
+            return []
+        return [
+            (percentile, completion_date)
+            for percentile, completion_date in self._forecast.completion_dates.items()
+            if completion_date
+        ]
+
+    def _write_date_line(self, max_total, x_axis_position_index, line_color, line_style="solid"):
         """plots date lines"""
         pyplot.vlines(
-            x_axis_position_index, 0, max_total + (max_total / 6), color=line_color
+            x_axis_position_index, 0, max_total + (max_total / 6), color=line_color, linestyles=line_style
         )
 
     def _set_plot_size(self):
@@ -309,3 +333,42 @@ class CumulativeFlowGraph:
         """saves graph, creates file locations if necessary"""
         pyplot.savefig(self.png_file)
         print(f"Cumulative flow graph saved as {self.png_file}")
+
+
+def graph_end_date(
+    flow_data: FlowData, project_config: ProjectConfig, forecast_dates: Iterable[datetime.date] = ()
+) -> datetime.date:
+    """The last date shown on the graph, which includes the predicted end date, the final milestone
+    and the latest forecast completion date"""
+    end_date = _trend_end_date(flow_data, project_config)
+    latest_forecast_date = max(forecast_dates, default=None)
+    if latest_forecast_date:
+        return max(end_date, latest_forecast_date + timedelta(days=2))
+    return end_date
+
+
+def _trend_end_date(flow_data: FlowData, project_config: ProjectConfig) -> datetime.date:
+    milestone_date = _final_milestone_date(project_config)
+    predicted_end_date = (
+        flow_data.pessimistic_completion_date
+        or flow_data.optimistic_completion_date
+        or milestone_date
+    )
+    if not milestone_date:
+        # No milestones define, just go to the predicted end date
+        return predicted_end_date + timedelta(days=2)
+
+    if (predicted_end_date - milestone_date).days < 15:
+        # if final milestone and predicted finish are relatively close show both
+        end_date = max(predicted_end_date, milestone_date) + timedelta(days=2)
+    else:
+        end_date = milestone_date + timedelta(days=15)
+    return end_date
+
+
+def _final_milestone_date(project_config: ProjectConfig) -> datetime.date | None:
+    if not project_config.milestones:
+        return None
+
+    final_milestone = project_config.milestones[-1]
+    return final_milestone["date"]
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import operator
+from collections import deque
 from datetime import datetime, timedelta
 from dateutil.parser import isoparse
 from math import ceil
-from typing import List
+from typing import TYPE_CHECKING, List, Tuple
 
 import numpy
-import pandas
+
+if TYPE_CHECKING:
+    import pandas
 
 
 class FlowData:
@@ -26,6 +30,7 @@ class FlowData:
         self.total = data_frame["total"].tolist()[: len(self.dates)]
         self.trend_period = trend_period or FlowData.DEFAULT_TREND_PERIOD
         self._initial_slope = numpy.float64(initial_slope) if initial_slope else FlowData.DEFAULT_SLOPE
+        self._done_regression = RollingRegression(self.done)
         self.slope_history = self._calculate_all_slopes()
         self.current_trend = self._calculate_current_trend()
         self.optimistic_trend = self._calculate_optimistic_trend()
@@ -39,20 +44,19 @@ class FlowData:
 
     def _calculate_all_slopes(self) -> List[float]:
         """Calculate regression slopes for recent entries in the 'done' column"""
-        last_index = len(self.done)
-        first_index = max(0, last_index - self.trend_period)
-        return [self._calculate_slope(index) for index in range(first_index, last_index)]
+        return self.slopes_for_window(self.trend_period)
 
-    def _calculate_slope(self, last_index: int) -> float:
-        """Calculate the regression slope at the give index of the 'done' column"""
-        first_index = max(0, last_index - self.trend_period)
-        regression_values = self.done[first_index : last_index + 1]  # noqa
+    def slopes_for_window(self, trend_period: int) -> List[float]:
+        """Regression slopes of the 'done' column for each of the last `trend_period` days
 
-        if len(regression_values) < 2:
-            return self._initial_slope
-
-        trend = calculate_trend_coefficients(regression_values)
-        return trend.slope
+        Each slope is fitted over the day and up to `trend_period` days before it.
+        """
+        last_index = len(self.done)
+        first_index = max(0, last_index - trend_period)
+        slopes, _ = self._done_regression.trends(trend_period)
+        return [
+            self._initial_slope if numpy.isnan(slope) else slope for slope in slopes[first_index:last_index]
+        ]
 
     def _calculate_current_trend(self) -> Trend:
         current_slope = self.slope_history[-1]
@@ -96,6 +100,108 @@ class FlowData:
         return self._predicted_end_date(self.pessimistic_trend)
 
 
+class IncrementalFlowData(FlowData):
+    """Flow data that can be advanced one day at a time, for callers that walk through the history
+
+    The sums for the regression window, and the highest and lowest of the recent slopes,
+    are updated as each day is added, so advancing is O(1). The trends and completion
+    dates are the same as a `FlowData` created for the new today.
+    """
+
+    def __init__(self, data_frame: pandas.DataFrame,
+                 today: datetime.date,
+                 trend_period: int | None = None,
+                 initial_slope: float | None = None):
+        self._all_dates = [isoparse(date_str).date() for date_str in data_frame["date"].tolist()]
+        self._all_counts = [data_frame[column].tolist() for column in ["pending", "in_progress", "done", "total"]]
+        self.trend_period = trend_period or FlowData.DEFAULT_TREND_PERIOD
+        self._initial_slope = numpy.float64(initial_slope) if initial_slope else FlowData.DEFAULT_SLOPE
+        self.dates = []
+        self.pending, self.in_progress, self.done, self.total = [], [], [], []
+        self._window_sum_y = 0.0
+        self._window_sum_iy = 0.0
+        self._slopes = deque(maxlen=self.trend_period)
+        self._max_slopes = deque()
+        self._min_slopes = deque()
+        for _ in range(self._all_dates.index(today) + 1):
+            self._add_next_day()
+        self._update_trends()
+
+    @property
+    def can_advance(self) -> bool:
+        return len(self.dates) < len(self._all_dates)
+
+    def advance(self) -> None:
+        """Move today to the next date of the data"""
+        if not self.can_advance:
+            raise ValueError(f"There is no data after {self.today}")
+        self._add_next_day()
+        self._update_trends()
+
+    @property
+    def slope_history(self) -> List[float]:
+        return list(self._slopes)
+
+    def slopes_for_window(self, trend_period: int) -> List[float]:
+        self._done_regression = RollingRegression(self.done)
+        return super().slopes_for_window(trend_period)
+
+    def _add_next_day(self) -> None:
+        index = len(self.dates)
+        self.today = self._all_dates[index]
+        self.dates.append(self.today)
+        for counts, all_counts in zip([self.pending, self.in_progress, self.done, self.total], self._all_counts):
+            counts.append(all_counts[index])
+        self._add_slope(index, self._next_slope(index))
+
+    def _next_slope(self, index: int) -> float:
+        """The regression slope of 'done' over the window ending at the index, as in `RollingRegression`"""
+        y = numpy.float64(self.done[index])
+        self._window_sum_y += y
+        self._window_sum_iy += index * y
+        start = index - self.trend_period
+        if start > 0:
+            # The value before the window start has just left the window
+            leaving = numpy.float64(self.done[start - 1])
+            self._window_sum_y -= leaving
+            self._window_sum_iy -= (start - 1) * leaving
+        start = max(0, start)
+        n = numpy.float64(index - start + 1)
+        if n < 2:
+            return self._initial_slope
+        sum_xy = self._window_sum_iy - start * self._window_sum_y
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * sum_xy - sum_x * self._window_sum_y) / (n * sum_xx - sum_x ** 2)
+
+    def _add_slope(self, index: int, slope: float) -> None:
+        """Keep the recent slopes, and the slopes that could still be the highest or lowest of them"""
+        self._slopes.append(slope)
+        for extremes, dominates in [(self._max_slopes, operator.ge), (self._min_slopes, operator.le)]:
+            while extremes and dominates(slope, extremes[-1][1]):
+                extremes.pop()
+            extremes.append((index, slope))
+            if extremes[0][0] <= index - self.trend_period:
+                extremes.popleft()
+
+    def _update_trends(self) -> None:
+        self.current_trend = self._calculate_current_trend()
+        self.optimistic_trend = self._calculate_optimistic_trend()
+        self.pessimistic_trend = self._calculate_pessimistic_trend()
+
+    def _calculate_current_trend(self) -> Trend:
+        current_slope = self._slopes[-1]
+        return Trend(current_slope, self._calculate_implied_y_intercept(current_slope))
+
+    def _calculate_optimistic_trend(self) -> Trend:
+        optimistic_slope = self._max_slopes[0][1]
+        return Trend(optimistic_slope, self._calculate_implied_y_intercept(optimistic_slope))
+
+    def _calculate_pessimistic_trend(self) -> Trend:
+        pessimistic_slope = self._min_slopes[0][1]
+        return Trend(pessimistic_slope, self._calculate_implied_y_intercept(pessimistic_slope))
+
+
 class Trend:
     """Regression coefficients for a linear trend line"""
 
@@ -107,6 +213,40 @@ class Trend:
         return f"Trend({self.slope:n},{self.intercept:n})"
 
 
+class RollingRegression:
+    """Least squares trends over sliding windows of a series, calculated from running sums
+
+    The running sums of y and x·y are kept once for the whole series, so the trends
+    for every window of any length come out of a few array operations.
+    """
+
+    def __init__(self, values):
+        y = numpy.asarray(values, dtype=numpy.float64)
+        self._count = len(y)
+        self._sum_y = numpy.concatenate(([0.0], numpy.cumsum(y)))
+        self._sum_xy = numpy.concatenate(([0.0], numpy.cumsum(numpy.arange(self._count) * y)))
+
+    def trends(self, trend_period: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """The slope and intercept of the trend ending at each index of the series
+
+        Each trend is fitted over the value at the index and up to `trend_period` values
+        before it, with x counted from the start of the window (as in
+        `calculate_trend_coefficients`). Windows with a single value have no trend, and
+        are NaN.
+        """
+        end = numpy.arange(self._count)
+        start = numpy.maximum(0, end - trend_period)
+        n = (end - start + 1).astype(numpy.float64)
+        sum_y = self._sum_y[end + 1] - self._sum_y[start]
+        sum_xy = self._sum_xy[end + 1] - self._sum_xy[start] - start * sum_y
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+        intercept = (sum_y - slope * sum_x) / n
+        return slope, intercept
+
+
 def calculate_trend_coefficients(trend_values) -> Trend:
     coefficients = numpy.polyfit(range(len(trend_values)), trend_values, 1)[:2]
     return Trend(coefficients[0], coefficients[1])
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, List
+
+import numpy
+
+from ittools.cfd.flow_data import FlowData
+
+DEFAULT_TRIALS = 50_000
+PERCENTILES = [50, 85, 95]
+MAX_FORECAST_DAYS = 5 * 365
+BLOCK_DAYS = 64
+
+
+class Forecast:
+    """Completion dates forecast by simulating future daily throughput
+
+    Each percentile is the date by which that percentage of the simulated futures
+    had completed the remaining scope. A date is None if too few futures completed
+    within the forecast horizon.
+    """
+
+    def __init__(self, trials: int, completion_dates: Dict[int, date | None]):
+        self.trials = trials
+        self.completion_dates = completion_dates
+
+    def __str__(self) -> str:
+        dates = ", ".join(f"P{percentile}={completion_date}" for percentile, completion_date in self.completion_dates.items())
+        return f"Forecast({dates})"
+
+
+def forecast_completion(
+    flow_data: FlowData,
+    trials: int = DEFAULT_TRIALS,
+    history_days: int | None = None,
+    seed: int | None = None,
+) -> Forecast:
+    """Forecast completion by sampling the daily throughput of the 'done' series
+
+    The daily throughput over the last `history_days` days (all days by default) is
+    sampled with replacement, for all trials at once, until every trial has done the
+    remaining scope of the last 'total' value.
+    """
+    throughput = _daily_throughput(flow_data.done, history_days)
+    remaining = flow_data.total[-1] - flow_data.done[-1]
+    days = _simulate_days_to_complete(throughput, remaining, trials, numpy.random.default_rng(seed))
+    return Forecast(trials, _completion_dates(flow_data.today, days))
+
+
+def _daily_throughput(done: List[int], history_days: int | None) -> numpy.ndarray:
+    throughput = numpy.clip(numpy.diff(numpy.asarray(done, dtype=numpy.float64)), 0, None)
+    return throughput[-history_days:] if history_days else throughput
+
+
+def _simulate_days_to_complete(
+    throughput: numpy.ndarray, remaining: float, trials: int, rng: numpy.random.Generator
+) -> numpy.ndarray:
+    """The number of days each trial took to complete, or infinity if it did not complete within the horizon"""
+    days = numpy.full(trials, numpy.inf)
+    if remaining <= 0:
+        days[:] = 0
+        return days
+    if not throughput.any():
+        return days
+
+    # Days are simulated in blocks, so memory stays bounded for long forecasts
+    pending = numpy.arange(trials)
+    done_so_far = numpy.zeros(trials)
+    elapsed = 0
+    while pending.size and elapsed < MAX_FORECAST_DAYS:
+        samples = rng.choice(throughput, size=(pending.size, BLOCK_DAYS))
+        cumulative = done_so_far[pending, None] + numpy.cumsum(samples, axis=1)
+        completed = cumulative[:, -1] >= remaining
+        first_complete_day = numpy.argmax(cumulative >= remaining, axis=1)
+        days[pending[completed]] = elapsed + first_complete_day[completed] + 1
+        done_so_far[pending] = cumulative[:, -1]
+        pending = pending[~completed]
+        elapsed += BLOCK_DAYS
+    return days
+
+
+def _completion_dates(today: date, days: numpy.ndarray) -> Dict[int, date | None]:
+    percentile_days = numpy.percentile(days, PERCENTILES, method="inverted_cdf")
+    return {
+        percentile: today + timedelta(days=int(day_count)) if numpy.isfinite(day_count) else None
+        for percentile, day_count in zip(PERCENTILES, percentile_days)
+    }
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Collection, Dict, Iterable, List, Tuple
+
+import numpy
+
+from ittools.domain.issue_counts import IssueCounts
+from ittools.domain.transition_log import TransitionLog
+
+PENDING, IN_PROGRESS, DONE = range(3)
+NOT_COUNTED = -1
+
+DailyCounts = Dict[str, Dict[str, IssueCounts]]
+
+
+class StatusCategories:
+    """How the statuses of issues are counted: as pending, in progress, done, or not at all"""
+
+    def __init__(
+        self, in_progress: Collection[str], done: Collection[str], excluded: Collection[str]
+    ):
+        self._categories = {status: IN_PROGRESS for status in in_progress}
+        self._categories.update({status: DONE for status in done})
+        self._categories.update({status: NOT_COUNTED for status in excluded})
+
+    def category(self, status: str) -> int:
+        return self._categories.get(status, PENDING)
+
+
+def reconstruct_daily_counts(
+    epic_keys: List[str],
+    issue_histories: Iterable[Tuple[str, TransitionLog]],
+    categories: StatusCategories,
+    first_date: date,
+    last_date: date,
+) -> DailyCounts:
+    """The issue counts of each epic at the end of each day, rebuilt from the status history of its issues
+
+    The histories are (epic key, transitions) pairs, and issues in other epics are ignored.
+
+    Every change of category (such as pending to in progress) becomes an event on the
+    day it happened, taking one from the old category and adding one to the new. The
+    events are bucketed by day and swept once with a running sum, so the cost is one
+    pass over the transitions plus one pass over the days. Changes before the first
+    date count from the first date, and changes after the last date are ignored.
+
+    Only issues are counted: epic size estimates and epic status are not part of the
+    history, so pending counts may be lower than those recorded on the day.
+    """
+    epic_indexes = {epic_key: index for index, epic_key in enumerate(epic_keys)}
+    events: List[Tuple[int, int, int, int]] = []
+    day_count = (last_date - first_date).days + 1
+    for epic_key, transitions in issue_histories:
+        if epic_key in epic_indexes:
+            events.extend(_category_changes(transitions, categories, epic_indexes[epic_key], first_date, day_count))
+
+    deltas = numpy.zeros((day_count, len(epic_keys), 3), dtype=numpy.int64)
+    if events:
+        days, epics, columns, changes = numpy.array(events, dtype=numpy.int64).T
+        numpy.add.at(deltas, (days, epics, columns), changes)
+    counts = numpy.cumsum(deltas, axis=0)
+
+    return {
+        str(first_date + timedelta(days=day)): {
+            epic_key: IssueCounts(*(int(count) for count in counts[day, epic_index]))
+            for epic_index, epic_key in enumerate(epic_keys)
+        }
+        for day in range(day_count)
+    }
+
+
+def _category_changes(
+    transitions: TransitionLog, categories: StatusCategories, epic_index: int, first_date: date, day_count: int
+) -> List[Tuple[int, int, int, int]]:
+    """(day, epic, category, change) events for each time the issue moved to a different category"""
+    changes = []
+    current = NOT_COUNTED
+    for status, start_time in zip(transitions.statuses, transitions.start_times):
+        category = categories.category(status)
+        if category == current:
+            continue
+        day = max(0, (start_time.date() - first_date).days)
+        if day < day_count:
+            if current != NOT_COUNTED:
+                changes.append((day, epic_index, current, -1))
+            if category != NOT_COUNTED:
+                changes.append((day, epic_index, category, 1))
+        current = category
+    return changes
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import csv
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas
+
+from ittools.domain.issue_counts import IssueCounts
+
+PROGRESS_DB = "progress.sqlite"
+CSV_FIELD_NAMES = ["date", "epic", "pending", "in_progress", "done", "total"]
+COUNT_COLUMNS = ["pending", "in_progress", "done"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    date TEXT NOT NULL,
+    epic TEXT NOT NULL,
+    pending INTEGER NOT NULL,
+    in_progress INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (epic, date)
+);
+"""
+
+EpicProgress = List[Tuple[str, IssueCounts]]
+
+
+class ProgressStore:
+    """The daily issue counts of each epic, kept in a single SQLite database in the report directory
+
+    Each run adds one row per epic for the day (replacing any earlier row for the same
+    day), in a single transaction. Days without a row are not stored: when progress is
+    read, each missing day takes the counts from the day before.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path))
+        self._db.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, report_dir: str) -> ProgressStore:
+        return cls(Path(report_dir) / PROGRESS_DB)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def store_counts(self, count_date: str, epic_counts: Dict[str, IssueCounts]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?, ?, ?)",
+                [_progress_row(count_date, epic_key, counts) for epic_key, counts in epic_counts.items()],
+            )
+
+    def store_daily_counts(self, daily_counts: Dict[str, Dict[str, IssueCounts]], replace: bool = False) -> int:
+        """Store the counts of many days in one transaction, returning the number of rows written
+
+        Days that already have counts for an epic are kept, unless `replace` is set.
+        """
+        conflict = "REPLACE" if replace else "IGNORE"
+        with self._db:
+            cursor = self._db.executemany(
+                f"INSERT OR {conflict} INTO progress VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    _progress_row(count_date, epic_key, counts)
+                    for count_date, epic_counts in daily_counts.items()
+                    for epic_key, counts in epic_counts.items()
+                ],
+            )
+        return cursor.rowcount
+
+    def has_epic(self, epic_key: str) -> bool:
+        return self._db.execute("SELECT 1 FROM progress WHERE epic = ? LIMIT 1", (epic_key,)).fetchone() is not None
+
+    def epic_progress(self, epic_key: str) -> EpicProgress:
+        """The counts for every day from the first to the last stored day, in date order"""
+        rows = self._db.execute(
+            "SELECT date, pending, in_progress, done FROM progress WHERE epic = ? ORDER BY date", (epic_key,)
+        )
+        return _fill_missing_dates([(row[0], IssueCounts(row[1], row[2], row[3])) for row in rows])
+
+    def project_progress(self, epic_keys: List[str]) -> pandas.DataFrame:
+        """The total counts of the epics for every day, read with a single query
+
+        Each epic contributes its counts from its first to its last stored day (filling
+        in missing days from the day before), and nothing outside that range.
+        """
+        rows = pandas.read_sql_query(
+            f"SELECT date, epic, {', '.join(COUNT_COLUMNS)} FROM progress"
+            f" WHERE epic IN ({', '.join('?' * len(epic_keys))})",
+            self._db,
+            params=list(epic_keys),
+        )
+        if rows.empty:
+            return pandas.DataFrame(columns=["date", *COUNT_COLUMNS, "total"])
+
+        dates = pandas.date_range(rows["date"].min(), rows["date"].max(), freq="D").strftime("%Y-%m-%d")
+        epic_counts = rows.pivot(index="date", columns="epic", values=COUNT_COLUMNS).reindex(dates)
+        stored_range = epic_counts.ffill().notna() & epic_counts.bfill().notna()
+        epic_counts = epic_counts.ffill().where(stored_range, 0)
+
+        progress = pandas.DataFrame({column: epic_counts[column].sum(axis=1) for column in COUNT_COLUMNS}).astype(int)
+        progress["total"] = progress.sum(axis=1)
+        return progress.rename_axis("date").reset_index()
+
+    def import_csv(self, csv_path: Path, epic_key: str) -> int:
+        """Load an epic progress file in the CSV layout, returning the number of days loaded"""
+        with csv_path.open("r", encoding="UTF8") as f:
+            rows = [_progress_row(row["date"], epic_key, _counts_from_row(row)) for row in csv.DictReader(f)]
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def export_csv(self, csv_path: Path, epic_key: str) -> None:
+        """Write the progress of an epic in the CSV layout, including the filled in days"""
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        with csv_path.open("w", encoding="UTF8") as f:
+            csv_writer = csv.DictWriter(f, fieldnames=CSV_FIELD_NAMES)
+            csv_writer.writeheader()
+            for count_date, counts in self.epic_progress(epic_key):
+                csv_writer.writerow(dict(zip(CSV_FIELD_NAMES, _progress_row(count_date, epic_key, counts))))
+
+
+def _progress_row(count_date: str, epic_key: str, counts: IssueCounts) -> Tuple[str, str, int, int, int, int]:
+    return count_date, epic_key, counts.pending, counts.in_progress, counts.done, counts.total
+
+
+def _counts_from_row(row: Dict[str, str]) -> IssueCounts:
+    return IssueCounts(int(row["pending"]), int(row["in_progress"]), int(row["done"]))
+
+
+def _fill_missing_dates(progress: EpicProgress) -> EpicProgress:
+    filled: EpicProgress = []
+    for count_date, counts in progress:
+        if filled:
+            previous_date, previous_counts = filled[-1]
+            missing_date = date.fromisoformat(previous_date) + timedelta(days=1)
+            while missing_date < date.fromisoformat(count_date):
+                filled.append((str(missing_date), previous_counts))
+                missing_date += timedelta(days=1)
+        filled.append((count_date, counts))
+    return filled
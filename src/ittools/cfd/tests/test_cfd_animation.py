@@ -0,0 +1,39 @@
+from datetime import date
+
+import pandas as pd
+from PIL import Image
+
+from ittools.cfd.cfd_animation import CfdAnimation
+from ittools.config import ProjectConfig
+
+
+def test_animation_has_a_frame_for_each_day(tmp_path) -> None:
+    animation = CfdAnimation(progress_data_frame(10), ProjectConfig({"name": "Animated"}), str(tmp_path))
+
+    animation.run(verbose=False)
+
+    assert animation.animation_file == f"{tmp_path}/cfd-anim-2023-06-10.gif"
+    with Image.open(animation.animation_file) as gif:
+        assert gif.n_frames == 10
+
+
+def test_animation_stops_at_the_last_date(tmp_path) -> None:
+    animation = CfdAnimation(
+        progress_data_frame(10), ProjectConfig({"name": "Animated"}), str(tmp_path), last_date=date(2023, 6, 4)
+    )
+
+    animation.run(verbose=False)
+
+    assert animation.animation_file == f"{tmp_path}/cfd-anim-2023-06-04.gif"
+    with Image.open(animation.animation_file) as gif:
+        assert gif.n_frames == 4
+
+
+def progress_data_frame(days: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": [f"2023-06-{day:02}" for day in range(1, days + 1)],
+        "pending": [20 - day for day in range(days)],
+        "in_progress": [1] * days,
+        "done": list(range(days)),
+        "total": [21] * days,
+    })
@@ -2,21 +2,21 @@ import textwrap
 from unittest.mock import Mock
 
 from ittools.config import ReportOptions
-from ittools.cfd.cfd_db import store_project_counts
+from ittools.cfd.cfd_db import export_epic_csv, store_project_counts
+from ittools.cfd.progress_store import ProgressStore
 from ittools.domain.epic import Epic
 from ittools.domain.issue_counts import IssueCounts
 from ittools.domain.project import Project
 
 
-def test_csv_created_when_missing(tmp_path):
+def test_csv_exported_from_new_store(tmp_path):
     options = mock_options(tmp_path)
     project = mock_project("test_project", [mock_epic("DS-1111", IssueCounts(1, 1, 1))])
-    csv_path = tmp_path / "epics" / "DS-1111" / "progress.csv"
 
     store_project_counts("2022-08-16", project, options)
 
-    assert csv_path.exists()
-    assert csv_path.read_text() == textwrap.dedent(
+    assert (tmp_path / "progress.sqlite").exists()
+    assert exported_csv(tmp_path, "DS-1111") == textwrap.dedent(
         """\
         date,epic,pending,in_progress,done,total
         2022-08-16,DS-1111,1,1,1,3
@@ -24,7 +24,7 @@ def test_csv_created_when_missing(tmp_path):
     )
 
 
-def test_csv_appended_when_already_present(tmp_path):
+def test_existing_csv_imported_before_storing(tmp_path):
     options = mock_options(tmp_path)
     project = mock_project("test_project", [mock_epic("DS-2222", IssueCounts(1, 1, 1))])
     csv_path = tmp_path / "epics" / "DS-2222" / "progress.csv"
@@ -40,7 +40,7 @@ def test_csv_appended_when_already_present(tmp_path):
 
     store_project_counts("2022-08-16", project, options)
 
-    assert csv_path.read_text() == textwrap.dedent(
+    assert exported_csv(tmp_path, "DS-2222") == textwrap.dedent(
         """\
         date,epic,pending,in_progress,done,total
         2022-08-15,DS-2222,1,2,0,3
@@ -49,7 +49,7 @@ def test_csv_appended_when_already_present(tmp_path):
     )
 
 
-def test_csv_fills_in_missing_dates(tmp_path):
+def test_missing_dates_filled_when_read(tmp_path):
     options = mock_options(tmp_path)
     project = mock_project("test_project", [mock_epic("DS-3333", IssueCounts(1, 1, 1))])
     csv_path = tmp_path / "epics" / "DS-3333" / "progress.csv"
@@ -65,7 +65,7 @@ def test_csv_fills_in_missing_dates(tmp_path):
 
     store_project_counts("2022-08-16", project, options)
 
-    assert csv_path.read_text() == textwrap.dedent(
+    assert exported_csv(tmp_path, "DS-3333") == textwrap.dedent(
         """\
         date,epic,pending,in_progress,done,total
         2022-08-13,DS-3333,1,2,0,3
@@ -76,6 +76,29 @@ def test_csv_fills_in_missing_dates(tmp_path):
     )
 
 
+def test_all_project_epics_stored(tmp_path):
+    options = mock_options(tmp_path)
+    project = mock_project("test_project", [
+        mock_epic("DS-1111", IssueCounts(1, 1, 1)),
+        mock_epic("DS-2222", IssueCounts(0, 2, 5)),
+    ])
+
+    store_project_counts("2022-08-16", project, options)
+
+    store = ProgressStore.open(str(tmp_path))
+    assert store.epic_progress("DS-1111") == [("2022-08-16", IssueCounts(1, 1, 1))]
+    assert store.epic_progress("DS-2222") == [("2022-08-16", IssueCounts(0, 2, 5))]
+    store.close()
+
+
+def exported_csv(report_dir, epic_key: str) -> str:
+    store = ProgressStore.open(str(report_dir))
+    try:
+        return export_epic_csv(store, str(report_dir), epic_key).read_text()
+    finally:
+        store.close()
+
+
 def setup_initial_csv(csv_path, content):
     csv_path.parent.mkdir(parents=True)
     with csv_path.open("w", encoding="UTF8") as f:
@@ -0,0 +1,59 @@
+from datetime import date
+
+import matplotlib.dates as mdates
+import matplotlib.pyplot as pyplot
+import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+from ittools.cfd.cumulative_flow_graph import CumulativeFlowGraph, colour_schemes
+from ittools.cfd.flow_data import FlowData
+from ittools.cfd.monte_carlo import Forecast
+from ittools.config import ProjectConfig
+
+TODAY = date(2023, 6, 10)
+
+
+def test_forecast_dates_are_drawn_on_the_graph(tmp_path) -> None:
+    forecast_dates = {50: date(2023, 6, 20), 85: date(2023, 7, 1), 95: date(2023, 8, 15)}
+    graph = CumulativeFlowGraph(flow_data(), ProjectConfig({"name": "Forecast"}), f"{tmp_path}/cfd.png", TODAY)
+    graph.use_forecast(Forecast(1000, forecast_dates))
+
+    graph.run(verbose=False)
+
+    axes = pyplot.gca()
+    assert forecast_line_dates(axes) == sorted(forecast_dates.values())
+    assert mdates.num2date(axes.get_xlim()[1]).date() >= date(2023, 8, 15)
+    pyplot.close("all")
+
+
+def test_forecast_dates_beyond_the_horizon_are_not_drawn(tmp_path) -> None:
+    graph = CumulativeFlowGraph(flow_data(), ProjectConfig({"name": "Forecast"}), f"{tmp_path}/cfd.png", TODAY)
+    graph.use_forecast(Forecast(1000, {50: date(2023, 6, 20), 85: None, 95: None}))
+
+    graph.run(verbose=False)
+
+    assert forecast_line_dates(pyplot.gca()) == [date(2023, 6, 20)]
+    pyplot.close("all")
+
+
+def flow_data() -> FlowData:
+    days = 10
+    data_frame = pd.DataFrame({
+        "date": [f"2023-06-{day:02}" for day in range(1, days + 1)],
+        "pending": [20 - day for day in range(days)],
+        "in_progress": [1] * days,
+        "done": list(range(days)),
+        "total": [21] * days,
+    })
+    return FlowData(data_frame, TODAY)
+
+
+def forecast_line_dates(axes) -> list:
+    forecast_colour = to_rgba(colour_schemes["default"]["Forecast"])
+    return sorted(
+        mdates.num2date(segment[0][0]).date()
+        for collection in axes.collections
+        if isinstance(collection, LineCollection) and tuple(collection.get_colors()[0]) == forecast_colour
+        for segment in collection.get_segments()
+    )
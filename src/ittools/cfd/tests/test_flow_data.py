@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 from datetime import date, timedelta
 
-from ittools.cfd.flow_data import FlowData, Trend
+from ittools.cfd.flow_data import FlowData, IncrementalFlowData, RollingRegression, Trend, calculate_trend_coefficients
 
 
 def test_uniform_trend() -> None:
@@ -62,6 +62,65 @@ def test_dates_after_today_are_excluded() -> None:
     assert flow_data.total[-1] == 100
 
 
+def test_rolling_regression_matches_trend_coefficients() -> None:
+    values = np.cumsum(np.random.default_rng(42).integers(0, 5, size=60))
+
+    for trend_period in [1, 2, 7, 14, 100]:
+        slopes, intercepts = RollingRegression(values).trends(trend_period)
+
+        assert math.isnan(slopes[0])
+        for end in range(1, len(values)):
+            expected = calculate_trend_coefficients(values[max(0, end - trend_period): end + 1])
+            assert math.isclose(slopes[end], expected.slope, rel_tol=1e-9, abs_tol=1e-9)
+            assert math.isclose(intercepts[end], expected.intercept, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_slopes_for_other_windows() -> None:
+    today = date(2023, 6, 30)
+    flow_data = FlowData(increasing_progress_df(today), today)
+
+    slopes = flow_data.slopes_for_window(4)
+
+    assert len(slopes) == 4
+    assert flow_data.slopes_for_window(flow_data.trend_period) == flow_data.slope_history
+    assert math.isclose(slopes[-1], calculate_trend_coefficients(flow_data.done[-5:]).slope)
+
+
+def test_incremental_flow_data_matches_a_fresh_flow_data_each_day() -> None:
+    df = random_progress_df(date(2023, 6, 30), 90)
+    dates = [date.fromisoformat(date_str) for date_str in df["date"]]
+
+    for trend_period in [1, 3, 14, 120]:
+        flow_data = IncrementalFlowData(df, dates[0], trend_period, initial_slope=2.0)
+        for today in dates:
+            expected = FlowData(df, today, trend_period, initial_slope=2.0)
+            assert flow_data.today == today
+            assert flow_data.done == expected.done
+            assert flow_data.slope_history == expected.slope_history
+            for trend in ["current_trend", "optimistic_trend", "pessimistic_trend"]:
+                assert_equal_trends(getattr(flow_data, trend), getattr(expected, trend))
+            assert flow_data.optimistic_completion_date == expected.optimistic_completion_date
+            assert flow_data.pessimistic_completion_date == expected.pessimistic_completion_date
+            if flow_data.can_advance:
+                flow_data.advance()
+
+
+def test_incremental_flow_data_can_start_part_way() -> None:
+    today = date(2023, 6, 30)
+    df = increasing_progress_df(today)
+
+    flow_data = IncrementalFlowData(df, today - timedelta(days=3))
+    flow_data.advance()
+    flow_data.advance()
+    flow_data.advance()
+
+    expected = FlowData(df, today)
+    assert not flow_data.can_advance
+    assert flow_data.dates == expected.dates
+    assert flow_data.slopes_for_window(4) == expected.slopes_for_window(4)
+    assert_equal_trends(flow_data.optimistic_trend, expected.optimistic_trend)
+
+
 def uniform_progress_df(final_date) -> pd.DataFrame:
     dates = date_array(final_date, 16)
     return pd.DataFrame(
@@ -87,6 +146,20 @@ def increasing_progress_df(final_date) -> pd.DataFrame:
     )
 
 
+def random_progress_df(final_date, size) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    done = np.cumsum(rng.integers(0, 4, size=size))
+    in_progress = rng.integers(0, 6, size=size)
+    total = np.maximum.accumulate(done + in_progress + rng.integers(20, 40, size=size))
+    return pd.DataFrame({
+        "date": date_array(final_date, size),
+        "pending": total - done - in_progress,
+        "in_progress": in_progress,
+        "done": done,
+        "total": total,
+    })
+
+
 def date_array(final_date, size):
     """sequential dates ending in final_date"""
     return np.array([str(final_date + timedelta(days=i)) for i in range(1 - size, 1)])
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from ittools.cfd.flow_data import FlowData
+from ittools.cfd.monte_carlo import forecast_completion
+
+TODAY = date(2023, 6, 30)
+
+
+def test_constant_throughput_completes_on_the_same_day_in_every_trial() -> None:
+    flow_data = flow_data_for(done=[0, 2, 4, 6, 8], total=20)
+
+    forecast = forecast_completion(flow_data, trials=1000, seed=1)
+
+    assert forecast.completion_dates == {50: TODAY + timedelta(days=6), 85: TODAY + timedelta(days=6),
+                                         95: TODAY + timedelta(days=6)}
+
+
+def test_forecasts_spanning_several_simulation_blocks() -> None:
+    flow_data = flow_data_for(done=[0, 1, 2], total=202)
+
+    forecast = forecast_completion(flow_data, trials=100, seed=1)
+
+    assert forecast.completion_dates[95] == TODAY + timedelta(days=200)
+
+
+def test_percentiles_are_in_order() -> None:
+    flow_data = flow_data_for(done=[0, 0, 3, 4, 4, 9, 10, 10, 12, 15], total=60)
+
+    forecast = forecast_completion(flow_data, trials=5000, seed=1)
+
+    dates = forecast.completion_dates
+    assert TODAY < dates[50] <= dates[85] <= dates[95]
+
+
+def test_history_days_limits_the_sampled_throughput() -> None:
+    flow_data = flow_data_for(done=[0, 5, 10, 11, 12], total=22)
+
+    forecast = forecast_completion(flow_data, trials=100, history_days=2, seed=1)
+
+    assert forecast.completion_dates[50] == TODAY + timedelta(days=10)
+
+
+def test_completed_scope_completes_today() -> None:
+    flow_data = flow_data_for(done=[0, 2, 4], total=4)
+
+    assert forecast_completion(flow_data, trials=10).completion_dates[95] == TODAY
+
+
+def test_no_throughput_never_completes() -> None:
+    flow_data = flow_data_for(done=[3, 3, 3], total=10)
+
+    assert forecast_completion(flow_data, trials=10).completion_dates == {50: None, 85: None, 95: None}
+
+
+def flow_data_for(done, total) -> FlowData:
+    dates = [TODAY - timedelta(days=days) for days in reversed(range(len(done)))]
+    data_frame = pd.DataFrame(
+        data={
+            "date": [str(d) for d in dates],
+            "pending": [total - value for value in done],
+            "in_progress": [0] * len(done),
+            "done": done,
+            "total": [total] * len(done),
+        }
+    )
+    return FlowData(data_frame, TODAY)
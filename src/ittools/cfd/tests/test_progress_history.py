@@ -0,0 +1,72 @@
+from datetime import date, datetime
+
+from ittools.cfd.progress_history import StatusCategories, reconstruct_daily_counts
+from ittools.domain.issue_counts import IssueCounts
+from ittools.domain.transition_log import TransitionLog
+
+CATEGORIES = StatusCategories(["In Progress", "In Review"], ["Done"], ["Closed"])
+
+
+def test_counts_follow_each_issue_through_its_statuses():
+    histories = [
+        ("DS-100", history(datetime(2023, 10, 2, 9), ("In Progress", datetime(2023, 10, 3, 10)),
+                           ("Done", datetime(2023, 10, 4, 16)))),
+        ("DS-100", history(datetime(2023, 10, 3, 9))),
+    ]
+
+    daily_counts = reconstruct_daily_counts(["DS-100"], histories, CATEGORIES, date(2023, 10, 1), date(2023, 10, 5))
+
+    assert [daily_counts[day]["DS-100"] for day in sorted(daily_counts)] == [
+        IssueCounts(0, 0, 0),
+        IssueCounts(1, 0, 0),
+        IssueCounts(1, 1, 0),
+        IssueCounts(1, 0, 1),
+        IssueCounts(1, 0, 1),
+    ]
+
+
+def test_moves_within_a_category_and_to_excluded_statuses():
+    histories = [
+        ("DS-100", history(datetime(2023, 10, 2, 9), ("In Progress", datetime(2023, 10, 2, 10)),
+                           ("In Review", datetime(2023, 10, 3, 10)), ("Closed", datetime(2023, 10, 4, 10)))),
+    ]
+
+    daily_counts = reconstruct_daily_counts(["DS-100"], histories, CATEGORIES, date(2023, 10, 2), date(2023, 10, 4))
+
+    assert daily_counts["2023-10-02"]["DS-100"] == IssueCounts(0, 1, 0)
+    assert daily_counts["2023-10-03"]["DS-100"] == IssueCounts(0, 1, 0)
+    assert daily_counts["2023-10-04"]["DS-100"] == IssueCounts(0, 0, 0)
+
+
+def test_history_outside_the_date_range():
+    histories = [
+        ("DS-100", history(datetime(2023, 9, 1, 9), ("Done", datetime(2023, 9, 20, 10)))),
+        ("DS-100", history(datetime(2023, 9, 1, 9), ("In Progress", datetime(2023, 10, 20, 10)))),
+    ]
+
+    daily_counts = reconstruct_daily_counts(["DS-100"], histories, CATEGORIES, date(2023, 10, 1), date(2023, 10, 2))
+
+    assert list(daily_counts) == ["2023-10-01", "2023-10-02"]
+    assert daily_counts["2023-10-02"]["DS-100"] == IssueCounts(1, 0, 1)
+
+
+def test_epics_are_counted_separately():
+    histories = [
+        ("DS-100", history(datetime(2023, 10, 1, 9))),
+        ("DS-200", history(datetime(2023, 10, 1, 9), ("Done", datetime(2023, 10, 1, 10)))),
+        ("DS-300", history(datetime(2023, 10, 1, 9))),
+    ]
+
+    daily_counts = reconstruct_daily_counts(
+        ["DS-100", "DS-200", "DS-400"], histories, CATEGORIES, date(2023, 10, 1), date(2023, 10, 1)
+    )
+
+    assert daily_counts["2023-10-01"] == {
+        "DS-100": IssueCounts(1, 0, 0),
+        "DS-200": IssueCounts(0, 0, 1),
+        "DS-400": IssueCounts(0, 0, 0),
+    }
+
+
+def history(created: datetime, *transitions) -> TransitionLog:
+    return TransitionLog.create("Selected for Development", created, list(transitions))
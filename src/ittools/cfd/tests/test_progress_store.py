@@ -0,0 +1,86 @@
+import pytest
+
+from ittools.cfd.progress_store import ProgressStore
+from ittools.domain.issue_counts import IssueCounts
+
+
+@pytest.fixture
+def store(tmp_path) -> ProgressStore:
+    progress_store = ProgressStore.open(str(tmp_path))
+    yield progress_store
+    progress_store.close()
+
+
+def test_counts_for_the_same_day_are_replaced(store):
+    store.store_counts("2022-08-16", {"DS-1": IssueCounts(3, 0, 0)})
+    store.store_counts("2022-08-16", {"DS-1": IssueCounts(2, 1, 0)})
+
+    assert store.epic_progress("DS-1") == [("2022-08-16", IssueCounts(2, 1, 0))]
+
+
+def test_missing_days_use_the_previous_counts(store):
+    store.store_counts("2022-08-12", {"DS-1": IssueCounts(3, 0, 0)})
+    store.store_counts("2022-08-15", {"DS-1": IssueCounts(1, 1, 1)})
+
+    assert store.epic_progress("DS-1") == [
+        ("2022-08-12", IssueCounts(3, 0, 0)),
+        ("2022-08-13", IssueCounts(3, 0, 0)),
+        ("2022-08-14", IssueCounts(3, 0, 0)),
+        ("2022-08-15", IssueCounts(1, 1, 1)),
+    ]
+
+
+def test_daily_counts_keep_existing_days_unless_replaced(store):
+    store.store_counts("2022-08-13", {"DS-1": IssueCounts(3, 0, 0)})
+    daily_counts = {
+        "2022-08-12": {"DS-1": IssueCounts(4, 0, 0)},
+        "2022-08-13": {"DS-1": IssueCounts(2, 1, 0)},
+    }
+
+    assert store.store_daily_counts(daily_counts) == 1
+    assert store.epic_progress("DS-1") == [("2022-08-12", IssueCounts(4, 0, 0)), ("2022-08-13", IssueCounts(3, 0, 0))]
+
+    assert store.store_daily_counts(daily_counts, replace=True) == 2
+    assert store.epic_progress("DS-1")[-1] == ("2022-08-13", IssueCounts(2, 1, 0))
+
+
+def test_epics_are_kept_separate(store):
+    store.store_counts("2022-08-16", {"DS-1": IssueCounts(3, 0, 0), "DS-2": IssueCounts(0, 0, 4)})
+
+    assert store.has_epic("DS-2")
+    assert not store.has_epic("DS-3")
+    assert store.epic_progress("DS-2") == [("2022-08-16", IssueCounts(0, 0, 4))]
+    assert store.epic_progress("DS-3") == []
+
+
+def test_csv_round_trip(store, tmp_path):
+    csv_path = tmp_path / "progress.csv"
+    csv_path.write_text("date,epic,pending,in_progress,done,total\n2022-08-15,DS-1,1,2,0,3\n2022-08-16,DS-1,1,1,1,3\n")
+
+    assert store.import_csv(csv_path, "DS-1") == 2
+    export_path = tmp_path / "export" / "progress.csv"
+    store.export_csv(export_path, "DS-1")
+
+    assert export_path.read_text() == csv_path.read_text()
+
+
+def test_project_progress_totals_epics_by_date(store):
+    store.store_counts("2022-08-12", {"DS-1": IssueCounts(3, 0, 0)})
+    store.store_counts("2022-08-14", {"DS-1": IssueCounts(2, 1, 0), "DS-2": IssueCounts(1, 0, 0)})
+    store.store_counts("2022-08-15", {"DS-2": IssueCounts(0, 1, 1), "DS-3": IssueCounts(9, 9, 9)})
+
+    progress = store.project_progress(["DS-1", "DS-2"])
+
+    assert progress.to_dict("records") == [
+        {"date": "2022-08-12", "pending": 3, "in_progress": 0, "done": 0, "total": 3},
+        {"date": "2022-08-13", "pending": 3, "in_progress": 0, "done": 0, "total": 3},
+        {"date": "2022-08-14", "pending": 3, "in_progress": 1, "done": 0, "total": 4},
+        {"date": "2022-08-15", "pending": 0, "in_progress": 1, "done": 1, "total": 2},
+    ]
+
+
+def test_project_progress_without_stored_epics(store):
+    progress = store.project_progress(["DS-1"])
+
+    assert progress.empty
+    assert list(progress.columns) == ["date", "pending", "in_progress", "done", "total"]
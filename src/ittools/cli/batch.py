@@ -0,0 +1,270 @@
+"""`it batch`: many reports run in one process, from a plan file
+
+All the Jira data the reports of a plan need is fetched first, with one query for each
+kind of data rather than one for each report: the epics of each project or label, the
+child statuses of all project epics together, the working issues, and the resolved
+issues of each span of overlapping date ranges (for every team and label at once). The reports are then rendered in parallel
+from that data, each printing to its own output file.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+import yaml
+
+from ittools.config import ReportOptions
+from ittools.jira.field_profile import FieldProfile
+from ittools.jira.jira_ext import JiraEpic, JiraIssue, JiraServer, ProjectIssueCounts
+
+REPORTS = ["project", "in-progress", "resolved", "cfd"]
+PROJECT_REPORTS = ["project", "cfd"]
+DEFAULT_MAX_WORKERS = 4
+
+DateRange = Tuple[str, str]
+
+
+class BatchEntry:
+    """One report of a batch plan, and the file its output is written to"""
+
+    def __init__(self, entry: Dict[str, Any], plan_dir: str):
+        self.report: str = entry.get("report", "")
+        if self.report not in REPORTS:
+            raise ValueError(f"Unknown report '{self.report}' in batch plan (expected one of {', '.join(REPORTS)})")
+        if "output" not in entry:
+            raise ValueError(f"The {self.report} report in the batch plan has no output file")
+        self.output = os.path.join(plan_dir, os.path.expanduser(str(entry["output"])))
+        self.project: str | None = entry.get("project")
+        if self.report in PROJECT_REPORTS and not self.project:
+            raise ValueError(f"The {self.report} report in the batch plan has no project")
+        self.group_by: str | None = entry.get("group_by")
+        self.days: int | None = entry.get("days")
+        self.from_date: str | None = _optional_str(entry.get("from"))
+        self.to_date: str | None = _optional_str(entry.get("to"))
+        self.label: str | None = entry.get("label")
+        self.team: str | None = entry.get("team")
+
+    def resolved_range(self) -> DateRange:
+        """The dates of the issues in a resolved report, as the report itself works them out"""
+        from ittools.reports.report_resolved import jira_from_date_days_ago, jira_to_date
+
+        if not (self.from_date or self.days):
+            raise ValueError("A resolved report in the batch plan needs either days or a from date")
+        return self.from_date or jira_from_date_days_ago(self.days), self.to_date or jira_to_date()
+
+
+class BatchPlan:
+    def __init__(self, plan: Dict[str, Any], plan_dir: str = "."):
+        self.reports = [BatchEntry(entry, plan_dir) for entry in plan.get("reports") or []]
+
+    @classmethod
+    def load(cls, plan_file: str) -> BatchPlan:
+        with open(plan_file, "r") as file:
+            return BatchPlan(yaml.safe_load(file) or {}, os.path.dirname(os.path.abspath(plan_file)))
+
+    def of(self, *reports: str) -> List[BatchEntry]:
+        return [entry for entry in self.reports if entry.report in reports]
+
+
+class SharedJira:
+    """The Jira data for all the reports of a batch plan, which answers their queries once it is fetched
+
+    Reports are given this in place of the Jira server. Everything they ask for is
+    fetched up front, from the main thread, so rendering never waits for the server
+    or the issue store.
+    """
+
+    def __init__(self, jira: JiraServer):
+        self._jira = jira
+        self._project_epics: Dict[str, List[JiraEpic]] = {}
+        self._working_issues: List[JiraIssue] = []
+        self._resolved_issues: List[Tuple[DateRange, List[JiraIssue]]] = []
+        self._epics: Dict[str, JiraEpic] = {}
+
+    @property
+    def as_of(self) -> datetime | None:
+        return None
+
+    def fetch(self, plan: BatchPlan, report_fields: Dict[str, FieldProfile]) -> None:
+        labels = list(dict.fromkeys(entry.project for entry in plan.of(*PROJECT_REPORTS)))
+        epic_labels = [entry.label for entry in plan.of("resolved") if entry.label and entry.label not in labels]
+        for label in dict.fromkeys(labels + epic_labels):
+            self._project_epics[label] = self._jira.query_project_epics(label)
+        if labels:
+            self._count_project_issues(labels)
+        epic_issues: List[JiraIssue] = []
+        if plan.of("in-progress"):
+            self._working_issues = self._jira.query_working_issues(report_fields["in-progress"])
+            JiraIssue.calculate_durations(self._working_issues)
+            epic_issues.extend(self._working_issues)
+        for date_range in merge_date_ranges(entry.resolved_range() for entry in plan.of("resolved")):
+            issues = self._jira.query_resolved_issues(*date_range, report_fields["resolved"])
+            JiraIssue.calculate_durations(issues)
+            self._resolved_issues.append((date_range, issues))
+            epic_issues.extend(issues)
+        if epic_issues:
+            self._epics.update(self._jira.jira_epics(issue.epic_key for issue in epic_issues))
+
+    def _count_project_issues(self, labels: List[str]) -> None:
+        """Count the issues of every epic of the projects, with one query"""
+        all_epics = [epic for label in labels for epic in self._project_epics[label]]
+        project_counts = ProjectIssueCounts(all_epics, self._jira)
+        for epic in all_epics:
+            epic.count_issues_with(project_counts)
+            self._epics[epic.key] = epic
+        if all_epics:
+            project_counts.issue_counts_for(all_epics[0])
+
+    def query_project_epics(self, project_label: str) -> List[JiraEpic]:
+        return self._project_epics[project_label]
+
+    def query_working_issues(self, fields: FieldProfile) -> List[JiraIssue]:
+        return list(self._working_issues)
+
+    def query_resolved_issues(
+        self,
+        from_date: str,
+        to_date: str,
+        fields: FieldProfile,
+        assignees: List[str] | None = None,
+        epic_keys: List[str] | None = None,
+    ) -> List[JiraIssue]:
+        """The resolved issues, taken from those fetched for all the reports"""
+        from_time, to_time = _local_midnight(from_date), _local_midnight(to_date)
+        for (fetched_from, fetched_to), issues in self._resolved_issues:
+            if fetched_from <= str(from_date) and str(to_date) <= fetched_to:
+                return [
+                    issue for issue in issues
+                    if issue.resolution_time() and from_time <= issue.resolution_time() < to_time
+                    and (not assignees or issue.assignee in assignees)
+                    and (epic_keys is None or issue.epic_key in epic_keys)
+                ]
+        raise ValueError(f"Issues resolved from {from_date} to {to_date} were not fetched for the batch plan")
+
+    def jira_epics(self, epic_keys: Iterable[str | None]) -> Dict[str, JiraEpic]:
+        return {key: self._epics[key] for key in epic_keys if key in self._epics}
+
+
+def merge_date_ranges(date_ranges: Iterable[DateRange]) -> List[DateRange]:
+    """The fewest ranges covering all the dates, joining ranges that overlap or meet"""
+    merged: List[DateRange] = []
+    for from_date, to_date in sorted((str(from_date), str(to_date)) for from_date, to_date in date_ranges):
+        if merged and from_date <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], to_date))
+        else:
+            merged.append((from_date, to_date))
+    return merged
+
+
+def run_batch(plan: BatchPlan, options: ReportOptions, jira: JiraServer, max_workers: int = DEFAULT_MAX_WORKERS) -> int:
+    """Fetch the data for all the reports of the plan, then render them in parallel, returning the number that failed"""
+    from ittools.cfd.cfd_db import store_project_counts
+    from ittools.domain.project import Project
+    from ittools.reports.report_in_progress import InProgressReport
+    from ittools.reports.report_resolved import ResolvedReport
+
+    shared = SharedJira(jira)
+    shared.fetch(plan, {"in-progress": InProgressReport.FIELDS, "resolved": ResolvedReport.FIELDS})
+    report_date = str(date.today())
+    # As with `it project`, today's counts are recorded, before any cfd report reads them
+    for label in dict.fromkeys(entry.project for entry in plan.of("project")):
+        store_project_counts(report_date, Project(label, shared.query_project_epics(label)), options)
+
+    thread_stdout = _ThreadStdout(sys.stdout)
+    plot_lock = threading.Lock()
+    renderers: Dict[str, Callable[[BatchEntry], None]] = {
+        "project": lambda entry: _render_project(entry, shared, report_date),
+        "in-progress": lambda entry: InProgressReport(options, shared).run(
+            entry.group_by == "epic", entry.group_by == "team"
+        ),
+        "resolved": lambda entry: _render_resolved(entry, options, shared),
+        "cfd": lambda entry: _render_cfd(entry, options, shared, plot_lock),
+    }
+
+    def render(entry: BatchEntry) -> None:
+        Path(entry.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(entry.output, "w", encoding="utf-8") as output, thread_stdout.writing_to(output):
+            renderers[entry.report](entry)
+
+    failures = 0
+    with contextlib.redirect_stdout(thread_stdout), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for entry, future in [(entry, pool.submit(render, entry)) for entry in plan.reports]:
+            error = future.exception()
+            if error:
+                failures += 1
+                sys.stderr.write(f"{entry.report} report failed: {getattr(error, 'message', repr(error))}\n")
+            else:
+                print(f"{entry.report} report written to {entry.output}")
+    return failures
+
+
+def _render_project(entry: BatchEntry, shared: SharedJira, report_date: str) -> None:
+    from ittools.domain.project import Project
+    from ittools.reports.report_project import ProjectReport
+
+    ProjectReport(Project(entry.project, shared.query_project_epics(entry.project))).run(report_date)
+
+
+def _render_resolved(entry: BatchEntry, options: ReportOptions, shared: SharedJira) -> None:
+    from ittools.reports.report_resolved import ResolvedReport
+
+    team_members = options.teams.get(entry.team, list()) if entry.team else []
+    if entry.team and not team_members:
+        raise ValueError(f"No members in team '{entry.team}'")
+    from_date, to_date = entry.resolved_range()
+    ResolvedReport(options, shared).run(entry.days, from_date, to_date, entry.label, entry.team, team_members)
+
+
+def _render_cfd(entry: BatchEntry, options: ReportOptions, shared: SharedJira, plot_lock: threading.Lock) -> None:
+    from ittools.cfd.flow_data import FlowData
+    from ittools.cli.cfd import data_frame_from_project, make_cfd_report, make_project_config
+    from ittools.domain.project import Project
+
+    project = Project(entry.project, shared.query_project_epics(entry.project))
+    # pyplot keeps the figure being drawn in global state, so graphs are drawn one at a time
+    with plot_lock:
+        project_config = make_project_config(options.verbose, options.report_dir, entry.project)
+        data_frame = data_frame_from_project(project, options.report_dir, options.verbose)
+        flow_data = FlowData(
+            data_frame, date.today(), entry.days or FlowData.DEFAULT_TREND_PERIOD, project_config.initial_slope
+        )
+        make_cfd_report(flow_data, project_config, f"{options.report_dir}/{entry.project}").run(options.verbose)
+
+
+class _ThreadStdout:
+    """Stands in for stdout, sending what each thread prints to the output it chose, or to stdout"""
+
+    def __init__(self, stdout: TextIO):
+        self._stdout = stdout
+        self._outputs = threading.local()
+
+    @contextlib.contextmanager
+    def writing_to(self, output: TextIO) -> Iterator[None]:
+        self._outputs.current = output
+        try:
+            yield
+        finally:
+            self._outputs.current = None
+
+    def _output(self) -> TextIO:
+        return getattr(self._outputs, "current", None) or self._stdout
+
+    def write(self, text: str) -> int:
+        return self._output().write(text)
+
+    def flush(self) -> None:
+        self._output().flush()
+
+
+def _local_midnight(jql_date: str) -> datetime:
+    return datetime.combine(date.fromisoformat(str(jql_date)), time.min).astimezone()
+
+
+def _optional_str(value: Any) -> str | None:
+    return str(value) if value else None
@@ -1,6 +1,7 @@
 #! /usr/bin/env python
+from __future__ import annotations
+
 import traceback
-from functools import reduce
 from pathlib import Path
 
 import click
@@ -8,16 +9,20 @@ import os
 import os.path
 import datetime
 import sys
-
-import pandas
-from pandas import DataFrame
+from typing import TYPE_CHECKING, Tuple
 
 from ittools.cfd.flow_data import FlowData
+from ittools.cfd.monte_carlo import DEFAULT_TRIALS
 from ittools.config import IssueTrackerConfig, ProjectConfig
-from ittools.cfd.cumulative_flow_graph import CumulativeFlowGraph
-from ittools.domain.epic import Epic
-from ittools.domain.project import Project
-from ittools.jira.jira_ext import JiraServer
+
+# pandas, matplotlib and jira are only imported when they are needed, so the dates
+# options and --help don't wait for them
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from ittools.cfd.cfd_animation import CfdAnimation
+    from ittools.cfd.cumulative_flow_graph import CumulativeFlowGraph
+    from ittools.domain.project import Project
 
 DEFAULT_CONFIG_FILE = "~/issuetracker.yml"
 
@@ -42,6 +47,26 @@ DEFAULT_CONFIG_FILE = "~/issuetracker.yml"
 @click.option("-x", "--excel", type=click.Path(), help="Excel file")
 @click.option("-f", "--show-first-date", is_flag=True, help="Show first date in report data")
 @click.option("-l", "--show-last-date", is_flag=True, help="Show last date in report data")
+@click.option(
+    "-m",
+    "--monte-carlo",
+    is_flag=True,
+    default=False,
+    help="Forecast completion dates by simulating daily throughput",
+)
+@click.option(
+    "--trials",
+    default=DEFAULT_TRIALS,
+    type=click.INT,
+    help=f"Number of futures simulated for the forecast (default: {DEFAULT_TRIALS})",
+)
+@click.option("-a", "--animate", is_flag=True, default=False, help="Create an animation with a frame for each day")
+@click.option(
+    "--animation-format",
+    type=click.Choice(["gif", "mp4"]),
+    default="gif",
+    help="File format of the animation (default: gif)",
+)
 @click.option("-c", "--config", type=click.Path(exists=True))
 @click.option("-o", "--open-graph", is_flag=True, default=False, help="Open the graph after generation")
 @click.option("-v", "--verbose", is_flag=True, help="Show extra information from report")
@@ -53,32 +78,48 @@ def cfd(
     excel: click.Path,
     show_first_date: bool,
     show_last_date: bool,
+    monte_carlo: bool,
+    trials: int,
+    animate: bool,
+    animation_format: str,
     config: click.Path,
     open_graph: bool,
     verbose: bool
 ) -> None:
     """Create a cumulative flow diagram for a given project
 
-    Requires a project progress file (progress.csv) in the project directory. This is normally generated
-    by the `it project` command
+    Requires the daily progress of the project epics (progress.sqlite) in the report directory. This is
+    normally generated by the `it project` command
+
+    With --animate, the diagram is drawn for each day of the progress data (up to the --today date), and
+    the frames are written to an animated GIF, or an MP4 video if ffmpeg is installed
     """
     if not (project_label or epic or excel):
         click.get_current_context().fail("one of project label or epic must be specified")
     if project_label and epic:
         click.get_current_context().fail("only one of project label or epic can be specified")
 
-    cfd_report = _make_cfd_report(config, days, epic, project_label, excel, today, verbose)
+    if animate:
+        animation = _make_cfd_animation(config, days, epic, project_label, excel, today, animation_format, verbose)
+        animation.run(verbose)
+        return
+
+    flow_data, project_config, output_dir = _make_flow_data(config, days, epic, project_label, excel, today, verbose)
     if show_first_date:
-        print(cfd_report.first_data_date())
+        print(flow_data.dates[0])
     elif show_last_date:
-        print(cfd_report.last_data_date())
+        print(flow_data.dates[-1])
     else:
+        cfd_report = make_cfd_report(flow_data, project_config, output_dir)
+        if monte_carlo:
+            from ittools.cfd.monte_carlo import forecast_completion
+            cfd_report.use_forecast(forecast_completion(flow_data, trials))
         cfd_report.run(verbose)
         if open_graph:
             os.system(f"xdg-open '{cfd_report.png_file}'")
 
 
-def _make_cfd_report(
+def _make_flow_data(
         config_path: click.Path,
         trend_period: int,
         epic_key: str,
@@ -86,75 +127,77 @@ def _make_cfd_report(
         excel_file: click.Path,
         today: click.DateTime,
         verbose: bool
-) -> CumulativeFlowGraph:
+) -> Tuple[FlowData, ProjectConfig, str]:
     report_date = _date_option_or_today(today)
+    data_frame, project_config, output_dir = _load_cfd_data(config_path, epic_key, project_label, excel_file, verbose)
     if excel_file:
-        return _make_excel_cfd(excel_file, report_date, verbose)
-
-    config = _make_it_config(verbose, config_path)
-    jira_server = JiraServer(verbose, config.jira_config)
-    if project_label:
-        return _make_project_cfd(project_label, trend_period, config.report_dir, jira_server, report_date, verbose)
-    else:
-        return _make_epic_cfd(epic_key, trend_period, config.report_dir, jira_server, report_date, verbose)
-
-
-def _make_excel_cfd(excel_file: click.Path, report_date: datetime.date, verbose: bool) -> CumulativeFlowGraph:
-    if verbose:
-        print(f"Reading progress from {excel_file}")
-    data_frame = pandas.read_excel(excel_file)
+        trend_period = FlowData.DEFAULT_TREND_PERIOD
     flow_data = FlowData(
         data_frame=data_frame,
         today=report_date,
-        trend_period=FlowData.DEFAULT_TREND_PERIOD,
-        initial_slope=FlowData.DEFAULT_SLOPE
+        trend_period=trend_period,
+        initial_slope=project_config.initial_slope
     )
-    project_config = ProjectConfig({"name": os.path.basename(str(excel_file))})
-    png_file = Path(str(excel_file)).parent / f"cfd-{str(report_date)}.png"
-    return CumulativeFlowGraph(flow_data, project_config, str(png_file), report_date)
+    return flow_data, project_config, output_dir
 
 
-def _make_project_cfd(
-        project_label: str,
+def make_cfd_report(flow_data: FlowData, project_config: ProjectConfig, output_dir: str) -> CumulativeFlowGraph:
+    from ittools.cfd.cumulative_flow_graph import CumulativeFlowGraph
+
+    png_file = f"{output_dir}/cfd-{str(flow_data.today)}.png"
+    return CumulativeFlowGraph(flow_data, project_config, png_file, flow_data.today)
+
+
+def _make_cfd_animation(
+        config_path: click.Path,
         trend_period: int,
-        report_dir: str,
-        jira_server: JiraServer,
-        report_date: datetime.date,
+        epic_key: str,
+        project_label: str,
+        excel_file: click.Path,
+        today: click.DateTime,
+        animation_format: str,
         verbose: bool
-) -> CumulativeFlowGraph:
-    project_config = _make_project_config(verbose, report_dir, project_label)
-    project = Project.load(jira_server, project_label)
-    data_frame = _data_frame_from_project(project, f"{report_dir}/epics", verbose)
-    flow_data = FlowData(
-        data_frame=data_frame,
-        today=report_date,
-        trend_period=trend_period,
-        initial_slope=project_config.initial_slope
+) -> CfdAnimation:
+    from ittools.cfd.cfd_animation import CfdAnimation
+
+    data_frame, project_config, output_dir = _load_cfd_data(config_path, epic_key, project_label, excel_file, verbose)
+    last_date = today.date() if today else None
+    return CfdAnimation(
+        data_frame, project_config, output_dir, animation_format, last_date, trend_period, project_config.initial_slope
     )
-    png_file = f"{report_dir}/{project_label}/cfd-{str(report_date)}.png"
-    return CumulativeFlowGraph(flow_data, project_config, png_file, report_date)
 
 
-def _make_epic_cfd(
+def _load_cfd_data(
+        config_path: click.Path,
         epic_key: str,
-        trend_period: int,
-        report_dir: str,
-        jira_server: JiraServer,
-        report_date: datetime.date,
+        project_label: str,
+        excel_file: click.Path,
         verbose: bool
-) -> CumulativeFlowGraph:
-    jira_epic = jira_server.jira_epic(epic_key)
-    project_config = _make_project_config(verbose, report_dir, f"{epic_key}: {jira_epic.summary}")
-    project = Project(epic_key, [jira_epic])
-    data_frame = _data_frame_from_project(project, f"{report_dir}/epics", verbose)
-    flow_data = FlowData(
-        data_frame=data_frame,
-        today=report_date,
-        trend_period=trend_period,
-        initial_slope=project_config.initial_slope
-    )
-    png_file = f"{report_dir}/epics/{epic_key}/cfd-{str(report_date)}.png"
-    return CumulativeFlowGraph(flow_data, project_config, png_file, report_date)
+) -> Tuple[DataFrame, ProjectConfig, str]:
+    """The progress data, the project config and the directory for the output files"""
+    if excel_file:
+        import pandas
+
+        if verbose:
+            print(f"Reading progress from {excel_file}")
+        project_config = ProjectConfig({"name": os.path.basename(str(excel_file))})
+        return pandas.read_excel(excel_file), project_config, str(Path(str(excel_file)).parent)
+
+    from ittools.domain.project import Project
+    from ittools.jira.jira_ext import JiraServer
+
+    config = _make_it_config(verbose, config_path)
+    jira_server = JiraServer(verbose, config.jira_config)
+    if project_label:
+        project_config = make_project_config(verbose, config.report_dir, project_label)
+        project = Project.load(jira_server, project_label)
+        output_dir = f"{config.report_dir}/{project_label}"
+    else:
+        jira_epic = jira_server.jira_epic(epic_key)
+        project_config = make_project_config(verbose, config.report_dir, f"{epic_key}: {jira_epic.summary}")
+        project = Project(epic_key, [jira_epic])
+        output_dir = f"{config.report_dir}/epics/{epic_key}"
+    return data_frame_from_project(project, config.report_dir, verbose), project_config, output_dir
 
 
 def _make_it_config(verbose: bool, config_file: click.Path) -> IssueTrackerConfig:
@@ -164,7 +207,7 @@ def _make_it_config(verbose: bool, config_file: click.Path) -> IssueTrackerConfi
     return IssueTrackerConfig.load(config_file)
 
 
-def _make_project_config(verbose: bool, report_dir: str, project_label: str) -> ProjectConfig:
+def make_project_config(verbose: bool, report_dir: str, project_label: str) -> ProjectConfig:
     config_file = f"{report_dir}/{project_label}/project.yml"
     if os.path.isfile(config_file):
         if verbose:
@@ -176,21 +219,18 @@ def _make_project_config(verbose: bool, report_dir: str, project_label: str) ->
         return ProjectConfig({"name": project_label, "key": project_label, })
 
 
-def _data_frame_from_project(project: Project, epics_dir: str, verbose: bool) -> DataFrame:
-    epic_datas = [_load_epic_data(epic, epics_dir, verbose) for epic in project.epics]
-    project_data = reduce(_combine_progress_data, epic_datas)
-    return project_data
-
+def data_frame_from_project(project: Project, report_dir: str, verbose: bool) -> DataFrame:
+    epic_keys = [epic.key for epic in project.epics]
+    from ittools.cfd.cfd_db import load_project_progress
+    from ittools.cfd.progress_store import ProgressStore
 
-def _load_epic_data(self, epic: Epic, epics_dir: str, verbose: bool) -> DataFrame:
-    csv_file = f"{epics_dir}/{epic.key}/progress.csv"
     if verbose:
-        print(f"Reading progress from {csv_file}")
-    return pandas.read_csv(csv_file, usecols=["date", "pending", "in_progress", "done", "total"], index_col="date")
-
-
-def _combine_progress_data(left: DataFrame, right: DataFrame) -> DataFrame:
-    return left.combine(right, lambda left_cell, right_cell: left_cell + right_cell, fill_value=0)
+        print(f"Reading progress of {', '.join(epic_keys)}")
+    store = ProgressStore.open(report_dir)
+    try:
+        return load_project_progress(store, report_dir, epic_keys)
+    finally:
+        store.close()
 
 
 def _date_option_or_today(option: click.DateTime) -> datetime.date:
@@ -0,0 +1,165 @@
+"""The `it serve` daemon, and the `it` entry point that forwards commands to it
+
+The entry point only uses the standard library, so forwarding a command costs little
+more than starting Python. When no daemon is listening, the command runs in-process.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from ittools.config import ReportOptions
+    from ittools.domain.business_calendar import CalendarSet
+    from ittools.jira.jira_ext import JiraServer
+
+SOCKET_ENV = "IT_SOCKET"
+NO_DAEMON_ENV = "IT_NO_DAEMON"
+# Warm Jira servers are replaced after this long, so cached epics don't go stale
+SERVER_MAX_AGE_SECONDS = 30 * 60
+LOCAL_COMMANDS = ["serve"]
+# Options of the `it` group that are followed by a value
+GROUP_VALUE_OPTIONS = ["-c", "--config"]
+
+
+def socket_path() -> str:
+    default_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.environ.get(SOCKET_ENV) or os.path.join(default_dir, f"ittools-{os.getuid()}.sock")
+
+
+def main() -> None:
+    """Run an `it` command, in the daemon if one is listening, otherwise in this process"""
+    args = sys.argv[1:]
+    exit_code = None
+    if not os.environ.get(NO_DAEMON_ENV) and command_name(args) not in LOCAL_COMMANDS:
+        exit_code = forward(args)
+    if exit_code is None:
+        from ittools.cli.it import run_command
+        exit_code = run_command(args)
+    sys.exit(exit_code)
+
+
+def command_name(args: List[str]) -> str | None:
+    """The name of the command: the first argument that is neither an `it` option nor its value"""
+    remaining_args = iter(args)
+    for arg in remaining_args:
+        if arg in GROUP_VALUE_OPTIONS:
+            next(remaining_args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward(args: List[str]) -> int | None:
+    """Send the command to the daemon and print its output, or return None if no daemon is listening
+
+    Only a socket owned by the current user is trusted. Once the command has been
+    sent it may have run, so a failure to read its result is reported rather than
+    running the command again.
+    """
+    path = socket_path()
+    try:
+        if os.stat(path).st_uid != os.getuid():
+            sys.stderr.write(f"Ignoring the it daemon socket {path}, as it is owned by another user\n")
+            return None
+    except FileNotFoundError:
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+        except (ConnectionError, FileNotFoundError):
+            return None
+        try:
+            connection.sendall(json.dumps({"args": args, "cwd": os.getcwd()}).encode() + b"\n")
+            with connection.makefile("r", encoding="utf-8") as responses:
+                response = json.loads(responses.readline())
+        except (ConnectionError, json.JSONDecodeError) as error:
+            sys.stderr.write(f"The it daemon on {path} did not return the result of the command: {error!r}\n")
+            return 1
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+class WarmSession:
+    """The report options, calendars and Jira servers kept by the daemon between commands
+
+    Options are loaded again when their config file changes, and Jira servers are
+    replaced once they are older than SERVER_MAX_AGE_SECONDS.
+    """
+
+    def __init__(self):
+        self._options: Dict[Tuple[str, bool], Tuple[float, ReportOptions, CalendarSet]] = {}
+        self._servers: Dict[int, Tuple[float, JiraServer]] = {}
+
+    def report_options(self, verbose: bool, config_file: str) -> ReportOptions:
+        from ittools.cli.it import load_report_options
+        from ittools.domain.business_calendar import CalendarSet, use_calendars
+
+        key = (os.path.abspath(config_file), verbose)
+        modified_time = os.path.getmtime(config_file)
+        if key not in self._options or self._options[key][0] != modified_time:
+            if key in self._options:
+                self._servers.pop(id(self._options[key][1]), None)
+            options = load_report_options(verbose, config_file)
+            self._options[key] = (modified_time, options, CalendarSet.from_config(options.calendar, options.teams))
+        _, options, calendars = self._options[key]
+        use_calendars(calendars)
+        return options
+
+    def jira_server(self, options: ReportOptions) -> JiraServer:
+        from ittools.jira.jira_ext import JiraServer
+
+        warm_server = self._servers.get(id(options))
+        if warm_server is None or time.monotonic() - warm_server[0] > SERVER_MAX_AGE_SECONDS:
+            warm_server = (time.monotonic(), JiraServer(options.verbose, options.jira_config))
+            self._servers[id(options)] = warm_server
+        return warm_server[1]
+
+    def finish_command(self) -> None:
+        """Clear the per-command state of the servers, including the issues they loaded"""
+        for _, server in self._servers.values():
+            server.use_as_of(None)
+            server.forget_issues()
+
+
+def serve(path: str) -> None:
+    """Run commands sent to the socket one at a time, until interrupted"""
+    import contextlib
+    import io
+    import socketserver
+
+    from ittools.cli import it
+
+    session = WarmSession()
+
+    class CommandHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            request = json.loads(self.rfile.readline())
+            stdout, stderr = io.StringIO(), io.StringIO()
+            os.chdir(request["cwd"])
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    exit_code = it.run_command(request["args"])
+                finally:
+                    session.finish_command()
+            response = {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    if os.path.exists(path):
+        os.remove(path)
+    it.use_warm_session(session)
+    with socketserver.UnixStreamServer(path, CommandHandler) as server:
+        os.chmod(path, 0o600)
+        print(f"Serving it commands on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(path)
@@ -1,26 +1,47 @@
 #! /usr/bin/env python
+from __future__ import annotations
+
 import os
 import sys
 import webbrowser
-from datetime import date
-from typing import Any, List
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any, List
 
 import click
-from jira.exceptions import JIRAError
 
-from ittools.cfd.cfd_db import store_project_counts
 from ittools.config import IssueTrackerConfig, ReportOptions
-from ittools.domain.project import Project
-from ittools.jira.jira_ext import JiraServer, JiraEpic
-from ittools.reports.report_epics import EpicReport
-from ittools.reports.report_issue_detail import IssueDetailReport
-from ittools.reports.report_project import ProjectReport
-from ittools.reports.report_release_notes import ReleaseNotesReport
-from ittools.reports.report_resolved import ResolvedReport
-from ittools.reports.report_in_progress import InProgressReport
+
+# The reports, and the jira, NumPy and pandas libraries they use, are only imported by
+# the commands that need them, so `it --help` and quick commands start fast
+if TYPE_CHECKING:
+    from ittools.cli.daemon import WarmSession
+    from ittools.jira.jira_ext import JiraEpic, JiraServer
 
 DEFAULT_CONFIG_FILE = "~/issuetracker.yml"
 
+this = sys.modules[__name__]
+# Set by `it serve`, to keep the config and Jira servers between commands
+this.warm_session = None
+
+
+def use_warm_session(session: WarmSession) -> None:
+    this.warm_session = session
+
+
+def run_command(args: List[str]) -> int:
+    """Run an it command line, returning the exit code"""
+    try:
+        issue_tracker.main(args, prog_name="it")
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            sys.stderr.write(f"{e.code}\n")
+            return 1
+        return e.code or 0
+    except Exception as e:
+        sys.stderr.write(f"Command failed: {getattr(e, 'message', repr(e))}\n")
+        return 1
+    return 0
+
 
 def show_version(ctx: click.Context, _: Any, value: Any) -> None:
     if not value or ctx.resilient_parsing:
@@ -54,10 +75,25 @@ def issue_tracker(ctx: click.Context, verbose: bool, config: click.Path,) -> Non
 
 def build_report_options(verbose: bool, config_file: click.Path) -> ReportOptions:
     config_file = config_file or os.path.expanduser(DEFAULT_CONFIG_FILE)
+    if this.warm_session:
+        return this.warm_session.report_options(verbose, config_file)
+    options = load_report_options(verbose, config_file)
+    from ittools.domain.business_calendar import CalendarSet, use_calendars
+    use_calendars(CalendarSet.from_config(options.calendar, options.teams))
+    return options
+
+
+def load_report_options(verbose: bool, config_file: str) -> ReportOptions:
     if verbose:
         print(f"Using config file '{config_file}'")
-    config = IssueTrackerConfig.load(config_file)
-    return ReportOptions(config, verbose)
+    return ReportOptions(IssueTrackerConfig.load(config_file), verbose)
+
+
+def jira_server(options: ReportOptions) -> JiraServer:
+    if this.warm_session:
+        return this.warm_session.jira_server(options)
+    from ittools.jira.jira_ext import JiraServer
+    return JiraServer(options.verbose, options.jira_config)
 
 
 def load_epics(server: JiraServer, project_label: str, epic_keys: List[str]) -> List[JiraEpic]:
@@ -67,14 +103,35 @@ def load_epics(server: JiraServer, project_label: str, epic_keys: List[str]) ->
         return [server.jira_epic(key) for key in epic_keys]
 
 
+def use_as_of(ctx: click.Context, server: JiraServer, as_of: datetime | None) -> None:
+    """Report as at the end of the given day, from the issue store"""
+    if as_of:
+        try:
+            server.use_as_of(datetime.combine(as_of.date(), time.max).astimezone())
+        except ValueError as e:
+            ctx.fail(str(e))
+
+
+as_of_option = click.option(
+    "--as-of",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Report as at the end of a past day, from the issue store",
+)
+
+
 @issue_tracker.command()
 @click.option("-p", "--project", "project_label", default=None)
+@as_of_option
 @click.argument("epic_keys", nargs=-1)
 @click.pass_context
-def epic_summary(ctx: click.Context, project_label: str, epic_keys: List[str]) -> None:
+def epic_summary(ctx: click.Context, project_label: str, as_of: datetime | None, epic_keys: List[str]) -> None:
     """Report on stories within epics."""
+    from ittools.reports.report_epics import EpicReport
+
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
+    server = jira_server(options)
+    use_as_of(ctx, server, as_of)
     epics = load_epics(server, project_label, epic_keys)
     if not epics:
         ctx.fail("Either project or epic key(s) must be specified")
@@ -84,17 +141,23 @@ def epic_summary(ctx: click.Context, project_label: str, epic_keys: List[str]) -
 @issue_tracker.command()
 @click.option("-e", "--epic", is_flag=True, default=False, help="Group issues by epic")
 @click.option("-t", "--team", is_flag=True, default=False, help="Group issues by team")
+@as_of_option
 @click.pass_context
-def in_progress(ctx: click.Context, epic: bool, team: bool) -> None:
+def in_progress(ctx: click.Context, epic: bool, team: bool, as_of: datetime | None) -> None:
     """Report on issues currently in progress."""
+    from ittools.reports.report_in_progress import InProgressReport
+
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
+    server = jira_server(options)
+    use_as_of(ctx, server, as_of)
     InProgressReport(options, server).run(epic, team)
 
 
 def add_fix_version(
     server: JiraServer, issue_keys: List[str], new_fix_version: str
 ) -> None:
+    from jira.exceptions import JIRAError
+
     for key in issue_keys:
         try:
             jira_issue = server.jira_issue(key)
@@ -135,27 +198,101 @@ def issue(
         sys.exit("issue key required")
 
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
-
     if open_issue:
         webbrowser.open(f"{options.jira_config.url}/browse/{issue_keys[0]}")
     elif update_fix_version:
-        add_fix_version(server, issue_keys, update_fix_version)
+        add_fix_version(jira_server(options), issue_keys, update_fix_version)
     else:
-        IssueDetailReport(options.jira_config, server, options.verbose, summary).run(issue_keys)
+        from ittools.reports.report_issue_detail import IssueDetailReport
+        IssueDetailReport(options.jira_config, jira_server(options), options.verbose, summary).run(issue_keys)
 
 
 @issue_tracker.command()
+@as_of_option
 @click.argument("project_label")
 @click.pass_context
-def project(ctx: click.Context, project_label: str) -> None:
+def project(ctx: click.Context, as_of: datetime | None, project_label: str) -> None:
     """Report on progress for a project."""
+    from ittools.cfd.cfd_db import store_project_counts
+    from ittools.domain.project import Project
+    from ittools.reports.report_project import ProjectReport
+
     options: ReportOptions = ctx.obj
-    report_date = str(date.today())
-    jira_server = JiraServer(options.verbose, options.jira_config)
-    project_data = Project.load(jira_server, project_label)
+    report_date = str(as_of.date() if as_of else date.today())
+    server = jira_server(options)
+    use_as_of(ctx, server, as_of)
+    project_data = Project.load(server, project_label)
     ProjectReport(project_data).run(report_date)
-    store_project_counts(report_date, project_data, options)
+    if not as_of:
+        store_project_counts(report_date, project_data, options)
+
+
+@issue_tracker.command()
+@click.option("-p", "--project", "project_label", default=None)
+@click.argument("epic_keys", nargs=-1)
+@click.pass_context
+def export_progress(ctx: click.Context, project_label: str, epic_keys: List[str]) -> None:
+    """Export the daily progress of epics to progress.csv files."""
+    from ittools.cfd.cfd_db import export_epic_csv
+    from ittools.cfd.progress_store import ProgressStore
+
+    options: ReportOptions = ctx.obj
+    if project_label:
+        server = jira_server(options)
+        epic_keys = [epic.key for epic in server.query_project_epics(project_label)]
+    if not epic_keys:
+        ctx.fail("Either project or epic key(s) must be specified")
+    store = ProgressStore.open(options.report_dir)
+    try:
+        for epic_key in epic_keys:
+            csv_path = export_epic_csv(store, options.report_dir, epic_key)
+            print(f"Exported {epic_key} to {csv_path}")
+    finally:
+        store.close()
+
+
+@issue_tracker.command()
+@click.option("-p", "--project", "project_label", default=None)
+@click.option(
+    "-f", "--from", "from_date", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day to rebuild (default: first issue)"
+)
+@click.option("-t", "--to", "to_date", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day to rebuild (default: today)")
+@click.option("--replace", is_flag=True, default=False, help="Replace the counts of days that already have progress")
+@click.argument("epic_keys", nargs=-1)
+@click.pass_context
+def backfill(
+    ctx: click.Context, project_label: str, from_date: click.DateTime, to_date: click.DateTime, replace: bool,
+    epic_keys: List[str]
+) -> None:
+    """Rebuild the daily progress of epics from the status history of their issues."""
+    from ittools.cfd.cfd_db import backfill_epic_counts
+    from ittools.cfd.progress_history import StatusCategories
+    from ittools.cfd.progress_store import ProgressStore
+    from ittools.jira.field_profile import STATUS_HISTORY_FIELDS
+    from ittools.jira.jira_ext import DONE_STATES, EXCLUDE_STATES, IN_PROGRESS_STATES
+
+    options: ReportOptions = ctx.obj
+    server = jira_server(options)
+    if project_label:
+        epic_keys = [epic.key for epic in server.query_project_epics(project_label)]
+    if not epic_keys:
+        ctx.fail("Either project or epic key(s) must be specified")
+    issues = server.query_issues_in_epics(list(epic_keys), STATUS_HISTORY_FIELDS)
+    store = ProgressStore.open(options.report_dir)
+    try:
+        count = backfill_epic_counts(
+            store,
+            options.report_dir,
+            list(epic_keys),
+            [(issue.epic_key, issue.transitions) for issue in issues],
+            StatusCategories(IN_PROGRESS_STATES, DONE_STATES, EXCLUDE_STATES),
+            to_date.date() if to_date else date.today(),
+            from_date.date() if from_date else None,
+            replace,
+        )
+    finally:
+        store.close()
+    print(f"Stored {count} daily epic counts from the history of {len(issues)} issues")
 
 
 @issue_tracker.command()
@@ -181,11 +318,13 @@ def release(
     issue_keys: List[str],
 ) -> None:
     """Describes a list of tickets as release notes"""
+    from ittools.reports.report_release_notes import ReleaseNotesReport
+
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
+    server = jira_server(options)
 
     if fix_version:
-        issue_keys = [fix_issue.key for fix_issue in server.query_fix_version(fix_version)]
+        issue_keys = [fix_issue.key for fix_issue in server.query_fix_version(fix_version, ReleaseNotesReport.FIELDS)]
 
     if not issue_keys:
         sys.exit("issue keys required for release report")
@@ -232,8 +371,10 @@ def resolved(
     ctx: click.Context, days: int, from_date: click.DateTime, to_date: click.DateTime, label: str, team: str
 ) -> None:
     """Report on recently closed issues."""
+    from ittools.reports.report_resolved import ResolvedReport
+
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
+    server = jira_server(options)
 
     if from_date:
         from_date = from_date.date()
@@ -250,22 +391,57 @@ def resolved(
     ResolvedReport(options, server).run(days, from_date, to_date, label, team, team_members)
 
 
+@issue_tracker.command()
+@click.option("-w", "--workers", default=4, type=click.INT, help="Number of reports rendered at once (default: 4)")
+@click.argument("plan_file", type=click.Path(exists=True))
+@click.pass_context
+def batch(ctx: click.Context, workers: int, plan_file: str) -> None:
+    """Run the reports of a plan file, fetching the issues they share once."""
+    from ittools.cli.batch import BatchPlan, run_batch
+
+    options: ReportOptions = ctx.obj
+    try:
+        plan = BatchPlan.load(plan_file)
+    except ValueError as e:
+        ctx.fail(str(e))
+    failures = run_batch(plan, options, jira_server(options), workers)
+    if failures:
+        sys.exit(f"{failures} of {len(plan.reports)} reports failed")
+
+
+@issue_tracker.command()
+@click.option("--full", is_flag=True, default=False, help="Discard the issue store and fetch every issue again")
+@click.pass_context
+def sync(ctx: click.Context, full: bool) -> None:
+    """Synchronise the local issue store with Jira."""
+    options: ReportOptions = ctx.obj
+    server = jira_server(options)
+    if not server.has_issue_store:
+        ctx.fail("the issue store is not enabled in the config file")
+    count = server.sync_issue_store(full)
+    print(f"Synchronised {count} issues")
+
+
 @issue_tracker.command()
 @click.argument("label")
 @click.pass_context
 def jql_label(ctx: click.Context, label: str) -> None:
     """Generate jql to search issues for epics with a given label"""
     options: ReportOptions = ctx.obj
-    server = JiraServer(options.verbose, options.jira_config)
+    server = jira_server(options)
     jql = f"project = DS AND type = Epic AND 'Epic Status' != Done AND labels = {label} order by key"
     keys = [jira_issue.key for jira_issue in server.query_jql_issues(jql)]
     print(f"'Epic Link' in ({', '.join(keys)})")
 
 
+@issue_tracker.command()
+@click.option("-s", "--socket", "socket_file", default=None, help="Socket to listen on (default: $IT_SOCKET)")
+def serve(socket_file: str) -> None:
+    """Keep Jira connections warm, and run the it commands sent to them."""
+    from ittools.cli import daemon
+
+    daemon.serve(socket_file or daemon.socket_path())
+
+
 if __name__ == "__main__":
-    try:
-        issue_tracker()
-        sys.exit(0)
-    except Exception as e:
-        sys.stderr.write(f"Command failed: {getattr(e, 'message', repr(e))}")
-        sys.exit(1)
+    sys.exit(run_command(sys.argv[1:]))
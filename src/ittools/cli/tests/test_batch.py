@@ -0,0 +1,79 @@
+from datetime import datetime, time
+from unittest.mock import Mock
+
+import pytest
+
+from ittools.cli.batch import BatchPlan, SharedJira, merge_date_ranges, run_batch
+from ittools.domain.issue_counts import IssueCounts
+from ittools.jira.field_profile import ALL_FIELDS
+
+
+def test_merge_date_ranges_joins_overlapping_ranges():
+    date_ranges = [("2024-03-01", "2024-03-15"), ("2024-01-01", "2024-02-01"), ("2024-03-10", "2024-04-01")]
+
+    assert merge_date_ranges(date_ranges) == [("2024-01-01", "2024-02-01"), ("2024-03-01", "2024-04-01")]
+
+
+def test_merge_date_ranges_joins_ranges_that_meet():
+    assert merge_date_ranges([("2024-01-01", "2024-01-08"), ("2024-01-08", "2024-01-15")]) == [
+        ("2024-01-01", "2024-01-15")
+    ]
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"report": "nonsense", "output": "out.txt"}, "Unknown report"),
+    ({"report": "in-progress"}, "no output file"),
+    ({"report": "project", "output": "out.txt"}, "no project"),
+])
+def test_plan_rejects_invalid_entries(entry, message):
+    with pytest.raises(ValueError, match=message):
+        BatchPlan({"reports": [entry]})
+
+
+def test_overlapping_resolved_reports_share_one_query():
+    jira = Mock()
+    jira.query_resolved_issues.return_value = [resolved_issue("A-1", "2024-01-03"), resolved_issue("A-2", "2024-01-12")]
+    jira.jira_epics.return_value = {}
+    plan = BatchPlan({"reports": [
+        {"report": "resolved", "from": "2024-01-01", "to": "2024-01-10", "output": "early.txt"},
+        {"report": "resolved", "from": "2024-01-05", "to": "2024-01-15", "output": "late.txt"},
+    ]})
+
+    shared = SharedJira(jira)
+    shared.fetch(plan, {"resolved": ALL_FIELDS})
+
+    jira.query_resolved_issues.assert_called_once_with("2024-01-01", "2024-01-15", ALL_FIELDS)
+    assert [issue.key for issue in shared.query_resolved_issues("2024-01-01", "2024-01-10", ALL_FIELDS)] == ["A-1"]
+    assert [issue.key for issue in shared.query_resolved_issues("2024-01-05", "2024-01-15", ALL_FIELDS)] == ["A-2"]
+
+
+def test_run_batch_writes_each_report_to_its_own_file(tmp_path, capsys):
+    jira = Mock(as_of=None, epic_estimates=None)
+    jira.query_project_epics.side_effect = lambda label: [epic(f"{label}-1")]
+    jira.query_epic_child_statuses.return_value = {"ALPHA-1": ["Done"], "BETA-1": ["In Progress"]}
+    jira.comments.return_value = []
+    plan = BatchPlan({"reports": [
+        {"report": "project", "project": "ALPHA", "output": "alpha.txt"},
+        {"report": "project", "project": "BETA", "output": "beta.txt"},
+        {"report": "project", "project": "ALPHA", "output": "alpha-copy.txt"},
+    ]}, str(tmp_path))
+
+    failures = run_batch(plan, Mock(report_dir=str(tmp_path / "reports"), verbose=False), jira)
+
+    assert failures == 0
+    assert jira.query_project_epics.call_count == 2
+    jira.query_epic_child_statuses.assert_called_once()
+    assert "Project: ALPHA" in (tmp_path / "alpha.txt").read_text()
+    assert "Project: ALPHA" in (tmp_path / "alpha-copy.txt").read_text()
+    assert "Project: BETA" in (tmp_path / "beta.txt").read_text()
+    assert "ALPHA" not in (tmp_path / "beta.txt").read_text()
+    assert "project report written to" in capsys.readouterr().out
+
+
+def resolved_issue(key: str, resolved_date: str) -> Mock:
+    resolution_time = datetime.combine(datetime.fromisoformat(resolved_date).date(), time(12)).astimezone()
+    return Mock(key=key, epic_key=None, resolution_time=Mock(return_value=resolution_time))
+
+
+def epic(key: str) -> Mock:
+    return Mock(key=key, summary=f"Epic {key}", issue_counts=IssueCounts(1, 2, 3))
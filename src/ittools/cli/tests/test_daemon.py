@@ -0,0 +1,93 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from ittools.cli import daemon, it
+
+
+@pytest.fixture
+def socket_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "it.sock")
+    monkeypatch.setenv(daemon.SOCKET_ENV, path)
+    monkeypatch.setattr(it, "warm_session", None)
+    return path
+
+
+def test_command_name_skips_options():
+    assert daemon.command_name(["-v", "-c", "serve", "serve"]) == "serve"
+    assert daemon.command_name(["--config=it.yml", "release", "serve"]) == "release"
+    assert daemon.command_name(["-v"]) is None
+
+
+def test_arguments_named_like_local_commands_are_forwarded(monkeypatch):
+    forwarded = []
+    monkeypatch.delenv(daemon.NO_DAEMON_ENV, raising=False)
+    monkeypatch.setattr(daemon.sys, "argv", ["it", "project", "-p", "serve"])
+    monkeypatch.setattr(daemon, "forward", lambda args: forwarded.append(args) or 0)
+
+    with pytest.raises(SystemExit):
+        daemon.main()
+
+    assert forwarded == [["project", "-p", "serve"]]
+
+
+def test_forward_without_daemon(socket_file):
+    assert daemon.forward(["--help"]) is None
+
+
+def test_forward_without_listener_on_socket(socket_file):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(socket_file)
+
+        assert daemon.forward(["--help"]) is None
+
+
+def test_forward_ignores_socket_of_another_user(socket_file, monkeypatch, capsys):
+    start_daemon(socket_file)
+    monkeypatch.setattr(daemon.os, "getuid", lambda: os.stat(socket_file).st_uid + 1)
+
+    assert daemon.forward(["--help"]) is None
+    assert "owned by another user" in capsys.readouterr().err
+
+
+def test_forward_reports_daemon_failing_after_command_is_sent(socket_file, capsys):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_file)
+        listener.listen()
+        threading.Thread(target=lambda: close_after_request(listener), daemon=True).start()
+
+        assert daemon.forward(["--help"]) == 1
+        assert "did not return the result" in capsys.readouterr().err
+
+
+def test_forward_runs_commands_in_daemon(socket_file, capsys):
+    start_daemon(socket_file)
+
+    assert daemon.forward(["--help"]) == 0
+    assert "Issue tracker reports and information" in capsys.readouterr().out
+
+    assert daemon.forward(["no-such-command"]) == 2
+    assert "No such command" in capsys.readouterr().err
+
+
+def test_run_command_reports_failures(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(it, "DEFAULT_CONFIG_FILE", str(tmp_path / "missing.yml"))
+
+    assert it.run_command(["issue", "-o"]) == 1
+    assert "Command failed" in capsys.readouterr().err
+
+
+def close_after_request(listener: socket.socket) -> None:
+    connection, _ = listener.accept()
+    with connection, connection.makefile("r") as requests:
+        requests.readline()
+
+
+def start_daemon(path: str) -> None:
+    threading.Thread(target=daemon.serve, args=(path,), daemon=True).start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Cold start of `it --help`, measured as the best of a few runs to allow for a busy machine
+STARTUP_BUDGET_SECONDS = 0.5
+STARTUP_RUNS = 3
+HEAVY_MODULES = ["jira", "jsonpickle", "numpy", "pandas", "matplotlib"]
+
+
+def test_it_help_starts_within_budget():
+    fastest = min(startup_time([sys.executable, "-m", "ittools.cli.it", "--help"]) for _ in range(STARTUP_RUNS))
+
+    assert fastest < STARTUP_BUDGET_SECONDS, f"it --help took {fastest:.2f}s"
+
+
+@pytest.mark.parametrize("module, allowed", [("ittools.cli.it", []), ("ittools.cli.cfd", ["numpy"])])
+def test_cli_does_not_import_heavy_modules(module, allowed):
+    check = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    imported = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True).stdout.split()
+
+    assert [name for name in HEAVY_MODULES if name in imported and name not in allowed] == []
+
+
+def startup_time(command) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, capture_output=True, check=True)
+    return time.perf_counter() - start
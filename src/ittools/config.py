@@ -22,6 +22,8 @@ DEFAULT_ISSUE_TYPES: list[dict[str, str]] = [
     {"display": "🐞", "name": "Bug"},
     {"display": "🔧", "name": "Task"},
 ]
+DEFAULT_WORKING_HOURS: list[float] = [9, 17]
+DEFAULT_WORKING_DAYS: list[str] = ["Mon", "Tue", "Wed", "Thu", "Fri"]
 
 
 class IssueTrackerConfig:
@@ -30,8 +32,9 @@ class IssueTrackerConfig:
         self.report_dir = os.path.expanduser(
             config.get("report_dir", REPORT_DIR_DEFAULT)
         )
-        self.jira_config = JiraConfig(config["jira"])
+        self.jira_config = JiraConfig(config["jira"], self.report_dir)
         self.teams = config.get("teams", {})
+        self.calendar = CalendarConfig(config.get("calendar", {}))
 
     @classmethod
     def load(cls, config_file: str) -> IssueTrackerConfig:
@@ -41,8 +44,11 @@ class IssueTrackerConfig:
 
 
 class JiraConfig:
-    def __init__(self, jira_config: Dict[str, Any]) -> None:
+    def __init__(self, jira_config: Dict[str, Any], report_dir: str = REPORT_DIR_DEFAULT) -> None:
         self.url: str = jira_config["url"]
+        self.cache_dir: str = os.path.join(os.path.expanduser(report_dir), "cache")
+        self.issue_store = IssueStoreConfig(jira_config.get("issue_store", {}))
+        self.server_cache_hours: float = jira_config.get("server_cache_hours", 24)
         self.statuses: list[dict[str, str]] = jira_config.get(
             "statuses", DEFAULT_STATUSES
         )
@@ -57,6 +63,26 @@ class JiraConfig:
         self.project_keys = [str(key) for key in project_keys]
 
 
+class IssueStoreConfig:
+    def __init__(self, issue_store_config: Dict[str, Any]) -> None:
+        self.enabled: bool = issue_store_config.get("enabled", False)
+        self.max_age_minutes: int = issue_store_config.get("max_age_minutes", 5)
+
+
+class CalendarConfig:
+    def __init__(self, calendar_config: Dict[str, Any], defaults: Dict[str, Any] | None = None) -> None:
+        settings = {**(defaults or {}), **calendar_config}
+        self.timezone: str | None = settings.get("timezone")
+        self.working_hours: List[float] = settings.get("working_hours", DEFAULT_WORKING_HOURS)
+        self.working_days: List[str] = settings.get("working_days", DEFAULT_WORKING_DAYS)
+        self.holidays: List[str] = [str(holiday) for holiday in settings.get("holidays", [])]
+        team_defaults = {key: value for key, value in settings.items() if key != "teams"}
+        self.teams: Dict[str, CalendarConfig] = {
+            team: CalendarConfig(team_config or {}, team_defaults)
+            for team, team_config in calendar_config.get("teams", {}).items()
+        }
+
+
 class ProjectConfig:
     def __init__(self, project_config: dict[str, Any]) -> None:
         self.name: str = project_config.get("name", "Unnamed Project")
@@ -80,4 +106,5 @@ class ReportOptions(object):
         self.jira_config = issue_tracker_config.jira_config
         self.report_dir = issue_tracker_config.report_dir
         self.teams = issue_tracker_config.teams
+        self.calendar = issue_tracker_config.calendar
         self.verbose: bool = verbose
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pytz
+
+from ittools.config import DEFAULT_WORKING_DAYS, DEFAULT_WORKING_HOURS, CalendarConfig
+
+INDEX_PADDING = timedelta(days=366)
+
+
+class BusinessCalendar:
+    """Working hours, working days and holidays, used to measure working time between timestamps
+
+    The calendar keeps a cumulative count of working minutes at the start of each day,
+    so the working time of any interval is two lookups and a subtraction. The index
+    covers the dates that have been asked about, with a year of padding either side,
+    and is rebuilt to cover a wider range when needed.
+
+    Without a timezone, each timestamp is measured in its own UTC offset (which is how
+    Jira reports times in the user's timezone).
+    """
+
+    def __init__(
+        self,
+        working_hours: Sequence[float] = tuple(DEFAULT_WORKING_HOURS),
+        working_days: Iterable[str] = tuple(DEFAULT_WORKING_DAYS),
+        holidays: Iterable[date | str] = (),
+        timezone: str | None = None,
+    ):
+        self.start_minute = int(working_hours[0] * 60)
+        self.end_minute = int(working_hours[1] * 60)
+        if self.end_minute <= self.start_minute:
+            raise ValueError(f"Working hours must end after they start: {working_hours}")
+        self.day_minutes = self.end_minute - self.start_minute
+        self.weekmask = " ".join(working_days)
+        self.holidays = np.array([str(holiday) for holiday in holidays], dtype="datetime64[D]")
+        self.timezone = pytz.timezone(timezone) if timezone else None
+        self._index: _WorkingMinutesIndex | None = None
+
+    @classmethod
+    def from_config(cls, calendar_config: CalendarConfig) -> BusinessCalendar:
+        return cls(
+            calendar_config.working_hours,
+            calendar_config.working_days,
+            calendar_config.holidays,
+            calendar_config.timezone,
+        )
+
+    def business_days(self, start_time: datetime, end_time: datetime) -> float | None:
+        if not (start_time and end_time):
+            return None
+        start_day, start_minute = self._local_day_and_minute(start_time)
+        end_day, end_minute = self._local_day_and_minute(end_time)
+        index = self._index_covering(min(start_day, end_day), max(start_day, end_day))
+        working_minutes = index.working_minutes(end_day, end_minute) - index.working_minutes(start_day, start_minute)
+        return np.float64(working_minutes / self.day_minutes)
+
+    def business_days_between(self, start_times: Sequence[datetime], end_times: Sequence[datetime]) -> np.ndarray:
+        """The business days between each pair of start and end times, calculated for all pairs at once"""
+        if len(start_times) != len(end_times):
+            raise ValueError("There must be an end time for each start time")
+        if not start_times:
+            return np.zeros(0)
+        start_days, start_minutes = self._local_days_and_minutes(start_times)
+        end_days, end_minutes = self._local_days_and_minutes(end_times)
+        index = self._index_covering(min(start_days.min(), end_days.min()), max(start_days.max(), end_days.max()))
+        working_minutes = index.working_minutes(end_days, end_minutes) - index.working_minutes(start_days, start_minutes)
+        return working_minutes / self.day_minutes
+
+    def _local_day_and_minute(self, timestamp: datetime) -> tuple[np.datetime64, int]:
+        if self.timezone:
+            timestamp = timestamp.astimezone(self.timezone)
+        return np.datetime64(timestamp.date(), "D"), timestamp.hour * 60 + timestamp.minute
+
+    def _local_days_and_minutes(self, timestamps: Sequence[datetime]) -> tuple[np.ndarray, np.ndarray]:
+        days_and_minutes = [self._local_day_and_minute(timestamp) for timestamp in timestamps]
+        days = np.array([day for day, _ in days_and_minutes], dtype="datetime64[D]")
+        minutes = np.array([minute for _, minute in days_and_minutes], dtype=np.int64)
+        return days, minutes
+
+    def _index_covering(self, first_day: np.datetime64, last_day: np.datetime64) -> _WorkingMinutesIndex:
+        index = self._index
+        if index and index.first_day <= first_day and last_day <= index.last_day:
+            return index
+        if index:
+            first_day = min(first_day, index.first_day)
+            last_day = max(last_day, index.last_day)
+        padding = np.timedelta64(INDEX_PADDING.days, "D")
+        # Replaced as a whole, so other threads keep using a complete index
+        self._index = _WorkingMinutesIndex(self, first_day - padding, last_day + padding)
+        return self._index
+
+
+class _WorkingMinutesIndex:
+    """The cumulative working minutes at the start of each day in a range of days"""
+
+    __slots__ = ("first_day", "last_day", "start_minute", "day_minutes", "working_day", "minutes_before_day")
+
+    def __init__(self, calendar: BusinessCalendar, first_day: np.datetime64, last_day: np.datetime64):
+        self.first_day = first_day
+        self.last_day = last_day
+        self.start_minute = calendar.start_minute
+        self.day_minutes = calendar.day_minutes
+        days = np.arange(first_day, last_day + 1, dtype="datetime64[D]")
+        self.working_day = np.is_busday(days, weekmask=calendar.weekmask, holidays=calendar.holidays)
+        self.minutes_before_day = np.concatenate(([0], np.cumsum(self.working_day * self.day_minutes)))
+
+    def working_minutes(self, days, minutes):
+        """Working minutes from the start of the index to the given times, for single values or arrays"""
+        offsets = (days - self.first_day).astype(np.int64)
+        minutes_in_day = np.clip(minutes - self.start_minute, 0, self.day_minutes) * self.working_day[offsets]
+        return self.minutes_before_day[offsets] + minutes_in_day
+
+
+class CalendarSet:
+    """The default business calendar, and the calendars of people in teams with their own working days"""
+
+    def __init__(self, default: BusinessCalendar, person_calendars: Dict[str, BusinessCalendar] | None = None):
+        self.default = default
+        self.person_calendars = person_calendars or {}
+
+    @classmethod
+    def from_config(cls, calendar_config: CalendarConfig, teams: Dict[str, List[str]]) -> CalendarSet:
+        person_calendars = {}
+        for team, team_config in calendar_config.teams.items():
+            team_calendar = BusinessCalendar.from_config(team_config)
+            for person in teams.get(team, []):
+                person_calendars[person] = team_calendar
+        return cls(BusinessCalendar.from_config(calendar_config), person_calendars)
+
+    def for_person(self, person: str) -> BusinessCalendar:
+        return self.person_calendars.get(person, self.default)
+
+
+this = sys.modules[__name__]
+this.calendars = CalendarSet(BusinessCalendar())
+
+
+def use_calendars(calendars: CalendarSet) -> None:
+    """Set the calendars used to measure the working time of issues"""
+    this.calendars = calendars
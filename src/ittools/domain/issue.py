@@ -3,9 +3,10 @@ from __future__ import annotations
 import abc
 import numpy as np
 from datetime import datetime
-from typing import Any, List
+from typing import Any, Dict, Iterable, List
 
-from .dateutils import business_days
+from . import business_calendar
+from .business_calendar import BusinessCalendar
 
 
 class IssueState:
@@ -28,6 +29,7 @@ class Issue(metaclass=abc.ABCMeta):
     def __init__(self, key: str, summary: str):
         self.key = key
         self.summary = summary
+        self._time_in_states: Dict[str, float] | None = None
 
     def __eq__(self, other: Any) -> bool:
         return self.key == other.key
@@ -36,18 +38,60 @@ class Issue(metaclass=abc.ABCMeta):
         return f"{self.__class__.__name__}({self.key})"
 
     def time_in_state(self, state_name: str) -> float:
-        durations = self._durations_for(self.history)
-        matching_durations = [duration for state, duration in zip(self.history, durations) if state.name == state_name]
-        return sum(matching_durations)
+        if self._time_in_states is None:
+            self._time_in_states = self._total_time_in_states()
+        return self._time_in_states.get(state_name, 0.0)
+
+    def _total_time_in_states(self) -> Dict[str, float]:
+        history = self.history
+        return _total_durations(history, self._durations_for(history))
+
+    @property
+    def calendar(self) -> BusinessCalendar:
+        """The business calendar used to measure the working time of this issue"""
+        return business_calendar.calendars.default
 
     @property
     @abc.abstractmethod
     def history(self) -> List[IssueState]:
         pass
 
-    @staticmethod
-    def _durations_for(states: List[IssueState]):
+    def _durations_for(self, states: List[IssueState]):
         start_times = [state.start_time for state in states]
-        durations = [business_days(t1, t2) for t1, t2 in zip(start_times[:-1], start_times[1:])]
+        durations = list(self.calendar.business_days_between(start_times[:-1], start_times[1:]))
         durations.append(np.float64(0.0))  # Assume last state has zero time
         return durations
+
+
+def calculate_time_in_states(issues: Iterable[Issue]) -> None:
+    """Calculate the time in each state for many issues with one business days calculation per calendar"""
+    pending = [issue for issue in issues if issue._time_in_states is None]
+    for calendar, calendar_issues in group_by_calendar(pending).items():
+        _calculate_time_in_states(calendar, calendar_issues)
+
+
+def group_by_calendar(issues: Iterable[Issue]) -> Dict[BusinessCalendar, List[Issue]]:
+    groups: Dict[BusinessCalendar, List[Issue]] = {}
+    for issue in issues:
+        groups.setdefault(issue.calendar, []).append(issue)
+    return groups
+
+
+def _calculate_time_in_states(calendar: BusinessCalendar, issues: List[Issue]) -> None:
+    histories = [issue.history for issue in issues]
+    start_times = [state.start_time for history in histories for state in history[:-1]]
+    end_times = [state.start_time for history in histories for state in history[1:]]
+    durations = calendar.business_days_between(start_times, end_times)
+    offset = 0
+    for issue, history in zip(issues, histories):
+        transition_count = max(len(history) - 1, 0)
+        issue_durations = [*durations[offset:offset + transition_count], np.float64(0.0)]
+        issue._time_in_states = _total_durations(history, issue_durations)
+        offset += transition_count
+
+
+def _total_durations(history: List[IssueState], durations: List[float]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for state, duration in zip(history, durations):
+        totals[state.name] = totals.get(state.name, 0.0) + duration
+    return totals
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Collection, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .transition_log import TransitionLog
+
+
+class StatusIndex:
+    """The time every issue spent in each status, indexed to answer questions about a point in time
+
+    Each stay in a status is an interval from entering it to leaving it (or forever, for
+    the current status). For each status, the intervals are kept in arrays sorted by
+    start, alongside a sorted array of the exit times. The number of issues in
+    a status at any time is two binary searches, and the issues in it are found with a
+    binary search and a scan of the earlier intervals.
+    """
+
+    def __init__(self, issue_histories: Iterable[Tuple[str, TransitionLog]]):
+        self._logs: Dict[str, TransitionLog] = dict(issue_histories)
+        intervals: Dict[str, List[Tuple[float, float, str]]] = {}
+        for key, transitions in self._logs.items():
+            times = [start_time.timestamp() for start_time in transitions.start_times] + [np.inf]
+            for index, status in enumerate(transitions.statuses):
+                intervals.setdefault(status, []).append((times[index], times[index + 1], key))
+        self._intervals = {status: _StatusIntervals(status_intervals) for status, status_intervals in intervals.items()}
+        self._created_times = np.sort([transitions.created_time.timestamp() for transitions in self._logs.values()])
+
+    def status_at(self, key: str, time: datetime) -> str | None:
+        """The status of the issue at the time, or None if the issue had not been created"""
+        transitions = self._logs.get(key)
+        return transitions.status_at(time) if transitions else None
+
+    def issues_in(self, statuses: Collection[str], time: datetime) -> List[str]:
+        """The keys of the issues that were in one of the statuses at the time"""
+        timestamp = time.timestamp()
+        return [
+            key for status in statuses if status in self._intervals
+            for key in self._intervals[status].keys_at(timestamp)
+        ]
+
+    def count_in(self, statuses: Collection[str], time: datetime) -> int:
+        """The number of issues that were in one of the statuses at the time"""
+        timestamp = time.timestamp()
+        return sum(self._intervals[status].count_at(timestamp) for status in statuses if status in self._intervals)
+
+    def created_count(self, time: datetime) -> int:
+        """The number of issues that had been created by the time"""
+        return int(np.searchsorted(self._created_times, time.timestamp(), side="right"))
+
+
+class _StatusIntervals:
+    """The intervals that issues spent in one status, sorted by start"""
+
+    __slots__ = ("starts", "ends", "keys", "sorted_ends")
+
+    def __init__(self, intervals: List[Tuple[float, float, str]]):
+        intervals.sort()
+        self.starts = np.array([start for start, _, _ in intervals])
+        self.ends = np.array([end for _, end, _ in intervals])
+        self.keys = np.array([key for _, _, key in intervals], dtype=object)
+        self.sorted_ends = np.sort(self.ends)
+
+    def count_at(self, timestamp: float) -> int:
+        entered = np.searchsorted(self.starts, timestamp, side="right")
+        left = np.searchsorted(self.sorted_ends, timestamp, side="right")
+        return int(entered - left)
+
+    def keys_at(self, timestamp: float) -> List[str]:
+        started = np.searchsorted(self.starts, timestamp, side="right")
+        return self.keys[:started][self.ends[:started] > timestamp].tolist()
@@ -0,0 +1,70 @@
+from datetime import date
+
+import dateutil.parser
+import pytest
+
+from ittools.config import CalendarConfig
+from ittools.domain.business_calendar import BusinessCalendar, CalendarSet
+
+
+def test_weekends_are_not_working_time():
+    calendar = BusinessCalendar()
+
+    assert calendar.business_days(time("2023-10-13T15:00:00+1100"), time("2023-10-16T11:00:00+1100")) == 0.5
+
+
+def test_holidays_are_not_working_time():
+    calendar = BusinessCalendar(holidays=[date(2023, 12, 25), "2023-12-26"])
+
+    assert calendar.business_days(time("2023-12-22T09:00:00+1100"), time("2023-12-27T09:00:00+1100")) == 1.0
+
+
+def test_working_hours_and_days():
+    calendar = BusinessCalendar(working_hours=[8, 12], working_days=["Mon", "Tue", "Wed", "Thu"])
+
+    assert calendar.business_days(time("2023-10-12T10:00:00+1100"), time("2023-10-16T09:00:00+1100")) == 0.75
+
+
+def test_timezone_converts_timestamps():
+    calendar = BusinessCalendar(timezone="Australia/Sydney")
+
+    # 10pm UTC on Thursday is 9am on Friday in Sydney
+    assert calendar.business_days(time("2023-10-12T22:00:00+0000"), time("2023-10-13T13:00:00+1100")) == 0.5
+
+
+def test_without_timezone_each_timestamp_uses_its_own_offset():
+    calendar = BusinessCalendar()
+
+    assert calendar.business_days(time("2023-10-12T10:00:00+0000"), time("2023-10-12T12:00:00+1100")) == 0.25
+
+
+def test_batch_matches_single_intervals_across_index_extensions():
+    calendar = BusinessCalendar(holidays=["2023-12-25"])
+    starts = [time("2023-10-12T10:00:00+1100"), time("2019-01-02T16:00:00+1100"), time("2023-12-22T13:00:00+1100")]
+    ends = [time("2023-10-20T11:00:00+1100"), time("2030-06-03T10:30:00+1000"), time("2023-12-27T10:00:00+1100")]
+
+    durations = calendar.business_days_between(starts, ends)
+
+    assert list(durations) == [BusinessCalendar(holidays=["2023-12-25"]).business_days(s, e) for s, e in zip(starts, ends)]
+
+
+def test_working_hours_must_end_after_they_start():
+    with pytest.raises(ValueError):
+        BusinessCalendar(working_hours=[17, 9])
+
+
+def test_team_calendars_extend_the_default_calendar():
+    calendar_config = CalendarConfig({
+        "holidays": [date(2023, 12, 25)],
+        "teams": {"Team2": {"working_days": ["Mon", "Tue", "Wed", "Thu"]}},
+    })
+    calendars = CalendarSet.from_config(calendar_config, {"Team1": ["John Doe"], "Team2": ["Jane Doe"]})
+
+    team_calendar = calendars.for_person("Jane Doe")
+    assert calendars.for_person("John Doe") is calendars.default
+    assert team_calendar.business_days(time("2023-10-12T09:00:00+1100"), time("2023-10-16T09:00:00+1100")) == 1.0
+    assert team_calendar.business_days(time("2023-12-25T09:00:00+1100"), time("2023-12-26T09:00:00+1100")) == 0.0
+
+
+def time(timestamp: str):
+    return dateutil.parser.isoparse(timestamp)
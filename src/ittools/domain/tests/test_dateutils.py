@@ -1,56 +1,74 @@
 import pytest
 import dateutil.parser
-from ittools.domain.dateutils import business_days
-
-
-@pytest.mark.parametrize(
-    "start, end, expected, message",
-    [
-        (
-            "2022-03-01T10:00:00+1100",
-            "2022-03-02T10:00:00+1100",
-            1.0,
-            "Exactly one day",
-        ),
-        (
-            "2022-09-05T09:00:00+1000",
-            "2022-09-06T11:30:00+1000",
-            1.3125,
-            "Minutes are handled",
-        ),
-        (
-            "2022-03-01T10:00:00+1100",
-            "2022-03-01T12:00:00+1100",
-            0.25,
-            "Same day start/end",
-        ),
-        (
-            "2022-03-01T16:00:00+1100",
-            "2022-03-02T10:00:00+1100",
-            0.25,
-            "Skip night hours",
-        ),
-        (
-            "2022-09-06T11:00:00+1000",
-            "2022-09-07T10:00:00+1000",
-            0.875,
-            "Skip night hours",
-        ),
-        (
-            "2022-03-01T10:00:00+1100",
-            "2022-03-08T10:00:00+1100",
-            5.0,
-            "Exactly one week",
-        ),
-        (
-            "2022-09-14T19:00:00+1000",
-            "2022-09-15T10:00:00+1000",
-            0.125,
-            "Start after hours",
-        ),
-    ],
-)
+from ittools.domain.dateutils import business_days, business_days_between
+
+
+BUSINESS_DAY_CASES = [
+    (
+        "2022-03-01T10:00:00+1100",
+        "2022-03-02T10:00:00+1100",
+        1.0,
+        "Exactly one day",
+    ),
+    (
+        "2022-09-05T09:00:00+1000",
+        "2022-09-06T11:30:00+1000",
+        1.3125,
+        "Minutes are handled",
+    ),
+    (
+        "2022-03-01T10:00:00+1100",
+        "2022-03-01T12:00:00+1100",
+        0.25,
+        "Same day start/end",
+    ),
+    (
+        "2022-03-01T16:00:00+1100",
+        "2022-03-02T10:00:00+1100",
+        0.25,
+        "Skip night hours",
+    ),
+    (
+        "2022-09-06T11:00:00+1000",
+        "2022-09-07T10:00:00+1000",
+        0.875,
+        "Skip night hours",
+    ),
+    (
+        "2022-03-01T10:00:00+1100",
+        "2022-03-08T10:00:00+1100",
+        5.0,
+        "Exactly one week",
+    ),
+    (
+        "2022-09-14T19:00:00+1000",
+        "2022-09-15T10:00:00+1000",
+        0.125,
+        "Start after hours",
+    ),
+]
+
+
+@pytest.mark.parametrize("start, end, expected, message", BUSINESS_DAY_CASES)
 def test_business_days(start, end, expected, message):
     start = dateutil.parser.isoparse(start)
     end = dateutil.parser.isoparse(end)
     assert business_days(start, end) == expected, message
+
+
+def test_business_days_between_matches_business_days():
+    starts = [dateutil.parser.isoparse(start) for start, _, _, _ in BUSINESS_DAY_CASES]
+    ends = [dateutil.parser.isoparse(end) for _, end, _, _ in BUSINESS_DAY_CASES]
+
+    durations = business_days_between(starts, ends)
+
+    assert list(durations) == [expected for _, _, expected, _ in BUSINESS_DAY_CASES]
+
+
+def test_business_days_between_no_times():
+    assert len(business_days_between([], [])) == 0
+
+
+def test_business_days_between_needs_matching_times():
+    with pytest.raises(ValueError):
+        business_days_between([dateutil.parser.isoparse("2022-03-01T10:00:00+1100")], [])
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from ittools.domain.status_index import StatusIndex
+from ittools.domain.transition_log import TransitionLog
+
+MONDAY = datetime(2023, 10, 16, 9, 0, tzinfo=timezone.utc)
+
+
+def test_status_of_an_issue_at_a_time():
+    index = StatusIndex([("DS-1", log(MONDAY, ("In Progress", 1), ("Done", 3)))])
+
+    assert index.status_at("DS-1", MONDAY - timedelta(hours=1)) is None
+    assert index.status_at("DS-1", MONDAY + timedelta(days=2)) == "In Progress"
+    assert index.status_at("DS-1", MONDAY + timedelta(days=3)) == "Done"
+    assert index.status_at("DS-2", MONDAY) is None
+
+
+def test_issues_and_counts_in_statuses_at_a_time():
+    index = StatusIndex([
+        ("DS-1", log(MONDAY, ("In Progress", 1), ("Done", 3))),
+        ("DS-2", log(MONDAY, ("In Progress", 2), ("In Review", 3), ("In Progress", 4))),
+        ("DS-3", log(MONDAY + timedelta(days=2))),
+    ])
+
+    tuesday = MONDAY + timedelta(days=1, hours=1)
+    thursday = MONDAY + timedelta(days=3, hours=1)
+    assert index.issues_in(["In Progress"], tuesday) == ["DS-1"]
+    assert index.issues_in(["In Progress", "In Review"], thursday) == ["DS-2"]
+    assert index.issues_in(["Done"], thursday) == ["DS-1"]
+    assert index.count_in(["Selected for Development"], tuesday) == 1
+    assert index.count_in(["Selected for Development"], thursday) == 1
+    assert index.count_in(["In Progress"], MONDAY + timedelta(days=4, hours=1)) == 1
+    assert index.count_in(["Closed"], thursday) == 0
+    assert index.created_count(tuesday) == 2
+    assert index.created_count(thursday) == 3
+
+
+def test_counts_match_the_status_of_each_issue():
+    logs = [
+        (f"DS-{number}", log(MONDAY + timedelta(hours=number), ("In Progress", number % 5), ("Done", number % 5 + 2)))
+        for number in range(50)
+    ]
+    index = StatusIndex(logs)
+
+    for hours in range(0, 24 * 10, 7):
+        time = MONDAY + timedelta(hours=hours)
+        statuses = [transitions.status_at(time) for _, transitions in logs]
+        for status in ["Selected for Development", "In Progress", "Done"]:
+            assert index.count_in([status], time) == statuses.count(status)
+            assert len(index.issues_in([status], time)) == statuses.count(status)
+
+
+def log(created: datetime, *transitions) -> TransitionLog:
+    """A log with transitions given as (status, days after creation)"""
+    return TransitionLog.create(
+        "Selected for Development", created, [(status, created + timedelta(days=days)) for status, days in transitions]
+    )
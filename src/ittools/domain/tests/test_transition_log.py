@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from ittools.domain.issue import IssueState
+from ittools.domain.transition_log import TransitionLog
+
+CREATED = datetime(2023, 10, 12, 9, 0)
+IN_PROGRESS = datetime(2023, 10, 12, 11, 0)
+DONE = datetime(2023, 10, 13, 15, 0)
+
+
+def test_first_entry_is_the_created_status():
+    log = TransitionLog.create("Selected for Development", CREATED, [("In Progress", IN_PROGRESS)])
+
+    assert len(log) == 2
+    assert log.created_time == CREATED
+    assert log.states == [IssueState("Selected for Development", CREATED), IssueState("In Progress", IN_PROGRESS)]
+
+
+def test_first_transition_to_any_of_the_statuses():
+    log = TransitionLog.create("Selected for Development", CREATED, [
+        ("In Progress", IN_PROGRESS),
+        ("Done", DONE),
+        ("In Progress", datetime(2023, 10, 16, 9, 0)),
+    ])
+
+    assert log.first_transition_to(["In Progress"]) == IN_PROGRESS
+    assert log.first_transition_to(["Awaiting Demo", "Done"]) == DONE
+    assert log.first_transition_to(["Closed"]) is None
+
+
+def test_created_status_is_not_a_transition():
+    log = TransitionLog.create("In Progress", CREATED, [])
+
+    assert log.first_transition_to(["In Progress"]) is None
+
+
+def test_status_at_a_time():
+    log = TransitionLog.create("Selected for Development", CREATED, [("In Progress", IN_PROGRESS), ("Done", DONE)])
+
+    assert log.status_at(datetime(2023, 10, 12, 8, 0)) is None
+    assert log.status_at(CREATED) == "Selected for Development"
+    assert log.status_at(datetime(2023, 10, 13, 9, 0)) == "In Progress"
+    assert log.status_at(datetime(2023, 10, 20, 9, 0)) == "Done"
+
+
+def test_log_until_a_time():
+    log = TransitionLog.create("Selected for Development", CREATED, [("In Progress", IN_PROGRESS), ("Done", DONE)])
+
+    earlier_log = log.until(datetime(2023, 10, 13, 9, 0))
+
+    assert earlier_log.statuses == ("Selected for Development", "In Progress")
+    assert earlier_log.first_transition_to(["Done"]) is None
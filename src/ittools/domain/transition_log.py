@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Collection, List, Tuple
+
+from .issue import IssueState
+
+
+class TransitionLog:
+    """The statuses an issue has been in, and the time it entered each one
+
+    The log is parsed once from the issue history, so the times are already
+    converted to datetimes. The first entry is the status the issue was created in.
+    """
+
+    __slots__ = ("statuses", "start_times")
+
+    def __init__(self, statuses: Tuple[str, ...], start_times: Tuple[datetime, ...]):
+        self.statuses = statuses
+        self.start_times = start_times
+
+    @classmethod
+    def create(cls, initial_status: str, created_time: datetime, transitions: List[Tuple[str, datetime]]):
+        return cls(
+            (initial_status, *(status for status, _ in transitions)),
+            (created_time, *(start_time for _, start_time in transitions)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    @property
+    def created_time(self) -> datetime:
+        return self.start_times[0]
+
+    def first_transition_to(self, statuses: Collection[str]) -> datetime | None:
+        """The first time the issue moved into one of the statuses after it was created"""
+        for index in range(1, len(self.statuses)):
+            if self.statuses[index] in statuses:
+                return self.start_times[index]
+        return None
+
+    def status_at(self, time: datetime) -> str | None:
+        """The status of the issue at the time, or None if it had not been created"""
+        index = bisect_right(self.start_times, time)
+        return self.statuses[index - 1] if index else None
+
+    def until(self, time: datetime) -> TransitionLog:
+        """The log as it was at the time, without any later transitions"""
+        index = bisect_right(self.start_times, time)
+        return TransitionLog(self.statuses[:index], self.start_times[:index])
+
+    @property
+    def states(self) -> List[IssueState]:
+        return [IssueState(status, start_time) for status, start_time in zip(self.statuses, self.start_times)]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+# Fields read whenever an issue is created from a search result
+BASE_FIELDS = ["summary"]
+
+
+class FieldProfile:
+    """The issue fields a report reads, and whether it needs the issue history
+
+    Fields are named by their Jira field id (such as "status"), or by name for the
+    custom fields discovered by the server (such as "Epic Link"). Searches made with
+    a profile only download the listed fields, and only expand the changelog when
+    the history is needed.
+    """
+
+    def __init__(self, fields: List[str], changelog: bool = False):
+        self.fields = fields
+        self.changelog = changelog
+
+    def __or__(self, other: FieldProfile) -> FieldProfile:
+        return FieldProfile(
+            self.fields + [field for field in other.fields if field not in self.fields],
+            self.changelog or other.changelog,
+        )
+
+    def __eq__(self, other) -> bool:
+        return set(self.fields) == set(other.fields) and self.changelog == other.changelog
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.fields}, changelog={self.changelog})"
+
+    def covers(self, other: FieldProfile) -> bool:
+        """Whether issues loaded with this profile have everything needed by the other profile"""
+        has_fields = "*all" in self.fields or set(other.fields) <= set(self.fields)
+        return has_fields and (self.changelog or not other.changelog)
+
+    def search_fields(self, custom_fields: Dict[str, str]) -> List[str]:
+        """The field ids to request from the server"""
+        field_ids = [custom_fields.get(field, field) for field in BASE_FIELDS + self.fields]
+        return list(dict.fromkeys(field_ids))
+
+    @property
+    def expand(self) -> str | None:
+        return "changelog" if self.changelog else None
+
+
+ALL_FIELDS = FieldProfile(["*all"], changelog=True)
+
+# Fields needed to calculate when an issue started and completed, on its assignee's calendar
+DURATION_FIELDS = FieldProfile(["created", "resolutiondate", "assignee"], changelog=True)
+
+# Fields needed to follow the status of an issue over time
+STATUS_HISTORY_FIELDS = FieldProfile(["created", "status", "Epic Link"], changelog=True)
+
+# Fields read from epics
+EPIC_FIELDS = FieldProfile(["labels", "updated", "Epic Status", "Rank"])
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import dateutil.parser
+
+ISSUE_STORE_DB = "issues.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    issue_type TEXT,
+    status TEXT,
+    epic_key TEXT,
+    epic_status TEXT,
+    labels TEXT NOT NULL,
+    fix_versions TEXT NOT NULL,
+    rank TEXT,
+    created TEXT,
+    updated TEXT,
+    resolved TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_epic_key ON issues (epic_key);
+CREATE INDEX IF NOT EXISTS issues_status ON issues (status);
+CREATE INDEX IF NOT EXISTS issues_resolved ON issues (resolved);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+RawIssue = Dict[str, Any]
+
+
+class IssueStore:
+    """A local copy of the raw Jira issues (including changelogs) in the configured projects
+
+    Issues are stored as the raw JSON returned by Jira, alongside a few indexed
+    columns that allow the common report queries to be answered locally. The store
+    is kept up to date by incremental syncs of recently updated issues. Issues that
+    are deleted in Jira, or moved out of the configured projects, are not removed.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path))
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, store_dir: str) -> IssueStore:
+        return cls(Path(store_dir) / ISSUE_STORE_DB)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def last_synced(self, scope: str) -> datetime | None:
+        row = self._db.execute("SELECT synced_at FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return datetime.fromisoformat(row["synced_at"]) if row else None
+
+    def is_fresh(self, scope: str, max_age: timedelta) -> bool:
+        last_synced = self.last_synced(scope)
+        return last_synced is not None and datetime.now(timezone.utc) - last_synced < max_age
+
+    def store_issues(
+        self, scope: str, raw_issues: Iterable[RawIssue], custom_fields: Dict[str, str], synced_at: datetime
+    ) -> int:
+        """Insert or replace the given issues, and record the sync time for the scope in the same transaction"""
+        count = 0
+        with self._db:
+            for raw_issue in raw_issues:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _issue_row(raw_issue, custom_fields),
+                )
+                count += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (scope, synced_at.astimezone(timezone.utc).isoformat())
+            )
+        return count
+
+    def clear(self) -> None:
+        """Remove all the issues, and with them the sync time of every scope, so each is synced in full again"""
+        with self._db:
+            self._db.execute("DELETE FROM issues")
+            self._db.execute("DELETE FROM sync_state")
+
+    def issue(self, key: str) -> RawIssue | None:
+        issues = self._select("key = ?", [key])
+        return issues[0] if issues else None
+
+    def issues_with_keys(self, keys: List[str]) -> List[RawIssue]:
+        return self._select(f"key IN ({_placeholders(keys)})", keys)
+
+    def working_issues(self, issue_types: List[str], statuses: List[str]) -> List[RawIssue]:
+        return self._select(
+            f"issue_type IN ({_placeholders(issue_types)}) AND status IN ({_placeholders(statuses)})",
+            [*issue_types, *statuses],
+            "created",
+        )
+
+    def issues_of_types(self, issue_types: List[str]) -> List[RawIssue]:
+        return self._select(f"issue_type IN ({_placeholders(issue_types)})", issue_types, "created")
+
+    def resolved_issues(
+        self,
+        statuses: List[str],
+        from_time: datetime,
+        to_time: datetime,
+        assignees: List[str] | None = None,
+        epic_keys: List[str] | None = None,
+    ) -> List[RawIssue]:
+        """Issues in an epic resolved in the time range, optionally only those of some assignees or epics"""
+        where = f"epic_key IS NOT NULL AND status IN ({_placeholders(statuses)}) AND resolved >= ? AND resolved < ?"
+        params: List[Any] = [*statuses, _utc_iso(from_time), _utc_iso(to_time)]
+        if assignees:
+            where += f" AND json_extract(raw, '$.fields.assignee.displayName') IN ({_placeholders(assignees)})"
+            params.extend(assignees)
+        if epic_keys is not None:
+            where += f" AND epic_key IN ({_placeholders(epic_keys)})"
+            params.extend(epic_keys)
+        return self._select(where, params, "resolved")
+
+    def issues_in_epic(self, epic_key: str) -> List[RawIssue]:
+        return self._select("epic_key = ?", [epic_key], "status")
+
+    def issues_in_epics(self, epic_keys: List[str]) -> List[RawIssue]:
+        return self._select(f"epic_key IN ({_placeholders(epic_keys)})", epic_keys)
+
+    def issues_with_fix_version(self, fix_version: str) -> List[RawIssue]:
+        return self._select("fix_versions LIKE ?", [_list_pattern(fix_version)])
+
+    def epics_with_label(self, label: str) -> List[RawIssue]:
+        return self._select("issue_type = 'Epic' AND labels LIKE ?", [_list_pattern(label)], "rank")
+
+    def open_epics(self) -> List[RawIssue]:
+        return self._select("issue_type = 'Epic' AND epic_status != 'Done'", [], "rank")
+
+    def count_issues_in_epic(
+        self, epic_key: str, statuses: List[str] | None = None, excluded_statuses: List[str] | None = None
+    ) -> int:
+        condition = "epic_key = ?"
+        params: List[Any] = [epic_key]
+        if statuses:
+            condition += f" AND status IN ({_placeholders(statuses)})"
+            params.extend(statuses)
+        if excluded_statuses:
+            condition += f" AND status NOT IN ({_placeholders(excluded_statuses)})"
+            params.extend(excluded_statuses)
+        return self._db.execute(f"SELECT COUNT(*) FROM issues WHERE {condition}", params).fetchone()[0]
+
+    def epic_child_statuses(self, epic_keys: List[str]) -> List[Tuple[str, str]]:
+        """(epic key, status) pairs for every child issue of the epics"""
+        rows = self._db.execute(
+            f"SELECT epic_key, status FROM issues WHERE epic_key IN ({_placeholders(epic_keys)})", epic_keys
+        )
+        return [(row["epic_key"], row["status"]) for row in rows]
+
+    def _select(self, condition: str, params: List[Any], order_by: str = "key") -> List[RawIssue]:
+        rows = self._db.execute(f"SELECT raw FROM issues WHERE {condition} ORDER BY {order_by}", params)
+        return [json.loads(row["raw"]) for row in rows]
+
+
+def _issue_row(raw_issue: RawIssue, custom_fields: Dict[str, str]) -> List[Any]:
+    fields = raw_issue["fields"]
+    epic_status = fields.get(custom_fields["Epic Status"])
+    return [
+        raw_issue["key"],
+        raw_issue["key"].split("-")[0],
+        _name(fields.get("issuetype")),
+        _name(fields.get("status")),
+        fields.get(custom_fields["Epic Link"]),
+        epic_status.get("value") if isinstance(epic_status, dict) else None,
+        _list_column(fields.get("labels") or []),
+        _list_column(_name(version) for version in fields.get("fixVersions") or []),
+        fields.get(custom_fields["Rank"]),
+        _utc_iso(fields.get("created")),
+        _utc_iso(fields.get("updated")),
+        _utc_iso(fields.get("resolutiondate")),
+        json.dumps(raw_issue),
+    ]
+
+
+def _name(field: Optional[Dict[str, Any]]) -> str | None:
+    return field.get("name") if field else None
+
+
+def _list_column(values: Iterable[str]) -> str:
+    """Lists are stored delimited on both sides, so single values can be matched with LIKE"""
+    return "".join(f"|{value}" for value in values) + "|"
+
+
+def _list_pattern(value: str) -> str:
+    return f"%|{value}|%"
+
+
+def _utc_iso(timestamp: str | datetime | None) -> str | None:
+    """Timestamps are normalised to UTC, so they can be compared as strings"""
+    if not timestamp:
+        return None
+    if isinstance(timestamp, str):
+        timestamp = dateutil.parser.isoparse(timestamp)
+    return timestamp.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _placeholders(values: List[Any]) -> str:
+    return ", ".join("?" * len(values))
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import os
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from math import ceil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import dateutil.parser
 from dotenv import dotenv_values
@@ -12,43 +13,108 @@ from jira import Issue as AtlassianIssue
 from jira.client import ResultList
 
 from ittools.config import JiraConfig
-from ittools.domain.dateutils import business_days, calendar_days
+from ittools.domain import business_calendar
+from ittools.domain.business_calendar import BusinessCalendar
+from ittools.domain.dateutils import calendar_days
 from ittools.domain.epic import Epic
-from ittools.domain.issue import Issue, IssueState
+from ittools.domain.issue import Issue, IssueState, calculate_time_in_states, group_by_calendar
 from ittools.domain.issue_counts import IssueCounts
 from ittools.domain.issue_provider import IssueProvider
+from ittools.domain.status_index import StatusIndex
+from ittools.domain.transition_log import TransitionLog
+from ittools.jira.field_profile import ALL_FIELDS, EPIC_FIELDS, FieldProfile
+from ittools.jira.issue_store import IssueStore, RawIssue
+from ittools.jira.local_cache import EpicEstimateCache, ResolvedShardCache, ServerMetadataCache
+from ittools.jira.paged_search import PagedSearch
+from ittools.jira.sharded_search import ShardedSearch
+
+# Overlap between incremental syncs, in case of clock skew between this machine and the server
+SYNC_OVERLAP_MINUTES = 5
+# Number of keys in each "key in (...)" search, to keep within URL and JQL length limits
+KEY_CHUNK_SIZE = 100
+KEY_CHUNK_WORKERS = 4
+# Resolved issue searches are split by month, and a month is cached for good once it
+# ended this many days ago (allowing for the server being in a different timezone)
+RESOLVED_SETTLED_DAYS = 1
+RESOLVED_SHARD_WORKERS = 4
+
+T = TypeVar("T")
 
 
 class JiraServer(IssueProvider, JIRA):
     def __init__(self, verbose: bool, jira_config: JiraConfig):
-        super().__init__(**_build_jira_args(jira_config))
+        metadata = ServerMetadataCache.open(
+            jira_config.cache_dir, jira_config.url, timedelta(hours=jira_config.server_cache_hours)
+        )
+        # Skip the session validation round trip when the server was recently used successfully
+        super().__init__(**_build_jira_args(jira_config, validate=not metadata.is_warm), get_server_info=False)
         self._verbose = verbose
         self._config = jira_config
-        self._custom_fields = self._find_custom_fields()
+        self._load_server_metadata(metadata)
+        self._custom_fields = self._find_custom_fields(metadata.field_ids)
         self._project_query = f"project IN ({','.join(jira_config.project_keys)})"
+        self._project_scope = ",".join(sorted(jira_config.project_keys))
+        self._issue_store = IssueStore.open(jira_config.cache_dir) if jira_config.issue_store.enabled else None
+        self._epics: Dict[str, JiraEpic] = {}
+        # Issues loaded by key or fix version, with the fields they were loaded with
+        self._issues: Dict[str, Tuple[FieldProfile, JiraIssue]] = {}
+        self._epic_estimates = EpicEstimateCache.open(jira_config.cache_dir, jira_config.url)
+        self._resolved_shards = ResolvedShardCache.open(jira_config.cache_dir, jira_config.url)
+        self._as_of: datetime | None = None
 
     def load_project_epics(self, project_key: str) -> List[JiraEpic]:
-        return self.query_project_epics(project_key)
+        """Load the project epics, which will count their issues together the first time counts are needed"""
+        epics = self.query_project_epics(project_key)
+        project_counts = ProjectIssueCounts(epics, self)
+        for epic in epics:
+            epic.count_issues_with(project_counts)
+        return epics
 
     @property
     def custom_fields(self) -> Dict[str, str]:
         return self._custom_fields
 
-    def _find_custom_fields(self) -> Dict[str, str]:
-        all_fields = self.fields()
+    @property
+    def epic_estimates(self) -> EpicEstimateCache | None:
+        return self._epic_estimates
+
+    @property
+    def as_of(self) -> datetime | None:
+        return self._as_of
+
+    def use_as_of(self, as_of: datetime | None) -> None:
+        """Answer queries as they would have been answered at a past time, only from the issue store
+
+        Issues are shown with their status at that time, and the store is not synced, so
+        nothing is requested from the server. None goes back to answering for the present.
+        """
+        if as_of and not self._issue_store:
+            raise ValueError("Reports as of a past date need the issue store to be enabled")
+        self._as_of = as_of
+
+    def _load_server_metadata(self, metadata: ServerMetadataCache) -> None:
+        """Set up the server details the jira library would otherwise request, from the cache if possible"""
+        if not metadata.is_warm:
+            if self._verbose:
+                print("Loading server information and fields")
+            metadata.update(self.server_info(), self.fields())
+        self._version = tuple(metadata.server_info["versionNumbers"])
+        self.deploymentType = metadata.server_info.get("deploymentType")
+        self._fields_cache_value = dict(metadata.field_clauses)
+
+    def _find_custom_fields(self, field_ids: Dict[str, str]) -> Dict[str, str]:
         return {
-            "Epic Link": self._find_custom_field(all_fields, "Epic Link"),
-            "Epic Status": self._find_custom_field(all_fields, "Epic Status"),
-            "Rank": self._find_custom_field(all_fields, "Rank"),
+            "Epic Link": self._find_custom_field(field_ids, "Epic Link"),
+            "Epic Status": self._find_custom_field(field_ids, "Epic Status"),
+            "Rank": self._find_custom_field(field_ids, "Rank"),
         }
 
-    def _find_custom_field(
-        self, all_fields: List[Dict[str, Any]], name: str
-    ) -> str:
-        field = next(filter(lambda f: f["name"] == name, all_fields))
+    def _find_custom_field(self, field_ids: Dict[str, str], name: str) -> str:
+        if name not in field_ids:
+            raise ValueError(f"Unable to find field '{name}' on this server")
         if self._verbose:
-            print(f"Field '{name}' has id '{field['id']}' on this server")
-        return field["id"]
+            print(f"Field '{name}' has id '{field_ids[name]}' on this server")
+        return field_ids[name]
 
     def _create_issue(self, raw_issue: AtlassianIssue):
         return JiraIssue(raw_issue, self._custom_fields)
@@ -56,63 +122,336 @@ class JiraServer(IssueProvider, JIRA):
     def _create_epic(self, raw_issue: AtlassianIssue):
         return JiraEpic(raw_issue, self)
 
-    def query_jql_raw(self, jql: str) -> ResultList[AtlassianIssue]:
+    def _issues_from_store(self, raw_issues: List[RawIssue]) -> List[JiraIssue]:
+        return [self._create_issue(self._issue_resource(raw_issue)) for raw_issue in raw_issues]
+
+    def _epics_from_store(self, raw_issues: List[RawIssue]) -> List[JiraEpic]:
+        return [self._create_epic(self._issue_resource(raw_issue)) for raw_issue in raw_issues]
+
+    def _as_of_issues(self, issues: List[JiraIssue]) -> List[JiraIssue]:
+        """The issues as they were at the as of time (leaving out later issues), or unchanged without one"""
+        if not self._as_of:
+            return issues
+        return [issue.as_of(self._as_of) for issue in issues if issue.transitions.created_time <= self._as_of]
+
+    def _issue_resource(self, raw_issue: RawIssue) -> AtlassianIssue:
+        return AtlassianIssue(self._options, self._session, raw=raw_issue)
+
+    @property
+    def has_issue_store(self) -> bool:
+        return self._issue_store is not None
+
+    def sync_issue_store(self, full: bool = False) -> int:
+        """Fetch issues updated since the last sync (or all issues) into the local issue store"""
+        if not self._issue_store:
+            raise ValueError("The issue store is not enabled in the configuration")
+
+        synced_at = datetime.now(timezone.utc)
+        last_synced = None if full else self._issue_store.last_synced(self._project_scope)
+        jql = self._project_query
+        if last_synced:
+            # Relative times avoid any dependency on the timezone of the Jira user profile
+            minutes_since_sync = ceil((synced_at - last_synced).total_seconds() / 60) + SYNC_OVERLAP_MINUTES
+            jql += f" and updated >= -{minutes_since_sync}m"
+        else:
+            self._issue_store.clear()
+        raw_issues = (issue.raw for issue in self.query_jql_raw(f"{jql} order by updated", ALL_FIELDS))
+        count = self._issue_store.store_issues(self._project_scope, raw_issues, self._custom_fields, synced_at)
+        if self._verbose:
+            print(f"Synced {count} issues into the issue store")
+        return count
+
+    def _fresh_issue_store(self) -> IssueStore | None:
+        """The local issue store (synced first if it is stale), or None if issues must come from the server"""
+        if not self._issue_store:
+            return None
+        if self._as_of:
+            return self._issue_store
+        max_age = timedelta(minutes=self._config.issue_store.max_age_minutes)
+        if not self._issue_store.is_fresh(self._project_scope, max_age):
+            self.sync_issue_store()
+        return self._issue_store
+
+    def query_jql_raw(self, jql: str, fields: FieldProfile = ALL_FIELDS) -> Iterator[AtlassianIssue]:
+        """Stream all issues matching the jql, fetching later pages while earlier ones are consumed"""
         if self._verbose:
             print(f"running jql: {jql}")
-        result = self.search_issues(jql, expand="changelog", maxResults=1000)
+        search_fields = fields.search_fields(self._custom_fields)
+        if self._is_cloud:
+            # Jira Cloud only pages with continuation tokens, so pages can't be fetched concurrently
+            return iter(
+                self.enhanced_search_issues(jql, fields=search_fields, expand=fields.expand, maxResults=False)
+            )
+        return iter(PagedSearch(
+            lambda start_at, max_results: self._search_page(jql, search_fields, fields.expand, start_at, max_results)
+        ))
+
+    def _search_page(
+        self, jql: str, search_fields: List[str], expand: str | None, start_at: int, max_results: int
+    ) -> ResultList[AtlassianIssue]:
+        result = self.search_issues(
+            jql, startAt=start_at, maxResults=max_results, fields=search_fields, expand=expand
+        )
         assert isinstance(result, ResultList)
         return result
 
-    def query_jql_issues(self, jql: str) -> List[JiraIssue]:
-        return list(map(self._create_issue, self.query_jql_raw(jql)))
+    def stream_jql_issues(self, jql: str, fields: FieldProfile = ALL_FIELDS) -> Iterator[JiraIssue]:
+        return map(self._create_issue, self.query_jql_raw(jql, fields))
+
+    def stream_jql_epics(self, jql: str, fields: FieldProfile = EPIC_FIELDS) -> Iterator[JiraEpic]:
+        return map(self._create_epic, self.query_jql_raw(jql, fields))
 
-    def query_jql_epics(self, jql: str) -> List[JiraEpic]:
-        return list(map(self._create_epic, self.query_jql_raw(jql)))
+    def query_jql_issues(self, jql: str, fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        return list(self.stream_jql_issues(jql, fields))
+
+    def query_jql_epics(self, jql: str, fields: FieldProfile = EPIC_FIELDS) -> List[JiraEpic]:
+        return list(self.stream_jql_epics(jql, fields))
 
     def query_project_epics(self, project_label: str) -> List[JiraEpic]:
+        store = self._fresh_issue_store()
+        if store:
+            return self._epics_from_store(store.epics_with_label(project_label))
         return self.query_jql_epics(
             f"{self._project_query} AND issuetype = Epic and labels = {project_label} ORDER BY rank"
         )
 
     def query_open_epics(self) -> List[JiraEpic]:
+        store = self._fresh_issue_store()
+        if store:
+            return self._epics_from_store(store.open_epics())
         return self.query_jql_epics(
             f"{self._project_query} and issueType = Epic and 'Epic Status' != Done order by rank"
         )
 
-    def query_fix_version(self, fix_version: str) -> List[JiraIssue]:
-        return self.query_jql_issues(f"{self._project_query} AND fixVersion = {fix_version}")
+    def query_fix_version(self, fix_version: str, fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        store = self._fresh_issue_store()
+        if store:
+            return self._remember_issues(self._issues_from_store(store.issues_with_fix_version(fix_version)), ALL_FIELDS)
+        return self._remember_issues(
+            self.query_jql_issues(f"{self._project_query} AND fixVersion = {fix_version}", fields), fields
+        )
+
+    def query_issue_keys(self, issue_keys: List[str], fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        """The issues with the keys, in the order of the keys
+
+        Issues this server already loaded with the fields needed, and issues in the issue
+        store, are not requested again. The rest are searched for in chunks of keys, to
+        keep within URL and JQL length limits, and the chunks are fetched concurrently.
+        """
+        wanted_keys = list(dict.fromkeys(issue_keys))
+        issues = {
+            key: self._issues[key][1] for key in wanted_keys if key in self._issues and self._issues[key][0].covers(fields)
+        }
+        missing_keys = [key for key in wanted_keys if key not in issues]
+        store = self._fresh_issue_store() if missing_keys else None
+        if store:
+            stored_issues = self._remember_issues(self._issues_from_store(store.issues_with_keys(missing_keys)), ALL_FIELDS)
+            issues.update((issue.key, issue) for issue in stored_issues)
+            missing_keys = [key for key in missing_keys if key not in issues]
+
+        search = ShardedSearch(
+            lambda keys: self.query_jql_issues(f"key in ({', '.join(keys)})", fields),
+            _chunks(missing_keys, KEY_CHUNK_SIZE),
+            KEY_CHUNK_WORKERS,
+        )
+        issues.update((issue.key, issue) for issue in self._remember_issues(list(search), fields))
+        # Issues found under another key (such as after a move) follow those in key order
+        return [issues[key] for key in dict.fromkeys([*wanted_keys, *issues]) if key in issues]
+
+    def forget_issues(self) -> None:
+        """Load issues from the server (or issue store) again the next time they are needed"""
+        self._issues.clear()
 
-    def query_issue_keys(self, issue_keys: List[str]) -> List[JiraIssue]:
-        return self.query_jql_issues(f"key in ({', '.join(issue_keys)})")
+    def _remember_issues(self, issues: List[JiraIssue], fields: FieldProfile) -> List[JiraIssue]:
+        for issue in issues:
+            self._issues[issue.key] = (fields, issue)
+        return issues
 
     def jira_issue(self, issue_key: str) -> JiraIssue:
-        issue = self.issue(issue_key, expand="changelog")
-        return JiraIssue(issue, self._custom_fields)
+        return JiraIssue(self._raw_issue(issue_key), self._custom_fields)
 
     def jira_epic(self, epic_key: str) -> JiraEpic:
-        issue = self.issue(epic_key, expand="changelog")
-        return JiraEpic(issue, self)
+        if epic_key not in self._epics:
+            self._epics[epic_key] = JiraEpic(self._raw_issue(epic_key, EPIC_FIELDS), self)
+        return self._epics[epic_key]
+
+    def jira_epics(self, epic_keys: Iterable[str | None]) -> Dict[str, JiraEpic]:
+        """Load epics by key, searching for any not already loaded by this server in chunks of keys"""
+        wanted_keys = {key for key in epic_keys if key}
+        missing_keys = sorted(wanted_keys - self._epics.keys())
+        store = self._fresh_issue_store() if missing_keys else None
+        if store:
+            for epic in self._epics_from_store(store.issues_with_keys(missing_keys)):
+                self._epics[epic.key] = epic
+            missing_keys = [key for key in missing_keys if key not in self._epics and not self._as_of]
+        for keys in _chunks(missing_keys, KEY_CHUNK_SIZE):
+            for epic in self.stream_jql_epics(f"key in ({', '.join(keys)})"):
+                self._epics[epic.key] = epic
+        return {key: self._epics[key] for key in wanted_keys if key in self._epics}
+
+    def _raw_issue(self, issue_key: str, fields: FieldProfile = ALL_FIELDS) -> AtlassianIssue:
+        store = self._fresh_issue_store()
+        raw_issue = store.issue(issue_key) if store else None
+        if raw_issue:
+            return self._issue_resource(raw_issue)
+        if self._as_of:
+            raise ValueError(f"{issue_key} is not in the issue store")
+        return self.issue(issue_key, fields=",".join(fields.search_fields(self._custom_fields)), expand=fields.expand)
 
     def query_resolved_issues(
-        self, from_date: str, to_date: str
+        self,
+        from_date: str,
+        to_date: str,
+        fields: FieldProfile = ALL_FIELDS,
+        assignees: List[str] | None = None,
+        epic_keys: List[str] | None = None,
     ) -> List[JiraIssue]:
-        jql = (f"{self._project_query}"
-               f" and 'Epic Link' is not null"
-               f" and status in ('Done', 'Awaiting Demo')"
-               f" and resolved >= '{from_date}'"
-               f" and resolved < '{to_date}'"
-               f" order by resolved")
-
-        return self.query_jql_issues(jql)
-
-    def query_issues_in_epic(self, epic_key: str) -> List[JiraIssue]:
-        return self.query_jql_issues(f"'Epic Link' = {epic_key} order by Status")
+        return list(self.stream_resolved_issues(from_date, to_date, fields, assignees, epic_keys))
+
+    def stream_resolved_issues(
+        self,
+        from_date: str,
+        to_date: str,
+        fields: FieldProfile = ALL_FIELDS,
+        assignees: List[str] | None = None,
+        epic_keys: List[str] | None = None,
+    ) -> Iterator[JiraIssue]:
+        """The issues resolved in the date range, in order of resolution
+
+        The issues can be limited to those assigned to some people (by display name),
+        or to those in some epics, in the search itself, so only matching issues are
+        downloaded. Epic keys are searched for in chunks.
+
+        The date range is searched one calendar month at a time, with the months
+        fetched concurrently and streamed in order. Months that are over are cached
+        for good, so later runs only fetch the latest month, even when their range
+        starts on a different day.
+        """
+        if epic_keys is not None and not epic_keys:
+            return iter([])
+        store = self._fresh_issue_store()
+        if store:
+            return iter(self._issues_from_store(store.resolved_issues(
+                DONE_STATES, _local_midnight(from_date), _local_midnight(to_date), assignees, epic_keys
+            )))
+
+        jql = f"{self._project_query} and status in {_jql_list(DONE_STATES)}"
+        if assignees:
+            jql += f" and assignee in {_jql_list(assignees)}"
+        search = ShardedSearch(
+            lambda month: self._resolved_shard(jql, month, epic_keys, fields),
+            _month_ranges(str(from_date), str(to_date)),
+            RESOLVED_SHARD_WORKERS,
+        )
+        return map(self._create_issue, search)
+
+    def _resolved_shard(
+        self, jql: str, date_range: Tuple[str, str], epic_keys: List[str] | None, fields: FieldProfile
+    ) -> List[AtlassianIssue]:
+        """The issues resolved in a range of dates within one month
+
+        The whole month is searched, and cached for good once it is over, so the same
+        month is reused by later runs whatever dates they ask for. The issues outside
+        the range are then dropped.
+        """
+        month_start, month_end = _month_of(date_range[0])
+        jql += f" and resolved >= '{month_start}' and resolved < '{month_end}'"
+        if epic_keys is None:
+            searches = [f"{jql} and 'Epic Link' is not null order by resolved"]
+        else:
+            searches = [
+                f"{jql} and 'Epic Link' in ({', '.join(keys)}) order by resolved"
+                for keys in _chunks(epic_keys, KEY_CHUNK_SIZE)
+            ]
+        settled = date.fromisoformat(month_end) <= date.today() - timedelta(days=RESOLVED_SETTLED_DAYS)
+        cache_key = f"{'; '.join(searches)}; fields={','.join(fields.search_fields(self._custom_fields))}" \
+                    f"; expand={fields.expand}"
+        cached_issues = self._resolved_shards.issues(cache_key) if settled else None
+        if cached_issues is not None:
+            issues = [self._issue_resource(raw_issue) for raw_issue in cached_issues]
+        else:
+            issues = [issue for search in searches for issue in self.query_jql_raw(search, fields)]
+            if len(searches) > 1:
+                issues.sort(key=lambda issue: dateutil.parser.isoparse(issue.fields.resolutiondate))
+            if settled:
+                self._resolved_shards.store(cache_key, [issue.raw for issue in issues])
+        if date_range == (month_start, month_end):
+            return issues
+        from_time, to_time = _local_midnight(date_range[0]), _local_midnight(date_range[1])
+        return [
+            issue for issue in issues
+            if from_time <= dateutil.parser.isoparse(issue.fields.resolutiondate) < to_time
+        ]
 
-    def query_working_issues(self) -> List[JiraIssue]:
-        jql = f"{self._project_query} and issuetype in ('Story', 'Task', 'Bug') and \
-               status in ('In Progress', 'In Review', 'Under Test') \
-               ORDER BY created ASC"
-        return self.query_jql_issues(jql)
+    def query_issues_in_epic(self, epic_key: str, fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        store = self._fresh_issue_store()
+        if store:
+            return self._as_of_issues(self._issues_from_store(store.issues_in_epic(epic_key)))
+        return self.query_jql_issues(f"'Epic Link' = {epic_key} order by Status", fields)
+
+    def query_issues_in_epics(self, epic_keys: List[str], fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        """The child issues of all the epics, with a search for each chunk of epics"""
+        store = self._fresh_issue_store()
+        if store:
+            return self._issues_from_store(store.issues_in_epics(epic_keys))
+        issues = []
+        for keys in _chunks(epic_keys, KEY_CHUNK_SIZE):
+            issues.extend(self.stream_jql_issues(f"'Epic Link' in ({', '.join(keys)})", fields))
+        return issues
+
+    def query_epic_child_statuses(self, epic_keys: List[str]) -> Dict[str, List[str]]:
+        """The statuses of all child issues of the epics, from one search for all the epics"""
+        child_statuses: Dict[str, List[str]] = {epic_key: [] for epic_key in epic_keys}
+        store = self._fresh_issue_store()
+        if store and self._as_of:
+            for issue in self._as_of_issues(self._issues_from_store(store.issues_in_epics(epic_keys))):
+                child_statuses[issue.epic_key].append(issue.status)
+            return child_statuses
+        if store:
+            for epic_key, status in store.epic_child_statuses(epic_keys):
+                child_statuses[epic_key].append(status)
+            return child_statuses
+
+        for keys in _chunks(epic_keys, KEY_CHUNK_SIZE):
+            for issue in self.stream_jql_issues(f"'Epic Link' in ({', '.join(keys)})", CHILD_STATUS_FIELDS):
+                child_statuses[issue.epic_key].append(issue.status)
+        return child_statuses
+
+    def count_jql(self, jql: str) -> int:
+        """Count the issues matching the jql, without downloading any of them"""
+        if self._verbose:
+            print(f"counting jql: {jql}")
+        if self._is_cloud:
+            return self.approximate_issue_count(jql)
+        return self._get_json("search", params={"jql": jql, "maxResults": 0, "fields": "key"})["total"]
+
+    def count_issues_in_epic(
+        self, epic_key: str, statuses: List[str] | None = None, excluded_statuses: List[str] | None = None
+    ) -> int:
+        store = self._fresh_issue_store()
+        if store:
+            return store.count_issues_in_epic(epic_key, statuses, excluded_statuses)
+        jql = f"'Epic Link' = {epic_key}"
+        if statuses:
+            jql += f" and status in {_jql_list(statuses)}"
+        if excluded_statuses:
+            jql += f" and status not in {_jql_list(excluded_statuses)}"
+        return self.count_jql(jql)
+
+    def query_working_issues(self, fields: FieldProfile = ALL_FIELDS) -> List[JiraIssue]:
+        store = self._fresh_issue_store()
+        if store and self._as_of:
+            issues = self._issues_from_store(store.issues_of_types(WORKING_ISSUE_TYPES))
+            index = StatusIndex((issue.key, issue.transitions) for issue in issues)
+            working_keys = set(index.issues_in(IN_PROGRESS_STATES, self._as_of))
+            return [issue.as_of(self._as_of) for issue in issues if issue.key in working_keys]
+        if store:
+            return self._issues_from_store(store.working_issues(WORKING_ISSUE_TYPES, IN_PROGRESS_STATES))
+        jql = (f"{self._project_query}"
+               f" and issuetype in {_jql_list(WORKING_ISSUE_TYPES)}"
+               f" and status in {_jql_list(IN_PROGRESS_STATES)}"
+               f" ORDER BY created ASC")
+        return self.query_jql_issues(jql, fields)
 
 
 class JiraIssue(Issue):
@@ -122,38 +461,45 @@ class JiraIssue(Issue):
         self.custom_fields = custom_fields
         self._duration = None
         self._calendar_duration = None
-        self._history = None
+        self._transitions: TransitionLog | None = None
+        self._resolution_time: datetime | None = None
+        self._as_of: datetime | None = None
+
+    def as_of(self, time: datetime) -> JiraIssue:
+        """The issue as it was at the time, without any later transitions"""
+        issue = JiraIssue(self.raw_issue, self.custom_fields)
+        issue._transitions = self.transitions.until(time)
+        issue._as_of = time
+        return issue
 
     def start_time(self) -> datetime:
         return self.in_progress_time() or self.created_time()
 
     def created_time(self) -> datetime:
-        return dateutil.parser.isoparse(self.raw_issue.fields.created)
+        return self.transitions.created_time
 
     def in_progress_time(self) -> datetime | None:
-        for history in self.raw_issue.changelog.histories:
-            for item in history.items:
-                if item.field == "status":
-                    if item.toString == "In Progress":
-                        return dateutil.parser.isoparse(history.created)
-        return None
+        return self.transitions.first_transition_to(["In Progress"])
 
     def completed_time(self) -> datetime | None:
         return self.done_time() or self.resolution_time()
 
     def resolution_time(self) -> datetime | None:
-        if self.raw_issue.fields.resolutiondate:
-            return dateutil.parser.isoparse(self.raw_issue.fields.resolutiondate)
-        return None
+        if self._resolution_time is None and self.raw_issue.fields.resolutiondate:
+            self._resolution_time = dateutil.parser.isoparse(self.raw_issue.fields.resolutiondate)
+        if self._as_of and self._resolution_time and self._resolution_time > self._as_of:
+            return None
+        return self._resolution_time
 
     def done_time(self) -> datetime | None:
-        result = None
-        for history in self.raw_issue.changelog.histories:
-            for item in history.items:
-                if item.field == "status":
-                    if item.toString in ["Awaiting Demo", "Done"]:
-                        return dateutil.parser.isoparse(history.created)
-        return result
+        return self.transitions.first_transition_to(DONE_STATES)
+
+    @property
+    def transitions(self) -> TransitionLog:
+        """The status transitions of the issue, which are parsed from the changelog the first time they are needed"""
+        if self._transitions is None:
+            self._transitions = _parse_transitions(self.raw_issue)
+        return self._transitions
 
     def fix_versions(self) -> List[str]:
         versions = []
@@ -175,6 +521,8 @@ class JiraIssue(Issue):
 
     @property
     def status(self) -> str:
+        if self._as_of:
+            return self.transitions.statuses[-1]
         return self.raw_issue.fields.status.name
 
     @property
@@ -183,21 +531,47 @@ class JiraIssue(Issue):
 
     @property
     def duration(self) -> float | None:
-        if not self._duration:
+        if self._duration is None:
             self._init_durations()
         return self._duration
 
     @property
     def calendar_duration(self) -> float | None:
-        if not self._calendar_duration:
+        if self._calendar_duration is None:
             self._init_durations()
         return self._calendar_duration
 
     def _init_durations(self) -> None:
-        duration_end = self.completed_time() or datetime.now()
-        self._duration = business_days(self.start_time(), duration_end)
+        duration_end = self._duration_end()
+        self._duration = self.calendar.business_days(self.start_time(), duration_end)
         self._calendar_duration = calendar_days(self.start_time(), duration_end)
 
+    def _duration_end(self) -> datetime:
+        return self.completed_time() or self._as_of or datetime.now()
+
+    @staticmethod
+    def calculate_durations(issues: Iterable[JiraIssue]) -> None:
+        """Calculate the durations of many issues, and their time in each state, with array operations"""
+        issues = list(issues)
+        pending = [issue for issue in issues if issue._duration is None]
+        for calendar, calendar_issues in group_by_calendar(pending).items():
+            start_times = [issue.start_time() for issue in calendar_issues]
+            end_times = [issue._duration_end() for issue in calendar_issues]
+            for issue, duration, start_time, end_time in zip(
+                calendar_issues, calendar.business_days_between(start_times, end_times), start_times, end_times
+            ):
+                issue._duration = duration
+                issue._calendar_duration = calendar_days(start_time, end_time)
+        calculate_time_in_states(issues)
+
+    @property
+    def calendar(self) -> BusinessCalendar:
+        """The calendar of the assignee's team, if it has its own working days"""
+        calendars = business_calendar.calendars
+        if not calendars.person_calendars:
+            return calendars.default
+        return calendars.for_person(self.assignee)
+
     @property
     def epic_key(self) -> str:
         return self.raw_issue.raw["fields"][self.custom_fields["Epic Link"]]
@@ -224,17 +598,7 @@ class JiraIssue(Issue):
 
     @property
     def history(self) -> List[IssueState]:
-        if not self._history:
-            self._init_history()
-        return self._history
-
-    def _init_history(self) -> None:
-        self._history = []
-        self._history.append(IssueState("Selected for Development", self.created_time()))
-        for history in self.raw_issue.changelog.histories:
-            for item in history.items:
-                if item.field == "status":
-                    self._history.append(IssueState(item.toString, dateutil.parser.isoparse(history.created)))
+        return self.transitions.states
 
 
 class JiraEpic(Epic):
@@ -243,14 +607,21 @@ class JiraEpic(Epic):
         self._raw_issue = raw_issue
         self._jira = jira
         self._issue_counts = None
+        self._project_counts: ProjectIssueCounts | None = None
 
     @property
     def issue_counts(self) -> IssueCounts:
         if not self._issue_counts:
-            self._issue_counts = _load_issue_counts(self, self._jira)
+            if self._project_counts:
+                self._issue_counts = self._project_counts.issue_counts_for(self)
+            else:
+                self._issue_counts = _load_issue_counts(self, self._jira)
 
         return self._issue_counts
 
+    def count_issues_with(self, project_counts: ProjectIssueCounts) -> None:
+        self._project_counts = project_counts
+
     @property
     def epic_status(self) -> str:
         return self._raw_issue.raw["fields"][self._jira.custom_fields["Epic Status"]]["value"]
@@ -265,31 +636,89 @@ class JiraEpic(Epic):
     def labels(self) -> List[str]:
         return self._raw_issue.fields.labels
 
+    @property
+    def updated(self) -> str | None:
+        return self._raw_issue.raw["fields"].get("updated")
+
+    @property
+    def comment_count(self) -> int | None:
+        """The number of comments, if they were included when the epic was loaded"""
+        comments = self._raw_issue.raw["fields"].get("comment")
+        return comments.get("total") if isinstance(comments, dict) else None
+
+    @property
+    def rank(self) -> str:
+        return self._raw_issue.raw["fields"][self._jira.custom_fields["Rank"]]
+
     @property
     def url(self) -> str:
         return self._raw_issue.permalink()
 
 
+WORKING_ISSUE_TYPES = ["Story", "Task", "Bug"]
 IN_PROGRESS_STATES = ["In Progress", "In Review", "Under Test"]
+CHILD_STATUS_FIELDS = FieldProfile(["status", "Epic Link"])
 DONE_STATES = ["Awaiting Demo", "Done"]
 EXCLUDE_STATES = ["Closed", "Duplicate"]
 
 
+class ProjectIssueCounts:
+    """Issue counts for all the epics in a project, calculated in one pass over all their child issues"""
+
+    def __init__(self, epics: List[JiraEpic], jira: JiraServer):
+        self._epics = epics
+        self._jira = jira
+        self._issue_counts: Dict[str, IssueCounts] | None = None
+
+    def issue_counts_for(self, epic: JiraEpic) -> IssueCounts:
+        if self._issue_counts is None:
+            self._issue_counts = self._load_issue_counts()
+        return self._issue_counts[epic.key]
+
+    def _load_issue_counts(self) -> Dict[str, IssueCounts]:
+        child_statuses = self._jira.query_epic_child_statuses([epic.key for epic in self._epics])
+        issue_counts = {
+            epic.key: _issue_counts_from_statuses(epic, self._jira, child_statuses[epic.key])
+            for epic in self._epics
+        }
+        if self._jira.epic_estimates:
+            self._jira.epic_estimates.flush()
+        return issue_counts
+
+
 def _load_issue_counts(epic: JiraEpic, jira: JiraServer) -> IssueCounts:
+    """Count the issues in each state with count-only searches, rather than downloading the issues"""
+    if jira.as_of:
+        return _issue_counts_from_statuses(epic, jira, jira.query_epic_child_statuses([epic.key])[epic.key])
     estimated_count = _load_epic_estimated_issues(epic, jira)
-    all_epic_issues = jira.query_issues_in_epic(epic.key)
-    if len(all_epic_issues) == 0:
-        return IssueCounts(estimated_count, 0, 0)
+    if jira.epic_estimates:
+        jira.epic_estimates.flush()
+    actual_total_count = jira.count_issues_in_epic(epic.key, excluded_statuses=EXCLUDE_STATES)
+    if actual_total_count == 0:
+        done_count = in_progress_count = 0
+    else:
+        done_count = jira.count_issues_in_epic(epic.key, statuses=DONE_STATES)
+        in_progress_count = jira.count_issues_in_epic(epic.key, statuses=IN_PROGRESS_STATES)
 
-    countable_issues = list(
-        filter(lambda issue: issue.status not in EXCLUDE_STATES, all_epic_issues)
+    return _calculate_issue_counts(epic, estimated_count, actual_total_count, in_progress_count, done_count)
+
+
+def _issue_counts_from_statuses(epic: JiraEpic, jira: JiraServer, child_statuses: List[str]) -> IssueCounts:
+    countable_statuses = [status for status in child_statuses if status not in EXCLUDE_STATES]
+    in_progress_count = len([status for status in countable_statuses if status in IN_PROGRESS_STATES])
+    done_count = len([status for status in countable_statuses if status in DONE_STATES])
+    if jira.as_of:
+        # The estimate and epic status are only known as they are now, so only the issues are counted
+        return IssueCounts(len(countable_statuses) - in_progress_count - done_count, in_progress_count, done_count)
+    return _calculate_issue_counts(
+        epic, _load_epic_estimated_issues(epic, jira), len(countable_statuses), in_progress_count, done_count
     )
 
-    actual_total_count = len(countable_issues)
-    reported_total_count = max(estimated_count, actual_total_count)
 
-    done_count = len(_filter_by_state(countable_issues, DONE_STATES))
-    in_progress_count = len(_filter_by_state(countable_issues, IN_PROGRESS_STATES))
+def _calculate_issue_counts(
+    epic: JiraEpic, estimated_count: int, actual_total_count: int, in_progress_count: int, done_count: int
+) -> IssueCounts:
+    reported_total_count = max(estimated_count, actual_total_count)
     pending_count = reported_total_count - in_progress_count - done_count
     if epic.epic_status == "Done":
         pending_count = 0
@@ -297,26 +726,73 @@ def _load_issue_counts(epic: JiraEpic, jira: JiraServer) -> IssueCounts:
 
 
 def _load_epic_estimated_issues(epic: JiraEpic, jira: JiraServer) -> int:
+    """The estimate from the epic's comments, which are only fetched if the epic changed since it was cached"""
+    estimate_cache = jira.epic_estimates
+    if estimate_cache:
+        cached_estimate = estimate_cache.estimate(epic.key, epic.updated, epic.comment_count)
+        if cached_estimate is not None:
+            return cached_estimate
+
+    comments = jira.comments(epic.key)
     estimated_issues = 10
     issue_estimate_pattern = re.compile(r"^Expected size: (\d+)")
-    for comment in jira.comments(epic.key):
+    for comment in comments:
         match = issue_estimate_pattern.match(comment.body)
         if match:
             estimated_issues = int(match.group(1))
 
+    if estimate_cache:
+        estimate_cache.store(epic.key, epic.updated, len(comments), estimated_issues)
     return estimated_issues
 
 
-def _filter_by_state(
-    issues: List[JiraIssue], states_to_check: List[str]
-) -> List[JiraIssue]:
-    return list(filter(lambda issue: issue.status in states_to_check, issues))
+def _chunks(values: List[T], size: int) -> Iterator[List[T]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _month_ranges(from_date: str, to_date: str) -> List[Tuple[str, str]]:
+    """The range of dates split at the start of each month, as (inclusive, exclusive) pairs"""
+    start, end = date.fromisoformat(from_date[:10]), date.fromisoformat(to_date[:10])
+    date_ranges = []
+    while start < end:
+        range_end = min((start.replace(day=1) + timedelta(days=32)).replace(day=1), end)
+        date_ranges.append((str(start), str(range_end)))
+        start = range_end
+    return date_ranges
+
+
+def _month_of(jql_date: str) -> Tuple[str, str]:
+    """The first day of the month of the date, and of the month after"""
+    month_start = date.fromisoformat(jql_date[:10]).replace(day=1)
+    return str(month_start), str((month_start + timedelta(days=32)).replace(day=1))
+
+
+def _jql_list(values: List[str]) -> str:
+    return f"({', '.join(repr(value) for value in values)})"
+
+
+def _parse_transitions(raw_issue: AtlassianIssue) -> TransitionLog:
+    transitions = []
+    for history in raw_issue.changelog.histories:
+        status_items = [item for item in history.items if item.field == "status"]
+        if status_items:
+            start_time = dateutil.parser.isoparse(history.created)
+            transitions.extend((item.toString, start_time) for item in status_items)
+    return TransitionLog.create(
+        "Selected for Development", dateutil.parser.isoparse(raw_issue.fields.created), transitions
+    )
+
+
+def _local_midnight(jql_date: Any) -> datetime:
+    """The start of a jql date (such as '2022-12-16') in local time"""
+    return datetime.combine(dateutil.parser.isoparse(str(jql_date)).date(), time.min).astimezone()
 
 
-def _build_jira_args(jira_config: JiraConfig) -> Dict[str, Any]:
+def _build_jira_args(jira_config: JiraConfig, validate: bool = True) -> Dict[str, Any]:
     jira_args = {
         "options": {"server": jira_config.url},
-        "validate": True,
+        "validate": validate,
     }
     env = _load_env()
     if "jiraToken" in env:
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class JsonFileCache:
+    """A small dictionary kept in a JSON file, which is replaced atomically when saved"""
+
+    def __init__(self, path: Path):
+        self._path = path
+        self.data: Dict[str, Any] = self._load()
+
+    @classmethod
+    def for_server(cls, cache_dir: str, server_url: str, name: str) -> JsonFileCache:
+        """A cache file that is separate for each Jira server"""
+        return cls(Path(cache_dir) / f"{name}-{_server_id(server_url)}.json")
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with self._path.open("r", encoding="UTF8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A missing or corrupt cache is simply empty
+            return {}
+
+    def save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}")
+        try:
+            with os.fdopen(fd, "w", encoding="UTF8") as f:
+                json.dump(self.data, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class EpicEstimateCache:
+    """Estimated epic sizes parsed from epic comments, remembered until the epic is next updated
+
+    Each estimate is stored with the epic's `updated` timestamp and the number of
+    comments it was parsed from. Adding or editing a comment changes the epic's
+    `updated` timestamp, so a matching timestamp means the comments are unchanged.
+    New estimates are kept in memory until the cache is flushed.
+    """
+
+    def __init__(self, cache: JsonFileCache):
+        self._cache = cache
+        self._unsaved = False
+
+    @classmethod
+    def open(cls, cache_dir: str, server_url: str) -> EpicEstimateCache:
+        return cls(JsonFileCache.for_server(cache_dir, server_url, "epic_estimates"))
+
+    def estimate(self, epic_key: str, updated: str | None, comment_count: int | None = None) -> int | None:
+        """The cached estimate for the epic, or None if the epic has changed since it was cached"""
+        entry = self._cache.data.get(epic_key)
+        if not entry or not updated or entry["updated"] != updated:
+            return None
+        if comment_count is not None and entry["comment_count"] != comment_count:
+            return None
+        return entry["estimate"]
+
+    def store(self, epic_key: str, updated: str | None, comment_count: int, estimate: int) -> None:
+        if not updated:
+            return
+        self._cache.data[epic_key] = {"updated": updated, "comment_count": comment_count, "estimate": estimate}
+        self._unsaved = True
+
+    def flush(self) -> None:
+        """Save the estimates stored since the last flush, if there are any"""
+        if self._unsaved:
+            self._cache.save()
+            self._unsaved = False
+
+
+class ServerMetadataCache:
+    """Server information and field ids for a Jira server, which are reused until they expire
+
+    While the cache is warm, a server connection can be set up without any requests:
+    the server information, the ids of fields by name, and the JQL clause names of
+    fields (used by the jira library to translate field names in searches) are all
+    available locally.
+    """
+
+    def __init__(self, cache: JsonFileCache, max_age: timedelta):
+        self._cache = cache
+        self._max_age = max_age
+
+    @classmethod
+    def open(cls, cache_dir: str, server_url: str, max_age: timedelta) -> ServerMetadataCache:
+        return cls(JsonFileCache.for_server(cache_dir, server_url, "server_metadata"), max_age)
+
+    @property
+    def is_warm(self) -> bool:
+        cached_at = self._cache.data.get("cached_at")
+        if not cached_at:
+            return False
+        return datetime.now(timezone.utc) - datetime.fromisoformat(cached_at) < self._max_age
+
+    @property
+    def server_info(self) -> Dict[str, Any]:
+        return self._cache.data["server_info"]
+
+    @property
+    def field_ids(self) -> Dict[str, str]:
+        """Field ids by field name"""
+        return self._cache.data["field_ids"]
+
+    @property
+    def field_clauses(self) -> Dict[str, str]:
+        """Field ids by JQL clause name"""
+        return self._cache.data["field_clauses"]
+
+    def update(self, server_info: Dict[str, Any], all_fields: List[Dict[str, Any]]) -> None:
+        self._cache.data = {
+            "cached_at": datetime.now(timezone.utc).isoformat(),
+            "server_info": server_info,
+            "field_ids": {field["name"]: field["id"] for field in all_fields},
+            "field_clauses": {
+                clause_name: field["id"] for field in all_fields for clause_name in field.get("clauseNames", [])
+            },
+        }
+        self._cache.save()
+
+
+class ResolvedShardCache:
+    """The raw issues found by searches for issues resolved in past date ranges, kept for good
+
+    Once a date range is over, the issues resolved in it no longer change, so each
+    search is only sent to the server once. Every search is kept in its own file,
+    named by a hash of the search, so only the searches a report needs are read.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self._cache_dir = cache_dir
+
+    @classmethod
+    def open(cls, cache_dir: str, server_url: str) -> ResolvedShardCache:
+        return cls(Path(cache_dir) / f"resolved-{_server_id(server_url)}")
+
+    def issues(self, search: str) -> List[Dict[str, Any]] | None:
+        """The raw issues found by the search, or None if it has not been cached"""
+        cache = self._cache_file(search)
+        return cache.data["issues"] if cache.data.get("search") == search else None
+
+    def store(self, search: str, raw_issues: List[Dict[str, Any]]) -> None:
+        cache = self._cache_file(search)
+        cache.data = {"search": search, "issues": raw_issues}
+        cache.save()
+
+    def _cache_file(self, search: str) -> JsonFileCache:
+        return JsonFileCache(self._cache_dir / f"{hashlib.sha1(search.encode('UTF8')).hexdigest()}.json")
+
+
+def _server_id(server_url: str) -> str:
+    return hashlib.sha1(server_url.encode("UTF8")).hexdigest()[:12]
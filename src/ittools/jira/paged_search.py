@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Generic, Iterator, TypeVar
+
+from jira.client import ResultList
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+
+# Fetches the page of results starting at an index, with a maximum page size
+PageFetcher = Callable[[int, int], ResultList[T]]
+
+
+class PagedSearch(Generic[T]):
+    """Streams all results of a paginated search
+
+    The first page is fetched on its own to find the total number of results and
+    the page size the server is prepared to return. The remaining pages are then
+    fetched concurrently by a bounded pool of workers. Results are yielded in
+    order as soon as the page holding them has arrived, while later pages are
+    still in flight.
+    """
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher[T],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._max_workers = max_workers
+
+    def __iter__(self) -> Iterator[T]:
+        first_page = self._fetch_page(0, self._page_size)
+        yield from first_page
+
+        # The server may grant a smaller page than requested
+        page_size = first_page.maxResults or len(first_page)
+        if not page_size or len(first_page) >= first_page.total:
+            return
+
+        yield from self._remaining_pages(range(page_size, first_page.total, page_size), page_size)
+
+    def _remaining_pages(self, page_starts: range, page_size: int) -> Iterator[T]:
+        # Only a few pages are buffered ahead of the consumer, so memory stays bounded
+        max_in_flight = 2 * self._max_workers
+        in_flight: Deque[Future[ResultList[T]]] = deque()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            try:
+                for start_at in page_starts:
+                    in_flight.append(pool.submit(self._fetch_page, start_at, page_size))
+                    if len(in_flight) >= max_in_flight:
+                        yield from in_flight.popleft().result()
+                while in_flight:
+                    yield from in_flight.popleft().result()
+            finally:
+                # The consumer may stop early: don't fetch pages nobody will read
+                for future in in_flight:
+                    future.cancel()
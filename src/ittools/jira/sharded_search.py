@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Generic, Iterable, Iterator, List, TypeVar
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class ShardedSearch(Generic[S, T]):
+    """Streams the results of a search that is split into shards, such as date ranges
+
+    Each shard is a separate search, so the shards are fetched concurrently by a
+    bounded pool of workers. Results are yielded in shard order, as soon as the
+    shard holding them has arrived, while later shards are still in flight.
+    """
+
+    def __init__(
+        self,
+        fetch_shard: Callable[[S], List[T]],
+        shards: Iterable[S],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self._fetch_shard = fetch_shard
+        self._shards = list(shards)
+        self._max_workers = max_workers
+
+    def __iter__(self) -> Iterator[T]:
+        if len(self._shards) == 1:
+            yield from self._fetch_shard(self._shards[0])
+            return
+
+        # Only a few shards are buffered ahead of the consumer, so memory stays bounded
+        max_in_flight = 2 * self._max_workers
+        in_flight: Deque[Future[List[T]]] = deque()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            try:
+                for shard in self._shards:
+                    in_flight.append(pool.submit(self._fetch_shard, shard))
+                    if len(in_flight) >= max_in_flight:
+                        yield from in_flight.popleft().result()
+                while in_flight:
+                    yield from in_flight.popleft().result()
+            finally:
+                # The consumer may stop early: don't fetch shards nobody will read
+                for future in in_flight:
+                    future.cancel()
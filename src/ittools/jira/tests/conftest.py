@@ -0,0 +1,49 @@
+from typing import Any, Callable
+
+import pytest
+
+from ittools.jira.jira_ext import JiraServer
+from ittools.jira.local_cache import EpicEstimateCache, ResolvedShardCache
+
+SERVER_URL = "https://jira.example.com"
+CUSTOM_FIELDS = {
+    "Epic Link": "epic_link_field_id",
+    "Epic Status": "epic_status_field_id",
+    "Rank": "rank_field_id",
+}
+
+
+@pytest.fixture
+def unconnected_server(tmp_path) -> Callable[[str, Callable[..., Any]], JiraServer]:
+    """Makes JiraServers for the DS project that record searches instead of sending them to a server
+
+    The servers are set up as the constructor sets up a server without an issue store,
+    with their caches in the test's temporary directory (so servers made in the same
+    test share them). The named search method is replaced by the fake search, which is
+    called with the same arguments once the search has been added to `server.searches`.
+    """
+
+    def make_server(search_method: str, fake_search: Callable[..., Any]) -> JiraServer:
+        server = JiraServer.__new__(JiraServer)
+        server._options = {}
+        server._session = None
+        server._verbose = False
+        server._custom_fields = dict(CUSTOM_FIELDS)
+        server._project_query = "project IN (DS)"
+        server._project_scope = "DS"
+        server._issue_store = None
+        server._epics = {}
+        server._issues = {}
+        server._epic_estimates = EpicEstimateCache.open(str(tmp_path), SERVER_URL)
+        server._resolved_shards = ResolvedShardCache.open(str(tmp_path), SERVER_URL)
+        server._as_of = None
+        server.searches = []
+
+        def search(jql: str, *args: Any, **kwargs: Any) -> Any:
+            server.searches.append(jql)
+            return fake_search(jql, *args, **kwargs)
+
+        setattr(server, search_method, search)
+        return server
+
+    return make_server
@@ -7,7 +7,8 @@ from jira import Issue
 from jira.resources import Comment
 
 from ittools.domain.issue_counts import IssueCounts
-from ittools.jira.jira_ext import JiraEpic, JiraIssue, JiraServer
+from ittools.jira.jira_ext import JiraEpic, JiraIssue, JiraServer, ProjectIssueCounts
+from ittools.jira.local_cache import EpicEstimateCache, JsonFileCache
 
 
 def assert_equal_counts(actual: IssueCounts, expected: IssueCounts):
@@ -97,6 +98,11 @@ def test_epic_closed_duplicate_stories_are_ignored():
     assert_equal_counts(epic.issue_counts, IssueCounts(3, 0, 0))
 
 
+def test_epic_in_done_state_with_no_children_has_nothing_pending():
+    epic = JiraEpic(mock_raw_epic("Done"), mock_jira_server([], [mock_comment("Expected size: 2")]))
+    assert_equal_counts(epic.issue_counts, IssueCounts(0, 0, 0))
+
+
 def test_epic_in_done_state_will_ignore_estimate():
     epic = JiraEpic(
         mock_raw_epic("Done"),
@@ -105,14 +111,75 @@ def test_epic_in_done_state_will_ignore_estimate():
     assert_equal_counts(epic.issue_counts, IssueCounts(0, 0, 1))
 
 
-def mock_raw_epic(status="To Do") -> Issue:
+def test_project_counts_all_epics_from_one_search():
+    jira = mock_jira_server([], [mock_comment("Expected size: 3")])
+    jira.query_epic_child_statuses.return_value = {
+        "EPIC-1": ["Done", "In Progress", "Closed", "Backlog"],
+        "EPIC-2": [],
+    }
+    epics = [JiraEpic(mock_raw_epic(key="EPIC-1"), jira), JiraEpic(mock_raw_epic(key="EPIC-2"), jira)]
+    project_counts = ProjectIssueCounts(epics, jira)
+    for epic in epics:
+        epic.count_issues_with(project_counts)
+
+    assert_equal_counts(epics[0].issue_counts, IssueCounts(1, 1, 1))
+    assert_equal_counts(epics[1].issue_counts, IssueCounts(3, 0, 0))
+    jira.query_epic_child_statuses.assert_called_once_with(["EPIC-1", "EPIC-2"])
+    jira.count_issues_in_epic.assert_not_called()
+
+
+def test_cached_estimate_is_used_while_epic_is_unchanged(tmp_path):
+    jira = mock_jira_server([], [mock_comment("Expected size: 5")])
+    jira.epic_estimates = EpicEstimateCache.open(str(tmp_path), "https://jira.example.com")
+    JiraEpic(mock_raw_epic(updated="2023-10-01T10:00:00.000+1100"), jira).issue_counts
+    jira.comments.return_value = [mock_comment("Expected size: 7")]
+    jira.epic_estimates = EpicEstimateCache.open(str(tmp_path), "https://jira.example.com")
+
+    epic = JiraEpic(mock_raw_epic(updated="2023-10-01T10:00:00.000+1100"), jira)
+
+    assert_equal_counts(epic.issue_counts, IssueCounts(5, 0, 0))
+    jira.comments.assert_called_once()
+
+
+def test_estimate_is_reloaded_when_epic_is_updated(tmp_path):
+    jira = mock_jira_server([], [mock_comment("Expected size: 5")])
+    jira.epic_estimates = EpicEstimateCache.open(str(tmp_path), "https://jira.example.com")
+    JiraEpic(mock_raw_epic(updated="2023-10-01T10:00:00.000+1100"), jira).issue_counts
+    jira.comments.return_value = [mock_comment("Expected size: 5"), mock_comment("Expected size: 7")]
+
+    epic = JiraEpic(mock_raw_epic(updated="2023-10-02T10:00:00.000+1100"), jira)
+
+    assert_equal_counts(epic.issue_counts, IssueCounts(7, 0, 0))
+
+
+def test_project_estimates_are_saved_once_all_epics_are_counted(tmp_path, monkeypatch):
+    jira = mock_jira_server([], [mock_comment("Expected size: 3")])
+    jira.epic_estimates = EpicEstimateCache.open(str(tmp_path), "https://jira.example.com")
+    saves = Mock(wraps=JsonFileCache.save)
+    monkeypatch.setattr(JsonFileCache, "save", lambda cache: saves(cache))
+    epic_keys = [f"EPIC-{number}" for number in range(20)]
+    jira.query_epic_child_statuses.return_value = {key: [] for key in epic_keys}
+    updated = "2023-10-01T10:00:00.000+1100"
+    epics = [JiraEpic(mock_raw_epic(key=key, updated=updated), jira) for key in epic_keys]
+    project_counts = ProjectIssueCounts(epics, jira)
+    for epic in epics:
+        epic.count_issues_with(project_counts)
+
+    assert_equal_counts(epics[0].issue_counts, IssueCounts(3, 0, 0))
+
+    assert saves.call_count == 1
+    saved_estimates = EpicEstimateCache.open(str(tmp_path), "https://jira.example.com")
+    assert [saved_estimates.estimate(key, updated) for key in epic_keys] == [3] * len(epic_keys)
+
+
+def mock_raw_epic(status="To Do", key="dummy-key", updated=None) -> Issue:
     epic = Mock()
-    epic.key = "dummy-key"
+    epic.key = key
     epic.changelog.histories = []
     epic.epic_status = status
     epic.fields.created = datetime.datetime.now(tz=pytz.UTC).isoformat()
     epic.fields.resolutiondate = None
-    epic.raw = {"fields": {"epic_status_field_id": {"value": status}}}
+    epic.raw = {"fields": {"epic_status_field_id": {"value": status}, "updated": updated}}
     return epic
 
 
@@ -120,13 +187,21 @@ def mock_jira_server(
     issues: List[JiraIssue] = (), comments: List[Comment] = ()
 ) -> JiraServer:
     jira = Mock(spec=JiraServer)
+    jira.as_of = None
     jira.custom_fields = {
         "Epic Link": "epic_link_field_id",
         "Epic Status": "epic_status_field_id",
         "Rank": "rank_field_id",
     }
-    jira.query_issues_in_epic.return_value = list(issues)
+    jira.count_issues_in_epic.side_effect = lambda epic_key, statuses=None, excluded_statuses=None: len(
+        [
+            issue for issue in issues
+            if (not statuses or issue.status in statuses)
+            and (not excluded_statuses or issue.status not in excluded_statuses)
+        ]
+    )
     jira.comments.return_value = list(comments)
+    jira.epic_estimates = None
     return jira
 
 
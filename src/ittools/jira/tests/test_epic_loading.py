@@ -0,0 +1,53 @@
+from typing import List
+from unittest.mock import Mock
+
+from ittools.jira import jira_ext
+from ittools.jira.jira_ext import JiraEpic
+
+
+def test_epics_are_loaded_with_one_search(unconnected_server):
+    server = unconnected_server("stream_jql_epics", epics_with_keys)
+
+    epics = server.jira_epics(["DS-2", "DS-1", None, "DS-2"])
+
+    assert sorted(epics) == ["DS-1", "DS-2"]
+    assert server.searches == ["key in (DS-1, DS-2)"]
+
+
+def test_epics_are_loaded_in_chunks(monkeypatch, unconnected_server):
+    monkeypatch.setattr(jira_ext, "KEY_CHUNK_SIZE", 2)
+    server = unconnected_server("stream_jql_epics", epics_with_keys)
+
+    epics = server.jira_epics(["DS-1", "DS-2", "DS-3"])
+
+    assert sorted(epics) == ["DS-1", "DS-2", "DS-3"]
+    assert server.searches == ["key in (DS-1, DS-2)", "key in (DS-3)"]
+
+
+def test_epics_are_only_loaded_once(unconnected_server):
+    server = unconnected_server("stream_jql_epics", epics_with_keys)
+    server.jira_epics(["DS-1", "DS-2"])
+
+    epics = server.jira_epics(["DS-2", "DS-3"])
+
+    assert sorted(epics) == ["DS-2", "DS-3"]
+    assert server.searches == ["key in (DS-1, DS-2)", "key in (DS-3)"]
+
+
+def test_single_epic_is_shared_with_bulk_loading(unconnected_server):
+    server = unconnected_server("stream_jql_epics", epics_with_keys)
+    server.jira_epics(["DS-1"])
+
+    assert server.jira_epic("DS-1").key == "DS-1"
+    assert server.searches == ["key in (DS-1)"]
+
+
+def epics_with_keys(jql: str) -> List[JiraEpic]:
+    """The epics found by a search for keys"""
+    return [mock_epic(key) for key in jql[len("key in ("):-1].split(", ")]
+
+
+def mock_epic(key: str) -> JiraEpic:
+    epic = Mock(spec=JiraEpic)
+    epic.key = key
+    return epic
@@ -0,0 +1,39 @@
+from ittools.jira.field_profile import FieldProfile
+
+CUSTOM_FIELDS = {
+    "Epic Link": "epic_link_field_id",
+    "Epic Status": "epic_status_field_id",
+    "Rank": "rank_field_id",
+}
+
+
+def test_search_fields_always_include_summary():
+    assert FieldProfile(["status"]).search_fields(CUSTOM_FIELDS) == ["summary", "status"]
+
+
+def test_custom_field_names_are_translated_to_ids():
+    profile = FieldProfile(["status", "Epic Link", "Rank"])
+
+    assert profile.search_fields(CUSTOM_FIELDS) == ["summary", "status", "epic_link_field_id", "rank_field_id"]
+
+
+def test_changelog_is_only_expanded_when_needed():
+    assert FieldProfile(["status"]).expand is None
+    assert FieldProfile(["status"], changelog=True).expand == "changelog"
+
+
+def test_profiles_can_be_combined():
+    combined = FieldProfile(["status", "assignee"]) | FieldProfile(["created", "status"], changelog=True)
+
+    assert combined == FieldProfile(["status", "assignee", "created"], changelog=True)
+    assert combined.fields == ["status", "assignee", "created"]
+
+
+def test_profile_covers_profiles_with_fewer_fields():
+    profile = FieldProfile(["status", "assignee"], changelog=True)
+
+    assert profile.covers(FieldProfile(["status"]))
+    assert profile.covers(FieldProfile(["assignee", "status"], changelog=True))
+    assert not profile.covers(FieldProfile(["status", "created"]))
+    assert not FieldProfile(["status"]).covers(FieldProfile(["status"], changelog=True))
+    assert FieldProfile(["*all"], changelog=True).covers(profile)
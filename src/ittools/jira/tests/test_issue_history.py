@@ -46,6 +46,83 @@ def test_time_in_status():
     assert story.time_in_state("Done") == 0.0
 
 
+def test_in_progress_and_done_times_from_story_history():
+    created_time = "2023-10-12T09:00:00.000+1100"
+    in_progress = mock_history_item("2023-10-12T11:00:00.000+1100", "C D", "Selected for Development", "In Progress")
+    in_review = mock_history_item("2023-10-12T13:00:00.000+1100", "D E", "In Progress", "In Review")
+    demo = mock_history_item("2023-10-13T10:00:00.000+1100", "E F", "In Review", "Awaiting Demo")
+    done = mock_history_item("2023-10-16T10:00:00.000+1100", "F G", "Awaiting Demo", "Done")
+    story = JiraIssue(mock_story(created_time, [in_progress, in_review, demo, done]), {})
+
+    assert story.created_time() == isoparse(created_time)
+    assert story.in_progress_time() == isoparse(in_progress.created)
+    assert story.done_time() == isoparse(demo.created)
+
+
+def test_time_in_repeated_status_is_totalled():
+    created_time = "2023-10-12T09:00:00.000+1100"
+    in_progress = mock_history_item("2023-10-12T10:00:00.000+1100", "C D", "Selected for Development", "In Progress")
+    in_review = mock_history_item("2023-10-12T11:00:00.000+1100", "D E", "In Progress", "In Review")
+    reworked = mock_history_item("2023-10-12T12:00:00.000+1100", "E D", "In Review", "In Progress")
+    done = mock_history_item("2023-10-12T14:00:00.000+1100", "D G", "In Progress", "Done")
+    story = JiraIssue(mock_story(created_time, [in_progress, in_review, reworked, done]), {})
+
+    assert story.time_in_state("In Progress") == 3.0 / 8.0
+    assert story.time_in_state("Closed") == 0.0
+
+
+def test_changelog_is_only_parsed_once():
+    created_time = "2023-10-12T09:00:00.000+1100"
+    in_progress = mock_history_item("2023-10-12T11:00:00.000+1100", "C D", "Selected for Development", "In Progress")
+    raw_story = mock_story(created_time, [in_progress])
+    story = JiraIssue(raw_story, {})
+
+    assert story.in_progress_time() == isoparse(in_progress.created)
+    raw_story.changelog.histories = []
+
+    assert story.in_progress_time() == isoparse(in_progress.created)
+    assert len(story.history) == 2
+
+
+def test_durations_calculated_together_match_individual_durations():
+    created_time = "2023-10-12T09:00:00.000+1100"
+    in_progress = mock_history_item("2023-10-12T10:00:00.000+1100", "C D", "Selected for Development", "In Progress")
+    in_review = mock_history_item("2023-10-13T11:30:00.000+1100", "D E", "In Progress", "In Review")
+    done = mock_history_item("2023-10-16T14:00:00.000+1100", "E F", "In Review", "Done")
+    other_done = mock_history_item("2023-10-18T16:00:00.000+1100", "C F", "Selected for Development", "Done")
+    stories = [
+        mock_story(created_time, [in_progress, in_review, done]),
+        mock_story(created_time, [other_done]),
+    ]
+    individual = [JiraIssue(story, {}) for story in stories]
+    together = [JiraIssue(story, {}) for story in stories]
+
+    JiraIssue.calculate_durations(together)
+
+    for expected, issue in zip(individual, together):
+        assert issue.duration == expected.duration
+        assert issue.calendar_duration == expected.calendar_duration
+        for state in ["Selected for Development", "In Progress", "In Review", "Done"]:
+            assert issue.time_in_state(state) == expected.time_in_state(state)
+
+
+def test_issue_as_of_a_past_time():
+    created_time = "2023-10-12T09:00:00.000+1100"
+    in_progress = mock_history_item("2023-10-12T11:00:00.000+1100", "C D", "Selected for Development", "In Progress")
+    done = mock_history_item("2023-10-16T10:00:00.000+1100", "D E", "In Progress", "Done")
+    raw_story = mock_story(created_time, [in_progress, done])
+    raw_story.fields.status.name = "Done"
+    raw_story.fields.resolutiondate = done.created
+
+    story = JiraIssue(raw_story, {}).as_of(isoparse("2023-10-13T17:00:00.000+1100"))
+
+    assert story.status == "In Progress"
+    assert story.done_time() is None
+    assert story.completed_time() is None
+    assert story.duration == 1.75  # 11am on the 12th -> 5pm on the 13th
+    assert JiraIssue(raw_story, {}).status == "Done"
+
+
 def mock_history_item(time: str, author: str, old_state: str | None, new_state: str) -> object:
     status_item = Mock()
     status_item.field = "status"
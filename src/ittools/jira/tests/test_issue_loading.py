@@ -0,0 +1,76 @@
+from functools import partial
+from typing import Dict, List
+from unittest.mock import Mock
+
+from ittools.jira import jira_ext
+from ittools.jira.field_profile import ALL_FIELDS, FieldProfile
+from ittools.jira.jira_ext import JiraIssue
+
+SUMMARY_FIELDS = FieldProfile(["status"])
+
+
+def test_issues_are_returned_in_key_order(unconnected_server):
+    server = unconnected_server("query_jql_issues", issues_with_keys)
+
+    issues = server.query_issue_keys(["DS-3", "DS-1", "DS-2", "DS-1"])
+
+    assert [issue.key for issue in issues] == ["DS-3", "DS-1", "DS-2"]
+    assert server.searches == ["key in (DS-3, DS-1, DS-2)"]
+
+
+def test_keys_are_searched_in_chunks(monkeypatch, unconnected_server):
+    monkeypatch.setattr(jira_ext, "KEY_CHUNK_SIZE", 2)
+    server = unconnected_server("query_jql_issues", issues_with_keys)
+
+    issues = server.query_issue_keys(["DS-5", "DS-4", "DS-3", "DS-2", "DS-1"])
+
+    assert [issue.key for issue in issues] == ["DS-5", "DS-4", "DS-3", "DS-2", "DS-1"]
+    assert sorted(server.searches) == ["key in (DS-1)", "key in (DS-3, DS-2)", "key in (DS-5, DS-4)"]
+
+
+def test_loaded_issues_are_not_requested_again(unconnected_server):
+    server = unconnected_server("query_jql_issues", issues_with_keys)
+    server.query_issue_keys(["DS-1", "DS-2"], ALL_FIELDS)
+
+    issues = server.query_issue_keys(["DS-2", "DS-3"], SUMMARY_FIELDS)
+
+    assert [issue.key for issue in issues] == ["DS-2", "DS-3"]
+    assert server.searches == ["key in (DS-1, DS-2)", "key in (DS-3)"]
+
+
+def test_issues_loaded_with_fewer_fields_are_requested_again(unconnected_server):
+    server = unconnected_server("query_jql_issues", issues_with_keys)
+    server.query_issue_keys(["DS-1"], SUMMARY_FIELDS)
+
+    server.query_issue_keys(["DS-1"], ALL_FIELDS)
+
+    assert server.searches == ["key in (DS-1)", "key in (DS-1)"]
+
+
+def test_forgotten_issues_are_requested_again(unconnected_server):
+    server = unconnected_server("query_jql_issues", issues_with_keys)
+    server.query_issue_keys(["DS-1"])
+    server.forget_issues()
+
+    server.query_issue_keys(["DS-1"])
+
+    assert server.searches == ["key in (DS-1)", "key in (DS-1)"]
+
+
+def test_moved_issues_follow_the_others(unconnected_server):
+    server = unconnected_server("query_jql_issues", partial(issues_with_keys, moved_keys={"DS-1": "NEW-1"}))
+
+    issues = server.query_issue_keys(["DS-1", "DS-2"])
+
+    assert [issue.key for issue in issues] == ["DS-2", "NEW-1"]
+
+
+def issues_with_keys(jql: str, fields: FieldProfile, moved_keys: Dict[str, str] | None = None) -> List[JiraIssue]:
+    """The issues found by a search for keys, some of which may have moved to new keys"""
+    return [mock_issue((moved_keys or {}).get(key, key)) for key in jql[len("key in ("):-1].split(", ")]
+
+
+def mock_issue(key: str) -> JiraIssue:
+    issue = Mock(spec=JiraIssue)
+    issue.key = key
+    return issue
@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from ittools.jira.issue_store import IssueStore
+
+CUSTOM_FIELDS = {
+    "Epic Link": "epic_link_field_id",
+    "Epic Status": "epic_status_field_id",
+    "Rank": "rank_field_id",
+}
+SCOPE = "DS"
+SYNC_TIME = datetime(2023, 10, 20, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path) -> IssueStore:
+    issue_store = IssueStore.open(str(tmp_path))
+    yield issue_store
+    issue_store.close()
+
+
+def test_new_store_has_never_synced(store):
+    assert store.last_synced(SCOPE) is None
+    assert not store.is_fresh(SCOPE, timedelta(minutes=5))
+
+
+def test_store_records_sync_time(store):
+    store.store_issues(SCOPE, [], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert store.last_synced(SCOPE) == SYNC_TIME
+
+
+def test_recent_sync_is_fresh(store):
+    store.store_issues(SCOPE, [], CUSTOM_FIELDS, datetime.now(timezone.utc))
+
+    assert store.is_fresh(SCOPE, timedelta(minutes=5))
+
+
+def test_issues_are_replaced_when_synced_again(store):
+    store.store_issues(SCOPE, [raw_issue("DS-1", status="In Progress")], CUSTOM_FIELDS, SYNC_TIME)
+    store.store_issues(SCOPE, [raw_issue("DS-1", status="Done")], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert store.issue("DS-1")["fields"]["status"]["name"] == "Done"
+    assert store.issue("DS-2") is None
+
+
+def test_working_issues(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", status="In Progress", created="2023-10-02T10:00:00.000+1100"),
+        raw_issue("DS-2", status="Backlog"),
+        raw_issue("DS-3", status="In Review", created="2023-10-01T10:00:00.000+1100"),
+        raw_issue("DS-4", status="In Progress", issue_type="Epic"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    issues = store.working_issues(["Story", "Task", "Bug"], ["In Progress", "In Review", "Under Test"])
+
+    assert keys(issues) == ["DS-3", "DS-1"]
+
+
+def test_issues_of_types_in_any_status(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", status="Done", created="2023-10-02T10:00:00.000+1100"),
+        raw_issue("DS-2", status="Backlog", created="2023-10-01T10:00:00.000+1100"),
+        raw_issue("DS-3", status="In Progress", issue_type="Epic"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.issues_of_types(["Story", "Task", "Bug"])) == ["DS-2", "DS-1"]
+
+
+def test_resolved_issues_in_date_range(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", status="Done", epic_key="DS-100", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-2", status="Done", epic_key="DS-100", resolved="2023-10-01T10:00:00.000+1100"),
+        raw_issue("DS-3", status="Done", epic_key="DS-100", resolved="2023-10-20T10:00:00.000+1100"),
+        raw_issue("DS-4", status="Done", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-5", status="Closed", epic_key="DS-100", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-6", status="Awaiting Demo", epic_key="DS-100", resolved="2023-10-05T10:00:00.000+1100"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    issues = store.resolved_issues(
+        ["Done", "Awaiting Demo"],
+        datetime(2023, 10, 2, tzinfo=timezone.utc),
+        datetime(2023, 10, 15, tzinfo=timezone.utc),
+    )
+
+    assert keys(issues) == ["DS-6", "DS-1"]
+
+
+def test_resolved_issues_of_assignees_and_epics(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", status="Done", epic_key="DS-100", assignee="Ann Lee", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-2", status="Done", epic_key="DS-100", assignee="Bob Ray", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-3", status="Done", epic_key="DS-200", assignee="Ann Lee", resolved="2023-10-10T10:00:00.000+1100"),
+        raw_issue("DS-4", status="Done", epic_key="DS-100", resolved="2023-10-10T10:00:00.000+1100"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+    from_time, to_time = datetime(2023, 10, 2, tzinfo=timezone.utc), datetime(2023, 10, 15, tzinfo=timezone.utc)
+
+    assert keys(store.resolved_issues(["Done"], from_time, to_time, assignees=["Ann Lee"])) == ["DS-1", "DS-3"]
+    assert keys(store.resolved_issues(["Done"], from_time, to_time, epic_keys=["DS-100"])) == ["DS-1", "DS-2", "DS-4"]
+    assert keys(store.resolved_issues(["Done"], from_time, to_time, ["Ann Lee"], ["DS-100"])) == ["DS-1"]
+
+
+def test_issues_in_epic(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", epic_key="DS-100"),
+        raw_issue("DS-2", epic_key="DS-200"),
+        raw_issue("DS-3", epic_key="DS-100"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert sorted(keys(store.issues_in_epic("DS-100"))) == ["DS-1", "DS-3"]
+
+
+def test_issues_in_epics(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", epic_key="DS-100"),
+        raw_issue("DS-2", epic_key="DS-200"),
+        raw_issue("DS-3", epic_key="DS-300"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.issues_in_epics(["DS-100", "DS-300"])) == ["DS-1", "DS-3"]
+
+
+def test_count_issues_in_epic(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", epic_key="DS-100", status="Done"),
+        raw_issue("DS-2", epic_key="DS-100", status="In Progress"),
+        raw_issue("DS-3", epic_key="DS-100", status="Closed"),
+        raw_issue("DS-4", epic_key="DS-200", status="Done"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert store.count_issues_in_epic("DS-100") == 3
+    assert store.count_issues_in_epic("DS-100", statuses=["Done", "Awaiting Demo"]) == 1
+    assert store.count_issues_in_epic("DS-100", excluded_statuses=["Closed", "Duplicate"]) == 2
+
+
+def test_epic_child_statuses(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", epic_key="DS-100", status="Done"),
+        raw_issue("DS-2", epic_key="DS-200", status="In Progress"),
+        raw_issue("DS-3", epic_key="DS-300", status="Closed"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    statuses = store.epic_child_statuses(["DS-100", "DS-200"])
+
+    assert sorted(statuses) == [("DS-100", "Done"), ("DS-200", "In Progress")]
+
+
+def test_epics_with_label_in_rank_order(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", issue_type="Epic", labels=["Project1"], rank="0|b"),
+        raw_issue("DS-2", issue_type="Epic", labels=["Project11"], rank="0|c"),
+        raw_issue("DS-3", issue_type="Epic", labels=["Other", "Project1"], rank="0|a"),
+        raw_issue("DS-4", labels=["Project1"]),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.epics_with_label("Project1")) == ["DS-3", "DS-1"]
+
+
+def test_open_epics(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", issue_type="Epic", epic_status="To Do"),
+        raw_issue("DS-2", issue_type="Epic", epic_status="Done"),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.open_epics()) == ["DS-1"]
+
+
+def test_issues_with_fix_version(store):
+    store.store_issues(SCOPE, [
+        raw_issue("DS-1", fix_versions=["1.0", "1.1"]),
+        raw_issue("DS-2", fix_versions=["1.10"]),
+    ], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.issues_with_fix_version("1.1")) == ["DS-1"]
+
+
+def test_issues_with_keys(store):
+    store.store_issues(SCOPE, [raw_issue("DS-1"), raw_issue("DS-2"), raw_issue("DS-3")], CUSTOM_FIELDS, SYNC_TIME)
+
+    assert keys(store.issues_with_keys(["DS-3", "DS-1", "DS-9"])) == ["DS-1", "DS-3"]
+
+
+def test_clear_forgets_issues_and_sync_time(store):
+    store.store_issues(SCOPE, [raw_issue("DS-1")], CUSTOM_FIELDS, SYNC_TIME)
+
+    store.clear()
+
+    assert store.issue("DS-1") is None
+    assert store.last_synced(SCOPE) is None
+
+
+def test_clear_forgets_the_sync_time_of_every_scope(store):
+    store.store_issues(SCOPE, [raw_issue("DS-1")], CUSTOM_FIELDS, SYNC_TIME)
+    store.store_issues("DS,OPS", [raw_issue("OPS-1")], CUSTOM_FIELDS, SYNC_TIME)
+
+    store.clear()
+
+    assert store.last_synced("DS,OPS") is None
+    assert not store.is_fresh("DS,OPS", timedelta(days=1))
+
+
+def keys(raw_issues) -> List[str]:
+    return [raw["key"] for raw in raw_issues]
+
+
+def raw_issue(
+    key: str,
+    status: str = "Backlog",
+    issue_type: str = "Story",
+    epic_key: str | None = None,
+    epic_status: str | None = None,
+    labels: List[str] = (),
+    fix_versions: List[str] = (),
+    rank: str = "0|a",
+    created: str = "2023-10-01T10:00:00.000+1100",
+    resolved: str | None = None,
+    assignee: str | None = None,
+):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary of {key}",
+            "issuetype": {"name": issue_type},
+            "status": {"name": status},
+            "labels": list(labels),
+            "fixVersions": [{"name": version} for version in fix_versions],
+            "created": created,
+            "updated": created,
+            "resolutiondate": resolved,
+            "assignee": {"displayName": assignee} if assignee else None,
+            "epic_link_field_id": epic_key,
+            "epic_status_field_id": {"value": epic_status} if epic_status else None,
+            "rank_field_id": rank,
+        },
+        "changelog": {"histories": []},
+    }
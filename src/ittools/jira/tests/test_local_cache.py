@@ -0,0 +1,62 @@
+from ittools.jira.local_cache import EpicEstimateCache, JsonFileCache, ResolvedShardCache
+
+SERVER_URL = "https://jira.example.com"
+
+
+def test_saved_cache_can_be_reloaded(tmp_path):
+    cache = JsonFileCache.for_server(str(tmp_path), SERVER_URL, "test")
+    cache.data["key"] = "value"
+    cache.save()
+
+    assert JsonFileCache.for_server(str(tmp_path), SERVER_URL, "test").data == {"key": "value"}
+
+
+def test_caches_are_separate_for_each_server(tmp_path):
+    cache = JsonFileCache.for_server(str(tmp_path), SERVER_URL, "test")
+    cache.data["key"] = "value"
+    cache.save()
+
+    assert JsonFileCache.for_server(str(tmp_path), "https://other.example.com", "test").data == {}
+
+
+def test_corrupt_cache_is_empty(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text("{not json")
+
+    assert JsonFileCache(cache_path).data == {}
+
+
+def test_epic_estimates_are_saved_when_flushed(tmp_path):
+    estimates = EpicEstimateCache.open(str(tmp_path), SERVER_URL)
+    estimates.store("DS-1", "2023-10-01T10:00:00.000+1100", 3, 12)
+
+    assert EpicEstimateCache.open(str(tmp_path), SERVER_URL).estimate("DS-1", "2023-10-01T10:00:00.000+1100") is None
+    estimates.flush()
+    assert EpicEstimateCache.open(str(tmp_path), SERVER_URL).estimate("DS-1", "2023-10-01T10:00:00.000+1100") == 12
+
+
+def test_epic_estimate_requires_matching_update_time(tmp_path):
+    estimates = EpicEstimateCache.open(str(tmp_path), SERVER_URL)
+    estimates.store("DS-1", "2023-10-01T10:00:00.000+1100", 3, 12)
+
+    assert estimates.estimate("DS-1", "2023-10-01T10:00:00.000+1100") == 12
+    assert estimates.estimate("DS-1", "2023-10-02T10:00:00.000+1100") is None
+    assert estimates.estimate("DS-1", None) is None
+    assert estimates.estimate("DS-2", "2023-10-01T10:00:00.000+1100") is None
+
+
+def test_epic_estimate_requires_matching_comment_count_when_known(tmp_path):
+    estimates = EpicEstimateCache.open(str(tmp_path), SERVER_URL)
+    estimates.store("DS-1", "2023-10-01T10:00:00.000+1100", 3, 12)
+
+    assert estimates.estimate("DS-1", "2023-10-01T10:00:00.000+1100", 3) == 12
+    assert estimates.estimate("DS-1", "2023-10-01T10:00:00.000+1100", 4) is None
+
+
+def test_resolved_shards_are_kept_for_each_search(tmp_path):
+    shards = ResolvedShardCache.open(str(tmp_path), SERVER_URL)
+    shards.store("resolved in January", [{"key": "DS-1"}])
+
+    reopened = ResolvedShardCache.open(str(tmp_path), SERVER_URL)
+    assert reopened.issues("resolved in January") == [{"key": "DS-1"}]
+    assert reopened.issues("resolved in February") is None
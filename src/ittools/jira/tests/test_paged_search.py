@@ -0,0 +1,65 @@
+import threading
+from typing import List, Tuple
+
+from jira.client import ResultList
+
+from ittools.jira.paged_search import PagedSearch
+
+
+class FakeSearch:
+    def __init__(self, total: int, server_page_limit: int = 1000):
+        self.total = total
+        self.server_page_limit = server_page_limit
+        self.requests: List[Tuple[int, int]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, start_at: int, max_results: int) -> ResultList[int]:
+        with self._lock:
+            self.requests.append((start_at, max_results))
+        page_size = min(max_results, self.server_page_limit)
+        items = list(range(start_at, min(start_at + page_size, self.total)))
+        return ResultList(items, start_at, page_size, self.total)
+
+
+def test_single_page_is_fetched_once():
+    search = FakeSearch(total=30)
+
+    results = list(PagedSearch(search, page_size=100))
+
+    assert results == list(range(30))
+    assert search.requests == [(0, 100)]
+
+
+def test_all_pages_are_returned_in_order():
+    search = FakeSearch(total=1050)
+
+    results = list(PagedSearch(search, page_size=100, max_workers=3))
+
+    assert results == list(range(1050))
+    assert sorted(search.requests) == [(start, 100) for start in range(0, 1050, 100)]
+
+
+def test_page_size_granted_by_server_is_used_for_later_pages():
+    search = FakeSearch(total=120, server_page_limit=50)
+
+    results = list(PagedSearch(search, page_size=100))
+
+    assert results == list(range(120))
+    assert sorted(search.requests) == [(0, 100), (50, 50), (100, 50)]
+
+
+def test_empty_search():
+    search = FakeSearch(total=0)
+
+    assert list(PagedSearch(search)) == []
+
+
+def test_results_are_streamed_before_all_pages_are_requested():
+    search = FakeSearch(total=10_000)
+
+    results = iter(PagedSearch(search, page_size=100, max_workers=2))
+    first_results = [next(results) for _ in range(150)]
+    results.close()
+
+    assert first_results == list(range(150))
+    assert len(search.requests) < 100
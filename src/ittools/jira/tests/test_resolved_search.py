@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from typing import List
+
+from jira import Issue as AtlassianIssue
+
+from ittools.jira import jira_ext
+from ittools.jira.field_profile import FieldProfile
+
+FIELDS = FieldProfile(["resolutiondate"])
+
+
+def test_date_range_is_split_by_month():
+    assert jira_ext._month_ranges("2023-11-15", "2024-02-10") == [
+        ("2023-11-15", "2023-12-01"),
+        ("2023-12-01", "2024-01-01"),
+        ("2024-01-01", "2024-02-01"),
+        ("2024-02-01", "2024-02-10"),
+    ]
+
+
+def test_each_month_is_a_separate_search(unconnected_server):
+    server = unconnected_server("query_jql_raw", issues_resolved_in_month)
+
+    issues = server.query_resolved_issues("2020-01-15", "2020-03-01", FIELDS)
+
+    assert [issue.key for issue in issues] == ["DS-2020-01-20", "DS-2020-02-01", "DS-2020-02-20"]
+    assert sorted(server.searches) == [
+        "project IN (DS) and status in ('Awaiting Demo', 'Done') and resolved >= '2020-01-01' and resolved < '2020-02-01'"
+        " and 'Epic Link' is not null order by resolved",
+        "project IN (DS) and status in ('Awaiting Demo', 'Done') and resolved >= '2020-02-01' and resolved < '2020-03-01'"
+        " and 'Epic Link' is not null order by resolved",
+    ]
+
+
+def test_issues_outside_the_range_are_dropped_from_whole_months(unconnected_server):
+    server = unconnected_server("query_jql_raw", issues_resolved_in_month)
+
+    issues = server.query_resolved_issues("2020-01-02", "2020-01-20", FIELDS)
+
+    assert issues == []
+    assert len(server.searches) == 1
+
+
+def test_past_months_are_only_fetched_once(unconnected_server):
+    first_run = unconnected_server("query_jql_raw", issues_resolved_in_month)
+    first_run.query_resolved_issues("2020-01-01", "2020-03-01", FIELDS)
+    server = unconnected_server("query_jql_raw", issues_resolved_in_month)
+
+    issues = server.query_resolved_issues("2020-01-01", "2020-03-01", FIELDS)
+
+    assert [issue.key for issue in issues] == ["DS-2020-01-01", "DS-2020-01-20", "DS-2020-02-01", "DS-2020-02-20"]
+    assert server.searches == []
+
+
+def test_past_months_are_reused_by_ranges_starting_on_other_days(unconnected_server):
+    from_date, tomorrow = date.today() - timedelta(days=60), date.today() + timedelta(days=1)
+    first_run = unconnected_server("query_jql_raw", issues_resolved_in_month)
+    first_run.query_resolved_issues(str(from_date), str(tomorrow), FIELDS)
+    server = unconnected_server("query_jql_raw", issues_resolved_in_month)
+
+    server.query_resolved_issues(str(from_date + timedelta(days=1)), str(tomorrow), FIELDS)
+
+    settled_before = date.today() - timedelta(days=jira_ext.RESOLVED_SETTLED_DAYS)
+    assert sorted(server.searches) == sorted(
+        search for search in first_run.searches
+        if date.fromisoformat(search.split("resolved < '")[1][:10]) > settled_before
+    )
+    assert f"resolved >= '{date.today().replace(day=1)}'" in sorted(server.searches)[-1]
+
+
+def test_current_month_is_fetched_every_time(unconnected_server):
+    month_start, tomorrow = date.today().replace(day=1), date.today() + timedelta(days=1)
+    server = unconnected_server("query_jql_raw", issues_resolved_in_month)
+
+    server.query_resolved_issues(str(month_start), str(tomorrow), FIELDS)
+    server.query_resolved_issues(str(month_start), str(tomorrow), FIELDS)
+
+    assert len(server.searches) == 2 * len(jira_ext._month_ranges(str(month_start), str(tomorrow)))
+
+
+def issues_resolved_in_month(jql: str, fields: FieldProfile) -> List[AtlassianIssue]:
+    """The issues found by a search, resolved on the 1st and 20th of the month searched"""
+    month = jql.split("resolved >= '")[1][:7]
+    return [raw_issue(f"DS-{month}-{day}", f"{month}-{day}T10:00:00.000+0000") for day in ["01", "20"]]
+
+
+def raw_issue(key: str, resolved: str) -> AtlassianIssue:
+    return AtlassianIssue({}, None, {"key": key, "fields": {"summary": key, "resolutiondate": resolved}})
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from ittools.config import JiraConfig
+from ittools.jira.jira_ext import JiraServer
+from ittools.jira.local_cache import ServerMetadataCache
+
+SERVER_URL = "https://jira.example.com"
+SERVER_INFO = {"versionNumbers": [9, 4, 0], "deploymentType": "Server"}
+ALL_FIELDS = [
+    {"id": "summary", "name": "Summary", "clauseNames": ["summary"]},
+    {"id": "customfield_10001", "name": "Epic Link", "clauseNames": ["cf[10001]", "Epic Link"]},
+    {"id": "customfield_10002", "name": "Epic Status", "clauseNames": ["cf[10002]", "Epic Status"]},
+    {"id": "customfield_10003", "name": "Rank", "clauseNames": ["cf[10003]", "Rank"]},
+]
+
+
+@pytest.fixture
+def jira_config(tmp_path, monkeypatch) -> JiraConfig:
+    monkeypatch.setenv("jiraToken", "dummy-token")
+    return JiraConfig({"url": SERVER_URL, "project_keys": ["DS"]}, str(tmp_path))
+
+
+def test_cold_cache_is_not_warm(tmp_path):
+    assert not ServerMetadataCache.open(str(tmp_path), SERVER_URL, timedelta(hours=1)).is_warm
+
+
+def test_expired_cache_is_not_warm(tmp_path):
+    ServerMetadataCache.open(str(tmp_path), SERVER_URL, timedelta(hours=1)).update(SERVER_INFO, ALL_FIELDS)
+
+    assert ServerMetadataCache.open(str(tmp_path), SERVER_URL, timedelta(hours=1)).is_warm
+    assert not ServerMetadataCache.open(str(tmp_path), SERVER_URL, timedelta(0)).is_warm
+
+
+def test_cache_maps_field_names_and_clauses_to_ids(tmp_path):
+    metadata = ServerMetadataCache.open(str(tmp_path), SERVER_URL, timedelta(hours=1))
+    metadata.update(SERVER_INFO, ALL_FIELDS)
+
+    assert metadata.field_ids["Epic Link"] == "customfield_10001"
+    assert metadata.field_clauses["cf[10003]"] == "customfield_10003"
+    assert metadata.server_info == SERVER_INFO
+
+
+def test_server_with_warm_cache_makes_no_requests(jira_config, monkeypatch):
+    ServerMetadataCache.open(jira_config.cache_dir, SERVER_URL, timedelta(hours=1)).update(SERVER_INFO, ALL_FIELDS)
+    for method in ["session", "server_info", "fields", "_get_json"]:
+        monkeypatch.setattr(JiraServer, method, no_requests_allowed)
+
+    server = JiraServer(False, jira_config)
+
+    assert server.custom_fields == {
+        "Epic Link": "customfield_10001",
+        "Epic Status": "customfield_10002",
+        "Rank": "customfield_10003",
+    }
+    assert server._version == (9, 4, 0)
+    assert server._fields_cache["Epic Link"] == "customfield_10001"
+
+
+def test_server_with_cold_cache_loads_and_saves_metadata(jira_config, monkeypatch):
+    monkeypatch.setattr(JiraServer, "session", lambda self: Mock(raw={"name": "user"}))
+    monkeypatch.setattr(JiraServer, "server_info", lambda self: SERVER_INFO)
+    monkeypatch.setattr(JiraServer, "fields", lambda self: ALL_FIELDS)
+
+    JiraServer(False, jira_config)
+
+    assert ServerMetadataCache.open(jira_config.cache_dir, SERVER_URL, timedelta(hours=1)).is_warm
+
+
+def no_requests_allowed(*args, **kwargs):
+    raise AssertionError("No requests should be made to the server")
@@ -0,0 +1,31 @@
+import threading
+import time
+from typing import List
+
+from ittools.jira.sharded_search import ShardedSearch
+
+
+def test_shards_are_returned_in_order():
+    def fetch_shard(shard: int) -> List[int]:
+        # Later shards arrive first
+        time.sleep((5 - shard) * 0.01)
+        return [shard * 10, shard * 10 + 1]
+
+    results = list(ShardedSearch(fetch_shard, range(5), max_workers=5))
+
+    assert results == [0, 1, 10, 11, 20, 21, 30, 31, 40, 41]
+
+
+def test_single_shard_is_fetched_without_workers():
+    threads = []
+
+    def fetch_shard(shard: str) -> List[str]:
+        threads.append(threading.current_thread())
+        return [shard]
+
+    assert list(ShardedSearch(fetch_shard, ["only"])) == ["only"]
+    assert threads == [threading.current_thread()]
+
+
+def test_no_shards_return_nothing():
+    assert list(ShardedSearch(lambda shard: [shard], [])) == []
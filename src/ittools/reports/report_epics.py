@@ -2,10 +2,13 @@ from __future__ import annotations
 from typing import Dict, List, Tuple
 
 from ittools.config import ReportOptions
+from ittools.jira.field_profile import DURATION_FIELDS, FieldProfile
 from ittools.jira.jira_ext import JiraServer, JiraEpic, JiraIssue
 
 
 class EpicReport:
+    FIELDS = FieldProfile(["status"]) | DURATION_FIELDS
+
     def __init__(self, opts: ReportOptions, jira: JiraServer):
         self.verbose: bool = opts.verbose
         self.status_order: Dict[str, int] = {
@@ -19,7 +22,7 @@ class EpicReport:
     def run(self, epics: List[JiraEpic]) -> None:
         for epic in epics:
             print("{}: {}".format(epic.key, epic.summary))
-            issues: List[JiraIssue] = self.jira.query_issues_in_epic(epic.key)
+            issues: List[JiraIssue] = self.jira.query_issues_in_epic(epic.key, self.FIELDS)
             for issue in sorted(issues, key=lambda s: self.sort_by_status_then_key(s)):
                 print(
                     "\t[{}] {}: {}".format(
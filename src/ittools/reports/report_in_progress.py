@@ -5,10 +5,13 @@ from itertools import groupby
 from typing import Dict, List
 
 from ittools.config import ReportOptions
+from ittools.jira.field_profile import DURATION_FIELDS, FieldProfile
 from ittools.jira.jira_ext import JiraServer, JiraEpic, JiraIssue
 
 
 class InProgressReport:
+    FIELDS = FieldProfile(["status", "issuetype", "assignee", "Epic Link", "Rank"]) | DURATION_FIELDS
+
     def __init__(self, opts: ReportOptions, jira: JiraServer):
         self.verbose = opts.verbose
         self.jira = jira
@@ -26,8 +29,10 @@ class InProgressReport:
 
     def run(self, group_by_epic: bool, group_by_team: bool) -> None:
         print("In progress report")
-        print(f"  time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report_issues = self.jira.query_working_issues()
+        report_time = self.jira.as_of or datetime.now()
+        print(f"  time: {report_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        report_issues = self.jira.query_working_issues(self.FIELDS)
+        JiraIssue.calculate_durations(report_issues)
         print(f"  issue count: {len(report_issues)}\n")
 
         if group_by_epic:
@@ -72,13 +77,7 @@ class InProgressReport:
             print()
 
     def epics_for(self, issues: List[JiraIssue]) -> Dict[str, JiraEpic]:
-        epics: Dict[str, JiraEpic] = {}
-        for issue in issues:
-            if issue.epic_key and issue.epic_key not in epics:
-                epic = self.jira.jira_epic(issue.epic_key)
-                epics[epic.key] = epic
-
-        return epics
+        return self.jira.jira_epics(issue.epic_key for issue in issues)
 
     def rank_for(self, epic_key: str, epics: Dict[str, JiraEpic]) -> str:
         if epic_key in epics:
@@ -22,6 +22,9 @@ class IssueDetailReport:
     def run(self, issue_keys: List[str]) -> None:
         try:
             issues = self.jira.query_issue_keys(issue_keys)
+            if not self.summary:
+                # Load all the epics up front, rather than one at a time for each issue
+                self.jira.jira_epics(issue.epic_key for issue in issues)
             for issue in sorted(issues, key=lambda i: i.key):
                 self.report_issue(issue)
         except Exception as e:
@@ -54,8 +57,8 @@ class IssueDetailReport:
             parent = issue.raw_issue.fields.parent
             print(f" parent:     {parent.key} - {parent.fields.summary}")
         if issue.epic_key:
-            epic = self.jira.issue(issue.epic_key)
-            print(f" epic:       {epic.key}: {epic.fields.summary}")
+            epic = self.jira.jira_epic(issue.epic_key)
+            print(f" epic:       {epic.key}: {epic.summary}")
         if issue.fix_versions():
             print(f" fixed:      {', '.join(issue.fix_versions())}")
         if issue.start_time():
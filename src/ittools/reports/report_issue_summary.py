@@ -8,6 +8,7 @@ from statistics import mean, median
 from itertools import groupby
 
 from ittools.config import ReportOptions
+from ittools.jira.field_profile import DURATION_FIELDS, FieldProfile
 from ittools.jira.jira_ext import JiraIssue, JiraEpic, JiraServer
 
 this = sys.modules[__name__]
@@ -46,6 +47,9 @@ class Project:
 
 
 class IssueSummaryReport:
+    FIELDS = FieldProfile(["issuetype", "assignee", "Epic Link", "labels", "description"])
+    STATISTICS_FIELDS = FIELDS | DURATION_FIELDS
+
     def __init__(
             self,
             opts: ReportOptions,
@@ -102,11 +106,12 @@ class IssueSummaryReport:
             self, report_issues: List[JiraIssue]
     ) -> Dict[str, Project]:
         projects: Dict[str, Project] = {}
+        epics = self.jira.jira_epics(issue.epic_key for issue in report_issues)
         report_issues.sort(key=lambda issue: issue.epic_key)
         for epic_key, epic_issues in groupby(
                 report_issues, lambda issue: issue.epic_key
         ):
-            epic: JiraEpic = self.jira.jira_epic(epic_key)
+            epic: JiraEpic = epics[epic_key]
             project_label = _project_for(epic.labels)
             project = projects.get(project_label) or Project(project_label)
             projects[project_label] = project
@@ -162,6 +167,7 @@ class IssueSummaryReport:
 
 
 def print_statistics(title: str, issues: List[JiraIssue]) -> None:
+    JiraIssue.calculate_durations(issues)
     durations = [issue.duration for issue in issues]
     print(f"Statistics: {title}")
     print(f" issue count:     : {len(durations):2}")
@@ -7,6 +7,10 @@ from .report_issue_summary import IssueSummaryReport
 
 
 class ReleaseNotesReport:
+    FIELDS = IssueSummaryReport.FIELDS
+    # Verbose notes show when each issue started and completed, which needs the issue history
+    VERBOSE_FIELDS = IssueSummaryReport.STATISTICS_FIELDS
+
     def __init__(
         self,
         opts: ReportOptions,
@@ -20,7 +24,8 @@ class ReleaseNotesReport:
         self.markdown = markdown
 
     def run(self, issue_keys: List[str]) -> None:
-        report_issues = self.jira.query_issue_keys(issue_keys)
+        fields = self.VERBOSE_FIELDS if self.opts.verbose else self.FIELDS
+        report_issues = self.jira.query_issue_keys(issue_keys, fields)
         if self.no_tasks:
             report_issues = list(
                 filter(lambda issue: issue.issue_type != "Task", report_issues)
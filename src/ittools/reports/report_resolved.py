@@ -13,6 +13,8 @@ this.date_source = datetime.date
 
 
 class ResolvedReport:
+    FIELDS = IssueSummaryReport.STATISTICS_FIELDS
+
     def __init__(self, opts: ReportOptions, jira: JiraServer):
         self.opts = opts
         self.jira = jira
@@ -37,32 +39,24 @@ class ResolvedReport:
             names = sorted([name.partition(" ")[0] for name in team_members])
             print(f"        ({', '.join(names)})")
         print("")
-        resolved_issues = self.jira.query_resolved_issues(from_date, to_date)
-        labelled_issues = self.filter_labelled_issues(resolved_issues, epic_label)
-        report_issues = self.filter_team_issues(labelled_issues, team_members)
+        epic_keys = self.find_epics_with_label(epic_label) if epic_label else None
+        resolved_issues = self.jira.query_resolved_issues(
+            from_date, to_date, self.FIELDS, assignees=team_members or None, epic_keys=epic_keys
+        )
+        report_issues = self.filter_team_issues(resolved_issues, team_members)
 
         IssueSummaryReport(self.opts, self.jira, True, False).run(report_issues)
 
-    def filter_labelled_issues(self, all_issues: List[JiraIssue], epic_label: str) -> List[JiraIssue]:
-        if not epic_label:
-            return all_issues
-
-        matching_epic_keys = self.find_epics_with_label(all_issues, epic_label)
-        filtered_issues = [issue for issue in all_issues if issue.epic_key in matching_epic_keys]
-        return filtered_issues
-
     def filter_team_issues(self, all_issues: List[JiraIssue], team_members: List[str]) -> List[JiraIssue]:
+        """The issues of the team members, as Jira also matches assignees by user name"""
         if not team_members:
             return all_issues
 
         team_issues = [issue for issue in all_issues if issue.assignee in team_members]
         return team_issues
 
-    def find_epics_with_label(self, resolved_issues: List[JiraIssue], epic_label: str):
-        all_epic_keys = {issue.epic_key for issue in resolved_issues}
-        epics = [self.jira.jira_epic(key) for key in all_epic_keys]
-        matching_epic_keys = [epic.key for epic in epics if epic_label in epic.labels]
-        return matching_epic_keys
+    def find_epics_with_label(self, epic_label: str) -> List[str]:
+        return [epic.key for epic in self.jira.query_project_epics(epic_label)]
 
 
 def jira_from_date_days_ago(days_ago: int) -> str:
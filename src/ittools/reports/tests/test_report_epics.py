@@ -0,0 +1,46 @@
+from typing import List
+from unittest.mock import Mock
+
+from jira import Issue as AtlassianIssue
+
+from ittools.domain import business_calendar
+from ittools.domain.business_calendar import BusinessCalendar, CalendarSet
+from ittools.jira.field_profile import FieldProfile
+from ittools.jira.jira_ext import JiraIssue
+from ittools.reports.report_epics import EpicReport
+
+
+def test_working_duration_uses_the_calendar_of_the_assignees_team(monkeypatch, capsys):
+    team_calendar = BusinessCalendar(working_days=["Mon", "Tue", "Wed", "Thu"])
+    monkeypatch.setattr(business_calendar, "calendars", CalendarSet(BusinessCalendar(), {"Jane Doe": team_calendar}))
+    jira = Mock()
+    jira.query_issues_in_epic.side_effect = loaded_issues
+    opts = Mock(verbose=False)
+    opts.jira_config.statuses = [{"name": "Done", "display": "Done"}]
+
+    EpicReport(opts, jira).run([Mock(key="DS-1", summary="Epic")])
+
+    # Thursday 9am to Monday 9am is one working day for a team that does not work on Fridays
+    assert "working duration: 1.00 days" in capsys.readouterr().out
+
+
+def loaded_issues(epic_key: str, fields: FieldProfile) -> List[JiraIssue]:
+    """The issues of the epic as a search loads them: with only the requested fields, and history if expanded"""
+    all_fields = {
+        "summary": "Issue",
+        "status": {"name": "Done"},
+        "assignee": {"displayName": "Jane Doe"},
+        "created": "2023-10-12T09:00:00.000+1100",
+        "resolutiondate": "2023-10-16T09:00:00.000+1100",
+    }
+    raw = {"key": "DS-2", "fields": {name: value for name, value in all_fields.items() if name in ["summary"] + fields.fields}}
+    if fields.changelog:
+        raw["changelog"] = {"histories": [
+            history("2023-10-12T09:00:00.000+1100", "Selected for Development", "In Progress"),
+            history("2023-10-16T09:00:00.000+1100", "In Progress", "Done"),
+        ]}
+    return [JiraIssue(AtlassianIssue({}, None, raw), {})]
+
+
+def history(created: str, from_status: str, to_status: str) -> dict:
+    return {"created": created, "items": [{"field": "status", "fromString": from_status, "toString": to_status}]}
@@ -0,0 +1,63 @@
+from typing import List
+from unittest.mock import Mock
+
+from jira import Issue as AtlassianIssue
+
+from ittools.jira.field_profile import FieldProfile
+from ittools.jira.jira_ext import JiraIssue
+from ittools.reports.report_release_notes import ReleaseNotesReport
+
+
+def test_verbose_release_notes_show_start_and_completion(capsys):
+    jira = Mock()
+    jira.query_issue_keys.side_effect = loaded_issues
+    jira.jira_epics.return_value = {"DS-1": Mock(key="DS-1", summary="Epic", labels=["alpha"])}
+    opts = Mock(verbose=True)
+    opts.jira_config.issuetypes = [{"name": "Story", "display": "S"}]
+
+    ReleaseNotesReport(opts, jira, False, False).run(["DS-2"])
+
+    output = capsys.readouterr().out
+    assert "DS-2: Issue (Ann Lee)" in output
+    assert "started:   2023-10-12 11:00:00+11:00" in output
+    assert "completed: 2023-10-13 10:00:00+11:00" in output
+
+
+def test_release_notes_only_load_history_when_verbose(capsys):
+    jira = Mock()
+    jira.query_issue_keys.side_effect = loaded_issues
+    jira.jira_epics.return_value = {"DS-1": Mock(key="DS-1", summary="Epic", labels=["alpha"])}
+    opts = Mock(verbose=False)
+    opts.jira_config.issuetypes = [{"name": "Story", "display": "S"}]
+
+    ReleaseNotesReport(opts, jira, False, False).run(["DS-2"])
+
+    assert not jira.query_issue_keys.call_args.args[1].changelog
+    output = capsys.readouterr().out
+    assert "DS-2: Issue (Ann Lee)" in output
+    assert "started:" not in output
+
+
+def loaded_issues(issue_keys: List[str], fields: FieldProfile) -> List[JiraIssue]:
+    """The issues as a search loads them: with only the requested fields, and history if expanded"""
+    all_fields = {
+        "summary": "Issue",
+        "issuetype": {"name": "Story"},
+        "assignee": {"displayName": "Ann Lee"},
+        "Epic Link": "DS-1",
+        "labels": [],
+        "description": "",
+        "created": "2023-10-12T09:00:00.000+1100",
+        "resolutiondate": "2023-10-13T10:00:00.000+1100",
+    }
+    raw = {"key": "DS-2", "fields": {name: value for name, value in all_fields.items() if name in ["summary"] + fields.fields}}
+    if fields.changelog:
+        raw["changelog"] = {"histories": [
+            history("2023-10-12T11:00:00.000+1100", "Selected for Development", "In Progress"),
+            history("2023-10-13T10:00:00.000+1100", "In Progress", "Done"),
+        ]}
+    return [JiraIssue(AtlassianIssue({}, None, raw), {"Epic Link": "Epic Link"}) for _ in issue_keys]
+
+
+def history(created: str, from_status: str, to_status: str) -> dict:
+    return {"created": created, "items": [{"field": "status", "fromString": from_status, "toString": to_status}]}
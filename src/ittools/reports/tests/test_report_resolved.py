@@ -31,3 +31,31 @@ def test_from_date_days_ago():
 def test_to_date_blank():
     to_str = rr.jira_to_date()
     assert to_str == "2022-12-24", f"to_date on {DATE_OF_TEST} should be 2022-12-24"
+
+
+def test_team_and_label_filters_are_part_of_the_query(monkeypatch):
+    monkeypatch.setattr(rr, "IssueSummaryReport", Mock())
+    jira = Mock()
+    jira.query_project_epics.return_value = [Mock(key="DS-100"), Mock(key="DS-200")]
+    jira.query_resolved_issues.return_value = [Mock(assignee="Ann Lee"), Mock(assignee="ann")]
+
+    rr.ResolvedReport(Mock(), jira).run(7, None, None, "alpha", "Team A", ["Ann Lee"])
+
+    jira.query_project_epics.assert_called_once_with("alpha")
+    jira.query_resolved_issues.assert_called_once_with(
+        "2022-12-16", "2022-12-24", rr.ResolvedReport.FIELDS, assignees=["Ann Lee"], epic_keys=["DS-100", "DS-200"]
+    )
+    reported_issues = rr.IssueSummaryReport.return_value.run.call_args.args[0]
+    assert [issue.assignee for issue in reported_issues] == ["Ann Lee"]
+
+
+def test_no_filters_without_team_or_label(monkeypatch):
+    monkeypatch.setattr(rr, "IssueSummaryReport", Mock())
+    jira = Mock()
+
+    rr.ResolvedReport(Mock(), jira).run(7, None, None, None, None, [])
+
+    jira.query_project_epics.assert_not_called()
+    jira.query_resolved_issues.assert_called_once_with(
+        "2022-12-16", "2022-12-24", rr.ResolvedReport.FIELDS, assignees=None, epic_keys=None
+    )
@@ -11,3 +11,7 @@ def test_load_config():
     assert config.jira_config.issuetypes[0]["name"] == "Story"
     assert config.teams["Team1"] == ["John Doe", "James Dean"]
     assert config.teams["Team2"] == ["Jane Doe", "Jessica Rabbit"]
+    assert config.calendar.timezone == "Australia/Sydney"
+    assert config.calendar.holidays == ["2023-12-25", "2023-12-26"]
+    assert config.calendar.teams["Team2"].working_days == ["Mon", "Tue", "Wed", "Thu"]
+    assert config.calendar.teams["Team2"].holidays == ["2023-12-25", "2023-12-26"]